@@ -1,5 +1,8 @@
 from fastapi import APIRouter
-from typing import Dict
+from typing import Any, Dict
+
+from app.services import guide, llama_pool, llm_gateway, textgen_adapter, warmup
+from app.services.llm_router import get_router
 
 router = APIRouter()
 
@@ -17,3 +20,23 @@ async def health_check() -> Dict[str, str]:
         "message": "새싹아이 API가 정상 작동 중입니다."
     }
 
+
+@router.get("/health/llm")
+async def llm_health() -> Dict[str, Any]:
+    """
+    LLM 게이트웨이 상태 (엔드포인트별 호출/토큰/지연, 동시성 한도, single-flight 병합 통계)
+    및 라우터 상태 (요청 종류별 프로바이더 순위, p95 지연, 오류율), 로컬 llama 풀/생성 상태, 성장 분석/관리 가이드 캐시, 마지막 캐시 워밍 리포트
+
+    Returns:
+        Dict[str, Any]: LLM 호출 통계
+    """
+    return {
+        "configured": llm_gateway.is_configured(),
+        "gateway": llm_gateway.get_stats(),
+        "router": get_router().stats(),
+        "llama_pool": llama_pool.get_pool().stats(),
+        "local_generation": textgen_adapter.generation_stats(),
+        "analysis_cache": textgen_adapter.get_analysis_cache().stats(),
+        "care_guide_cache": guide.get_care_guide_cache().stats(),
+        "warmup": warmup.last_report(),
+    }
@@ -0,0 +1,90 @@
+"""
+성장 단계 이미지 API (Stable Diffusion 작업 큐)
+- POST /api/images/jobs: 생성 작업 제출 (plant_name + months, 이미 생성된 이미지는 바로 done)
+- GET  /api/images/jobs/{job_id}: 작업 상태 조회
+- GET  /api/images/{key}.png: 이미지 다운로드 (GrowthStage.image_url 참조 URL)
+  아직 생성되지 않았으면 작업을 시작하고 202 + 작업 상태 반환
+"""
+import re
+from typing import Any, Dict
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import FileResponse, JSONResponse
+
+from app.models.schemas import ImageJobRequest, ImageJobStatus
+from app.services import image_jobs
+from app.services.growth import stage_image_prompt
+
+router = APIRouter()
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+# 클라이언트 폴링 간격 힌트 (초)
+RETRY_AFTER_SECONDS = 5
+
+
+def _status(job: image_jobs.ImageJob) -> ImageJobStatus:
+    return ImageJobStatus(**job.to_dict(), queue_position=image_jobs.get_image_queue().position(job))
+
+
+def _submit(prompt: str) -> image_jobs.ImageJob:
+    """작업을 제출합니다. 대기열이 가득 찼거나 이미지 모델을 쓸 수 없으면 503."""
+    try:
+        job = image_jobs.get_image_queue().submit(prompt)
+    except image_jobs.ImageQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    if job.status == "failed":
+        # 최근 파이프라인 로드 실패 → 재시도 간격 동안은 폴링해도 생성되지 않음
+        raise HTTPException(status_code=503, detail=job.error, headers={"Retry-After": str(int(image_jobs.IMAGE_LOAD_RETRY_SECONDS))})
+    return job
+
+
+@router.post("/jobs", response_model=ImageJobStatus, status_code=202)
+async def submit_image_job(request: ImageJobRequest = Body(...)) -> ImageJobStatus:
+    """plant_name과 months로 성장 단계 이미지 생성 작업을 제출합니다 (임의 프롬프트는 받지 않음)."""
+    plant_name = request.plant_name.strip()
+    if not plant_name:
+        raise HTTPException(status_code=400, detail="plant_name이 필요합니다.")
+    return _status(_submit(stage_image_prompt(plant_name, request.months)))
+
+
+@router.get("/jobs/{job_id}", response_model=ImageJobStatus)
+async def get_image_job(job_id: str) -> ImageJobStatus:
+    """작업 상태를 조회합니다 (완료/실패 기록은 IMAGE_JOB_TTL초 동안 보관)."""
+    job = image_jobs.get_image_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _status(job)
+
+
+@router.get("/stats")
+async def image_job_stats() -> Dict[str, Any]:
+    """작업 큐/파이프라인 복제본/캐시 적중 통계"""
+    return image_jobs.get_image_queue().stats()
+
+
+@router.get("/{key}.png")
+async def get_image(key: str):
+    """
+    캐시된 이미지를 반환합니다.
+    image_url_for로 등록된 키가 아직 생성되지 않았으면 작업을 제출하고 202로 상태를 반환합니다.
+    """
+    if not _KEY_PATTERN.match(key):
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+    path = image_jobs.image_path(key)
+    if path.exists():
+        image_jobs.touch(key)
+        # 내용 주소 기반이므로 같은 URL의 내용은 바뀌지 않음
+        return FileResponse(path, media_type="image/png", headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+    prompt = image_jobs.prompt_for_key(key)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+    job = _submit(prompt)
+    if job.status == "done":
+        # 모델/생성 옵션이 바뀌었으면 새 키로 생성되므로 작업의 키 경로를 사용
+        return FileResponse(image_jobs.image_path(job.key), media_type="image/png", headers={"Cache-Control": "public, max-age=31536000, immutable"})
+    return JSONResponse(
+        status_code=202,
+        content=_status(job).model_dump(),
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
@@ -1,15 +1,22 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Body
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, FrozenSet, Optional
 import asyncio
+import functools
+import os
 from concurrent.futures import ThreadPoolExecutor
 
+from app.api.sse import SSE_HEADERS, StreamStalled, iterate_in_thread, sse_event
 from app.models.schemas import (
     PlantAnalysisResponse,
     PlantIdentification,
     PlantGrowthInsightResponse,
     MonthlyDataRow,
     MonthlyDataAnalysis,
+    PeriodAnalysis,
+    BatchGrowthRequest,
+    BatchGrowthResponse,
+    BatchGrowthItem,
 )
 from app.services import (
     classify_plant,
@@ -21,15 +28,34 @@ from app.services import (
     generate_care_guide,
     generate_growth_prediction,
 )
-from app.services.growth import generate_growth_graph, generate_monthly_data_analysis
-from app.services.textgen_adapter import render_plant_analysis
+from app.services.growth import (
+    DEFAULT_GROWTH_FIELDS,
+    generate_growth_graph,
+    generate_growth_projection_batch,
+    generate_monthly_data_analysis,
+    generate_period_analysis,
+    parse_growth_fields,
+)
+from app.services.textgen_adapter import (
+    LLM_TIMEOUT,
+    render_plant_analysis,
+    stream_plant_analysis,
+    template_plant_analysis,
+)
 from app.services.db_utils import save_identification_data, save_growth_log, load_growth_history
+from app.services import growth_fit
 
 router = APIRouter()
 
 # 스레드 풀 생성 (CPU 바운드 작업용)
 executor = ThreadPoolExecutor(max_workers=3)
 
+# 스트리밍 종합 분석: 토큰 사이 이 시간(초) 동안 응답이 없으면 템플릿으로 대체
+ANALYSIS_STALL_TIMEOUT = float(os.getenv("ANALYSIS_STALL_TIMEOUT", "5"))
+
+# 일괄 성장 예측 한 번에 받을 수 있는 최대 식물 수
+MAX_BATCH_PLANTS = 200
+
 
 @router.post("/analyze", response_model=PlantAnalysisResponse)
 async def analyze_plant(file: UploadFile = File(...)) -> PlantAnalysisResponse:
@@ -365,108 +391,140 @@ async def test_endpoint() -> Dict[str, str]:
     }
 
 
-@router.post("/growth-insight", response_model=PlantGrowthInsightResponse)
-async def growth_insight(
-    file: UploadFile = File(...),
-    period_unit: str = Query("month", description="기간 단위 ('week' 또는 'month')"),
-    max_periods: int = Query(12, description="최대 기간 수")
-) -> PlantGrowthInsightResponse:
-    """
-    스캔(자동 모델 선택) → 생육분석(텍스트) → 생장예측그래프 → 종합분석 텍스트 반환.
-    이미지 생성 제외.
-
-    Args:
-        file: 업로드된 식물 이미지 파일
-        period_unit: 기간 단위 ('week' 또는 'month'), 기본값: 'month'
-        max_periods: 최대 기간 수, 기본값: 12
-    """
+def _growth_fields(include: Optional[str]) -> FrozenSet[str]:
+    """include 쿼리를 필드 집합으로 변환합니다 (알 수 없는 이름이면 400)."""
     try:
-        if not file.content_type or not file.content_type.startswith("image/"):
-            raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
-
-        contents = await file.read()
-        if len(contents) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="파일 크기는 10MB 이하여야 합니다.")
+        return parse_growth_fields(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        if period_unit not in ["week", "month"]:
-            raise HTTPException(status_code=400, detail="period_unit은 'week' 또는 'month'여야 합니다.")
 
-        loop = asyncio.get_event_loop()
-        identification = await loop.run_in_executor(
-            executor,
-            classify_plant_auto_select_kr,
-            contents,
-        )
+INCLUDE_DESCRIPTION = (
+    "계산할 선택 필드 (쉼표 구분: period_analyses, monthly_data, comprehensive_analysis, all). "
+    "생략 시 monthly_data, comprehensive_analysis"
+)
 
-        if identification.confidence < 0.1:
-            raise HTTPException(status_code=422, detail="식물을 식별할 수 없습니다. 더 명확한 이미지를 업로드해주세요.")
 
-        # 식물 분석 데이터를 로컬에 저장
-        import hashlib
-        file_hash = hashlib.md5(contents).hexdigest()
-        save_identification_data(identification, file_hash)
+async def _prepare_growth_insight(
+    file: UploadFile,
+    period_unit: str,
+    max_periods: int,
+    fields: FrozenSet[str] = DEFAULT_GROWTH_FIELDS
+) -> Dict[str, Any]:
+    """
+    성장 인사이트 중 LLM이 필요 없는 부분(식별, 그래프, 월별 테이블)을 계산합니다.
+    기간별 상세 분석과 월별 테이블은 fields에 포함된 경우에만 만듭니다.
 
-        # 그래프 생성은 CPU 바운드 → 스레드 풀 병렬 처리
-        # 종분석 데이터(identification)를 그래프 생성에 전달하여 Y축 범위 계산에 활용
-        graph_task = loop.run_in_executor(
-            executor,
+    Returns:
+        identification, growth_graph, monthly_data, analysis_text, analysis_args(render_plant_analysis 인자)
+    """
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
+
+    contents = await file.read()
+    if len(contents) > 10 * 1024 * 1024:
+        raise HTTPException(status_code=400, detail="파일 크기는 10MB 이하여야 합니다.")
+
+    if period_unit not in ["week", "month"]:
+        raise HTTPException(status_code=400, detail="period_unit은 'week' 또는 'month'여야 합니다.")
+
+    loop = asyncio.get_event_loop()
+    identification = await loop.run_in_executor(
+        executor,
+        classify_plant_auto_select_kr,
+        contents,
+    )
+
+    if identification.confidence < 0.1:
+        raise HTTPException(status_code=422, detail="식물을 식별할 수 없습니다. 더 명확한 이미지를 업로드해주세요.")
+
+    # 식물 분석 데이터를 로컬에 저장
+    import hashlib
+    file_hash = hashlib.md5(contents).hexdigest()
+    save_identification_data(identification, file_hash)
+
+    # 그래프 생성은 CPU 바운드 → 스레드 풀 병렬 처리
+    # 종분석 데이터(identification)를 그래프 생성에 전달하여 Y축 범위 계산에 활용
+    graph_task = loop.run_in_executor(
+        executor,
+        functools.partial(
             generate_growth_graph,
             identification.plant_name,
             period_unit,
             max_periods,
-            identification  # 종분석 데이터 전달
+            identification,  # 종분석 데이터 전달
+            period_analyses="period_analyses" in fields,
+        )
+    )
+    growth_graph = await graph_task
+
+    # 월별 데이터 및 종합 분석 생성
+    monthly_rows = []
+    monthly_data_list = []
+
+    # good_growth와 bad_growth를 기반으로 월별 데이터 생성
+    for i in range(len(growth_graph.good_growth)):
+        good_point = growth_graph.good_growth[i]
+        bad_point = growth_graph.bad_growth[i] if i < len(growth_graph.bad_growth) else good_point
+
+        period = good_point.period
+
+        # period에 따라 기간 라벨 결정
+        if period == 0:
+            period_label = "현재"
+        else:
+            period_label = f"{period}개월"
+
+        # 좋은 조건과 나쁜 조건 크기 가져오기
+        good_height = good_point.size
+        bad_height = bad_point.size
+
+        # 예상 크기 = 좋은 조건과 나쁜 조건의 평균
+        expected_height = (good_height + bad_height) / 2
+
+        # 월별 데이터 추가
+        monthly_rows.append({
+            "period": period_label,
+            "expected_height": round(expected_height, 1),
+            "good_condition_height": round(good_height, 1),
+            "bad_condition_height": round(bad_height, 1)
+        })
+
+        # 종합 분석을 위한 데이터 리스트
+        monthly_data_list.append({
+            "period": period,
+            "expected": expected_height,
+            "good": good_height,
+            "bad": bad_height
+        })
+
+    # good_growth와 bad_growth에서 크기 값 추출
+    good_series = [p.size for p in growth_graph.good_growth]
+    bad_series = [p.size for p in growth_graph.bad_growth]
+
+    # 초기 크기 (첫 번째 값 또는 그래프의 min_size 사용)
+    start_cm = good_series[0] if good_series else growth_graph.min_size
+
+    # 간단한 성장 추론 텍스트 (기존 호환성 유지)
+    analysis_text = f"{identification.plant_name}의 {max_periods}{'개월' if period_unit == 'month' else '주'} 성장 전망: 초기 {start_cm:.1f}cm에서 최대 {growth_graph.max_size:.1f}cm까지 성장 가능합니다."
+
+    # MonthlyDataRow 리스트 생성
+    monthly_data_rows = [
+        MonthlyDataRow(
+            period=row["period"],
+            expected_height=row["expected_height"],
+            good_condition_height=row.get("good_condition_height"),
+            bad_condition_height=row.get("bad_condition_height")
         )
-        growth_graph = await graph_task
-
-        # 월별 데이터 및 종합 분석 생성
-        monthly_rows = []
-        monthly_data_list = []
-
-        # good_growth와 bad_growth를 기반으로 월별 데이터 생성
-        for i in range(len(growth_graph.good_growth)):
-            good_point = growth_graph.good_growth[i]
-            bad_point = growth_graph.bad_growth[i] if i < len(growth_graph.bad_growth) else good_point
-
-            period = good_point.period
-
-            # period에 따라 기간 라벨 결정
-            if period == 0:
-                period_label = "현재"
-            else:
-                period_label = f"{period}개월"
-
-            # 좋은 조건과 나쁜 조건 크기 가져오기
-            good_height = good_point.size
-            bad_height = bad_point.size
-
-            # 예상 크기 = 좋은 조건과 나쁜 조건의 평균
-            expected_height = (good_height + bad_height) / 2
-
-            # 월별 데이터 추가
-            monthly_rows.append({
-                "period": period_label,
-                "expected_height": round(expected_height, 1),
-                "good_condition_height": round(good_height, 1),
-                "bad_condition_height": round(bad_height, 1)
-            })
-
-            # 종합 분석을 위한 데이터 리스트
-            monthly_data_list.append({
-                "period": period,
-                "expected": expected_height,
-                "good": good_height,
-                "bad": bad_height
-            })
-
-        # 새 LLM 어댑터로 종합 분석 생성 (로컬 LLM → 실패 시 템플릿 폴백)
-        # good_growth와 bad_growth에서 크기 값 추출
-        good_series = [p.size for p in growth_graph.good_growth]
-        bad_series = [p.size for p in growth_graph.bad_growth]
-
-        # 초기 크기 (첫 번째 값 또는 그래프의 min_size 사용)
-        start_cm = good_series[0] if good_series else growth_graph.min_size
-
-        comprehensive_analysis = render_plant_analysis(
+        for row in monthly_rows
+    ]
+
+    return {
+        "identification": identification,
+        "growth_graph": growth_graph,
+        "monthly_data": monthly_data_rows if "monthly_data" in fields else None,
+        "analysis_text": analysis_text,
+        "analysis_args": dict(
             plant_name=identification.plant_name,
             K=growth_graph.max_size,
             start_cm=start_cm,
@@ -474,27 +532,46 @@ async def growth_insight(
             periods=max_periods,
             good_series=good_series,
             bad_series=bad_series
-        )
+        ),
+    }
 
-        # 간단한 성장 추론 텍스트 (기존 호환성 유지)
-        analysis_text = f"{identification.plant_name}의 {max_periods}{'개월' if period_unit == 'month' else '주'} 성장 전망: 초기 {start_cm:.1f}cm에서 최대 {growth_graph.max_size:.1f}cm까지 성장 가능합니다."
 
-        # MonthlyDataRow 리스트 생성
-        monthly_data_rows = [
-            MonthlyDataRow(
-                period=row["period"],
-                expected_height=row["expected_height"],
-                good_condition_height=row.get("good_condition_height"),
-                bad_condition_height=row.get("bad_condition_height")
+@router.post("/growth-insight", response_model=PlantGrowthInsightResponse)
+async def growth_insight(
+    file: UploadFile = File(...),
+    period_unit: str = Query("month", description="기간 단위 ('week' 또는 'month')"),
+    max_periods: int = Query(12, description="최대 기간 수"),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
+) -> PlantGrowthInsightResponse:
+    """
+    스캔(자동 모델 선택) → 생육분석(텍스트) → 생장예측그래프 → 종합분석 텍스트 반환.
+    이미지 생성 제외.
+
+    Args:
+        file: 업로드된 식물 이미지 파일
+        period_unit: 기간 단위 ('week' 또는 'month'), 기본값: 'month'
+        max_periods: 최대 기간 수, 기본값: 12
+        include: 계산할 선택 필드 (period_analyses, monthly_data, comprehensive_analysis, all)
+    """
+    try:
+        fields = _growth_fields(include)
+        insight = await _prepare_growth_insight(file, period_unit, max_periods, fields)
+        identification = insight["identification"]
+
+        # 새 LLM 어댑터로 종합 분석 생성 (로컬 LLM → 실패 시 템플릿 폴백, 요청 시에만)
+        comprehensive_analysis = None
+        if "comprehensive_analysis" in fields:
+            loop = asyncio.get_event_loop()
+            comprehensive_analysis = await loop.run_in_executor(
+                executor,
+                functools.partial(render_plant_analysis, **insight["analysis_args"])
             )
-            for row in monthly_rows
-        ]
 
         return PlantGrowthInsightResponse(
             identification=identification,
-            growth_graph=growth_graph,
-            analysis_text=analysis_text,
-            monthly_data=monthly_data_rows,
+            growth_graph=insight["growth_graph"],
+            analysis_text=insight["analysis_text"],
+            monthly_data=insight["monthly_data"],
             comprehensive_analysis=comprehensive_analysis,
             success=True,
             message=f"{identification.plant_name} 성장 인사이트 생성이 완료되었습니다.",
@@ -507,28 +584,102 @@ async def growth_insight(
         raise HTTPException(status_code=500, detail=f"성장 인사이트 생성 중 오류가 발생했습니다: {str(e)}")
 
 
+@router.post("/growth-insight/stream")
+async def growth_insight_stream(
+    file: UploadFile = File(...),
+    period_unit: str = Query("month", description="기간 단위 ('week' 또는 'month')"),
+    max_periods: int = Query(12, description="최대 기간 수")
+) -> StreamingResponse:
+    """
+    /growth-insight의 SSE 버전. 식별/그래프/월별 테이블을 LLM을 기다리지 않고 첫 이벤트로 보내고,
+    종합 분석은 생성되는 대로 토큰 단위로 이어서 보냅니다.
+
+    이벤트:
+    - insight: identification, growth_graph, analysis_text, monthly_data
+    - delta: 종합 분석 텍스트 조각 {"text": ...}
+    - fallback: LLM이 비활성/실패/정체되어 템플릿 분석으로 대체 {"text": ..., "reason": ...}
+    - done: 전체 종합 분석 {"comprehensive_analysis": ..., "source": "llm" | "template"}
+    """
+    try:
+        insight = await _prepare_growth_insight(file, period_unit, max_periods)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"성장 인사이트 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"성장 인사이트 생성 중 오류가 발생했습니다: {str(e)}")
+
+    analysis_args = insight["analysis_args"]
+
+    async def event_stream():
+        yield sse_event({
+            "identification": insight["identification"].model_dump(),
+            "growth_graph": insight["growth_graph"].model_dump(),
+            "analysis_text": insight["analysis_text"],
+            "monthly_data": [row.model_dump() for row in insight["monthly_data"]],
+        }, event="insight")
+
+        chunks = []
+        reason = None
+        try:
+            deltas = iterate_in_thread(
+                stream_plant_analysis(**analysis_args),
+                first_timeout=LLM_TIMEOUT,
+                idle_timeout=ANALYSIS_STALL_TIMEOUT,
+            )
+            async for delta in deltas:
+                chunks.append(delta)
+                yield sse_event({"text": delta}, event="delta")
+        except StreamStalled as e:
+            reason = f"stalled: {e}"
+        except Exception as e:
+            reason = str(e)
+
+        if reason is None and "".join(chunks).strip():
+            yield sse_event({"comprehensive_analysis": "".join(chunks).strip(), "source": "llm"}, event="done")
+            return
+
+        # 생성 실패/정체 → 템플릿 분석으로 대체 (이미 보낸 조각은 클라이언트가 교체)
+        print(f"[growth-insight/stream] 템플릿 폴백: {reason}")
+        template = template_plant_analysis(**analysis_args)
+        yield sse_event({"text": template, "reason": reason}, event="fallback")
+        yield sse_event({"comprehensive_analysis": template, "source": "template"}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 # 식물 개별 성장 기록 저장 API
 @router.post("/update-growth")
 async def update_growth(
     plant_id: str = Body(...),
     date: str = Body(...),
-    height: float = Body(...)
+    height: float = Body(...),
+    plant_name: Optional[str] = Body(None)
 ):
     try:
-        save_growth_log(plant_id, date, height)
+        previous_height = save_growth_log(plant_id, date, height)
+        try:
+            # 개인화 성장 곡선 충분통계량 갱신 (O(1))
+            growth_fit.observe(plant_id, date, height, previous_height, plant_name=plant_name)
+        except Exception as e:
+            print(f"[update-growth] 성장 곡선 갱신 실패: {e}")
         return {"success": True, "msg": "저장 완료"}
     except Exception as e:
         return {"success": False, "msg": str(e)}
 
 # 성장 예측+비교+분석+관리팁 API
 @router.get("/growth-insight-v2")
-async def growth_insight_v2(plant_id: str):
+async def growth_insight_v2(plant_id: str, plant_name: Optional[str] = None):
     try:
         history = load_growth_history(plant_id)
         if not history:
             return {"success": False, "msg": "기록 없음", "history": []}
-        last_height = history[-1]["height"]
-        prediction = [{"date": f"예측+{i+1}d", "height": last_height + (i+1)*1.0} for i in range(7)]
+        # 기록으로 적합한 로지스틱 곡선 (기록이 부족하면 종 사전값)
+        model = growth_fit.get_model(plant_id, history, plant_name=plant_name)
+        heights = growth_fit.predict(model, days_ahead=7)
+        if not heights:
+            # 날짜를 해석할 수 있는 기록이 없으면 마지막 높이 유지
+            heights = [history[-1]["height"]] * 7
+        prediction = [{"date": f"예측+{i+1}d", "height": h} for i, h in enumerate(heights)]
         compare_comment = "-"
         if len(history) >= 2:
             delta = history[-1]["height"] - history[-2]["height"]
@@ -540,6 +691,13 @@ async def growth_insight_v2(plant_id: str):
             "success": True,
             "history": history,
             "prediction": prediction,
+            "model": {
+                "source": model["source"],
+                "max_height": model["K"],
+                "daily_rate": round(model["r"], 5),
+                "inflection_date": growth_fit.inflection_date(model),
+                "points": model["n"],
+            },
             "compare_comment": compare_comment,
             "analysis": analysis,
             "care_tip": care_tip
@@ -552,7 +710,8 @@ async def growth_insight_v2(plant_id: str):
 async def get_monthly_data_analysis(
     plant_name: str = Query(..., description="식물 이름"),
     max_months: int = Query(12, description="최대 월 수"),
-    data_id: Optional[str] = Query(None, description="저장된 데이터 ID (선택사항)")
+    data_id: Optional[str] = Query(None, description="저장된 데이터 ID (선택사항)"),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
 ) -> MonthlyDataAnalysis:
     """
     저장된 식물 데이터를 기반으로 월별 데이터 분석을 반환합니다.
@@ -562,10 +721,12 @@ async def get_monthly_data_analysis(
         plant_name: 식물 이름
         max_months: 최대 월 수 (기본값: 12)
         data_id: 저장된 데이터 ID (선택사항)
+        include: 계산할 선택 필드 (period_analyses, monthly_data, comprehensive_analysis, all)
 
     Returns:
         MonthlyDataAnalysis: 월별 데이터 분석 결과
     """
+    fields = _growth_fields(include)
     try:
         import time
         start_time = time.time()
@@ -578,22 +739,25 @@ async def get_monthly_data_analysis(
             generate_monthly_data_analysis,
             plant_name,
             max_months,
-            data_id
+            data_id,
+            fields
         )
 
         elapsed_time = time.time() - start_time
         print(f"[월별 데이터 분석] 소요 시간: {elapsed_time:.2f}초")
 
         # MonthlyDataRow 리스트 생성
-        monthly_data_rows = [
-            MonthlyDataRow(
-                period=row["period"],
-                expected_height=row["expected_height"],
-                good_condition_height=row.get("good_condition_height"),
-                bad_condition_height=row.get("bad_condition_height")
-            )
-            for row in result["monthly_data"]
-        ]
+        monthly_data_rows = None
+        if result["monthly_data"] is not None:
+            monthly_data_rows = [
+                MonthlyDataRow(
+                    period=row["period"],
+                    expected_height=row["expected_height"],
+                    good_condition_height=row.get("good_condition_height"),
+                    bad_condition_height=row.get("bad_condition_height")
+                )
+                for row in result["monthly_data"]
+            ]
 
         return MonthlyDataAnalysis(
             identification=result["identification"],
@@ -613,3 +777,92 @@ async def get_monthly_data_analysis(
             detail=f"월별 데이터 분석 중 오류가 발생했습니다: {str(e)}"
         )
 
+
+@router.get("/period-analysis", response_model=PeriodAnalysis)
+async def get_period_analysis(
+    plant_name: str = Query(..., description="식물 이름"),
+    period: int = Query(..., description="기간 (0 ~ max_periods)"),
+    period_unit: str = Query("month", description="기간 단위 ('week' 또는 'month')"),
+    max_periods: int = Query(12, description="그래프의 최대 기간 수"),
+    data_id: Optional[str] = Query(None, description="저장된 데이터 ID (선택사항)")
+) -> PeriodAnalysis:
+    """
+    한 기간의 상세 분석만 반환합니다.
+    성장 응답에서 period_analyses를 생략한 경우, 사용자가 선택한 기간만 이 API로 조회합니다.
+    """
+    if period_unit not in ["week", "month"]:
+        raise HTTPException(status_code=400, detail="period_unit은 'week' 또는 'month'여야 합니다.")
+
+    loop = asyncio.get_event_loop()
+    try:
+        return await loop.run_in_executor(
+            executor,
+            functools.partial(
+                generate_period_analysis,
+                plant_name,
+                period,
+                period_unit,
+                max_periods,
+                data_id=data_id,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"기간별 분석 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"기간별 분석 중 오류가 발생했습니다: {str(e)}")
+
+
+@router.post("/growth-batch", response_model=BatchGrowthResponse)
+async def growth_batch(request: BatchGrowthRequest = Body(...)) -> BatchGrowthResponse:
+    """
+    여러 식물의 성장 그래프와 월별 테이블을 한 번에 반환합니다 (사용자 컬렉션 대시보드용).
+    /monthly-data-analysis를 식물마다 호출하는 대신 사용하며, LLM 종합 분석은 포함하지 않습니다.
+
+    Args:
+        request: plants(식물명 또는 data_id 목록), period_unit, max_periods, simulate
+
+    Returns:
+        BatchGrowthResponse: 요청 순서대로 식물별 결과
+    """
+    if request.period_unit not in ["week", "month"]:
+        raise HTTPException(status_code=400, detail="period_unit은 'week' 또는 'month'여야 합니다.")
+    if not request.plants:
+        raise HTTPException(status_code=400, detail="plants가 비어 있습니다.")
+    if len(request.plants) > MAX_BATCH_PLANTS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_PLANTS}개 식물까지 요청할 수 있습니다.")
+    if any(not (p.plant_name or p.data_id) for p in request.plants):
+        raise HTTPException(status_code=400, detail="각 식물은 plant_name 또는 data_id가 필요합니다.")
+
+    try:
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            executor,
+            generate_growth_projection_batch,
+            [p.model_dump() for p in request.plants],
+            request.period_unit,
+            request.max_periods,
+            request.simulate,
+        )
+
+        items = [
+            BatchGrowthItem(
+                identification=r["identification"],
+                growth_graph=r["growth_graph"],
+                monthly_data=[MonthlyDataRow(**row) for row in r["monthly_data"]],
+                data_id=r["data_id"],
+                found=r["found"],
+            )
+            for r in results
+        ]
+        return BatchGrowthResponse(
+            items=items,
+            period_unit=request.period_unit,
+            success=True,
+            message=f"{len(items)}개 식물의 성장 예측이 완료되었습니다.",
+        )
+    except Exception as e:
+        print(f"일괄 성장 예측 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"일괄 성장 예측 중 오류가 발생했습니다: {str(e)}")
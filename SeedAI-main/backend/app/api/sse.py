@@ -0,0 +1,100 @@
+"""
+Server-Sent Events(SSE) 응답 헬퍼
+- text/event-stream 형식의 이벤트 문자열 생성
+- 프록시 버퍼링을 막는 공통 헤더
+- 동기 iterator(LLM 토큰 스트림)를 스레드에서 순회하며 정체(stall)를 감지하는 비동기 어댑터
+"""
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional
+
+# nginx 등 리버스 프록시가 응답을 모아두지 않도록 버퍼링 해제
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """
+    SSE 이벤트 한 건을 직렬화합니다.
+
+    Args:
+        data: JSON으로 직렬화할 데이터
+        event: 이벤트 이름 (생략 시 기본 'message' 이벤트)
+
+    Returns:
+        str: "event: ...\\ndata: ...\\n\\n" 형식의 문자열
+    """
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+class StreamStalled(asyncio.TimeoutError):
+    """대기 시간 안에 다음 조각이 도착하지 않음"""
+
+
+_ITEM, _DONE, _ERROR = "item", "done", "error"
+
+
+async def iterate_in_thread(
+    iterator: Iterator[Any],
+    first_timeout: float,
+    idle_timeout: float
+) -> AsyncIterator[Any]:
+    """
+    동기 iterator를 별도 스레드에서 순회하며 조각을 비동기로 전달합니다.
+
+    Args:
+        iterator: 동기 iterator (예: LLM 토큰 스트림)
+        first_timeout: 첫 조각까지 최대 대기 시간 (초)
+        idle_timeout: 조각 사이 최대 대기 시간 (초)
+
+    Raises:
+        StreamStalled: 대기 시간 초과. 순회 스레드는 다음 조각을 받는 즉시 iterator를 닫고 종료합니다.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue" = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(kind: str, value: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+        except RuntimeError:
+            # 이벤트 루프가 이미 종료됨
+            pass
+
+    def pump() -> None:
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    break
+                put(_ITEM, item)
+            put(_DONE, None)
+        except Exception as e:
+            put(_ERROR, e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=pump, name="sse-pump", daemon=True).start()
+    timeout = first_timeout
+    try:
+        while True:
+            try:
+                kind, value = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                raise StreamStalled(f"{timeout}초 동안 스트림 응답 없음")
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+            timeout = idle_timeout
+    finally:
+        stop.set()
@@ -34,6 +34,12 @@ class Settings(BaseSettings):
     # OpenAI API 설정
     openai_api_key: Optional[str] = None
 
+    # LLM 게이트웨이 설정 (app/services/llm_gateway.py)
+    llm_max_concurrency: int = 8          # 전역 동시 호출 상한
+    llm_endpoint_concurrency: int = 4     # 엔드포인트별 기본 동시 호출 상한
+    llm_pool_connections: int = 20        # 공유 커넥션 풀 크기
+    llm_default_timeout: float = 60.0     # 기본 호출 타임아웃 (초)
+
     # PLLaMa 모델 설정 (Hugging Face 모델명)
     # PLLaMa는 GitHub에서 확인 필요: https://github.com/Xianjun-Yang/PLLaMa
     # 일단 기본 LLaMA 모델 사용, 나중에 PLLaMa 모델명으로 변경 가능
@@ -42,6 +48,22 @@ class Settings(BaseSettings):
 
     # 캐시 디렉토리
     cache_dir: str = "./model_cache"
+
+    # 영속 캐시 (app/services/cache_store.py)
+    cache_db_path: str = "./model_cache/cache.sqlite3"
+    analysis_cache_ttl: float = 7 * 24 * 3600   # 성장 분석 텍스트 갱신 주기 (초, 지나면 반환 후 백그라운드 재생성)
+    analysis_cache_max_entries: int = 2000
+    care_guide_cache_ttl: float = 30 * 24 * 3600  # 관리 가이드 갱신 주기 (초)
+    care_guide_cache_max_entries: int = 1000
+    translation_cache_ttl: float = 90 * 24 * 3600  # 식물/병충해 이름 번역 갱신 주기 (초)
+    translation_cache_max_entries: int = 5000
+
+    # 서버 시작 시 감지 모델/로컬 LLM 풀 사전 로드 (false면 첫 요청 시 로드)
+    preload_models: bool = True
+
+    # 캐시 워머 (app/services/warmup.py)
+    warmup_on_startup: bool = True   # 서버 시작 시 백그라운드로 관리 가이드/번역 캐시 채우기
+    warmup_concurrency: int = 4      # 동시 LLM 호출 수
     
     class Config:
         env_file = ".env"
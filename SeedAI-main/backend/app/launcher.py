@@ -0,0 +1,196 @@
+"""
+Production pre-fork launcher
+- Parent imports the app and loads classifier/detector weights once, then gc.freeze() and forks N workers
+  → weight pages are shared copy-on-write instead of being loaded per worker
+  (GGUF weights are mmap'ed, so llama already shares them through the page cache; each worker loads its own pool)
+- CPU cores are partitioned across workers: torch intra-op threads (OMP/MKL/OpenBLAS) and LLM_THREADS
+  are set to cores // workers so workers don't oversubscribe the machine
+- Workers run uvicorn on a listening socket opened by the parent; a crashed worker is forked again
+- Only worker 0 runs the care-guide/translation cache warmup
+- Warmup inference runs in each worker after fork (torch/OpenMP thread pools do not survive fork)
+
+Run (from backend):
+    python -m app.launcher --workers 4 --port 8000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("app.launcher")
+
+# 크래시 직후 재시작이 반복되지 않도록 이 시간(초) 안에 죽은 워커는 잠시 쉬었다가 다시 fork
+RESPAWN_BACKOFF = 1.0
+MIN_WORKER_LIFETIME = 5.0
+SHUTDOWN_TIMEOUT = float(os.getenv("LAUNCHER_SHUTDOWN_TIMEOUT", "30"))
+
+
+def available_cores() -> int:
+    """이 프로세스가 쓸 수 있는 코어 수 (cgroup/taskset 제한 반영)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def partition_threads(workers: int, cores: int) -> Dict[str, str]:
+    """
+    워커당 스레드 수를 환경 변수로 정합니다. torch/numpy/llama를 import하기 전에 적용해야 합니다.
+    LLM_THREADS가 이미 설정되어 있으면 머신 전체 값으로 보고 워커 수로 나눕니다.
+    """
+    per_worker = max(1, cores // workers)
+    llm_total = int(os.getenv("LLM_THREADS", str(cores)))
+    threads = {
+        "OMP_NUM_THREADS": str(per_worker),
+        "MKL_NUM_THREADS": str(per_worker),
+        "OPENBLAS_NUM_THREADS": str(per_worker),
+        "LLM_THREADS": str(max(1, llm_total // workers)),
+    }
+    os.environ.update(threads)
+    return threads
+
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(index: int, app, sock: socket.socket, threads_per_worker: int) -> None:
+    """fork된 자식: 스레드 수를 다시 맞추고 공유 소켓에서 uvicorn을 실행합니다 (반환하지 않음)."""
+    import uvicorn
+    from app.config import settings
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+    if index > 0:
+        # 영속 캐시는 모든 워커가 공유하므로 워밍은 한 워커만
+        settings.warmup_on_startup = False
+    if "torch" in sys.modules:
+        # 부모에서 만든 intra-op 스레드 풀은 자식에 없으므로 새로 만들도록 명시
+        sys.modules["torch"].set_num_threads(threads_per_worker)
+
+    code = 0
+    try:
+        uvicorn.Server(uvicorn.Config(app, log_level="info")).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker %d crashed", index)
+        code = 1
+    finally:
+        from app.services import model_server
+        if model_server._client is not None:
+            model_server._client.close()
+        logging.shutdown()
+    # 부모의 atexit/finally가 자식에서 실행되지 않도록 바로 종료
+    os._exit(code)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="새싹아이 API pre-fork launcher")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", "0")) or max(1, available_cores() // 2))
+    parser.add_argument("--cores", type=int, default=available_cores(), help="워커에 나눠 줄 코어 수")
+    parser.add_argument("--no-preload", action="store_true", help="부모에서 가중치를 로드하지 않음 (워커마다 로드)")
+    args = parser.parse_args()
+
+    threads = partition_threads(args.workers, args.cores)
+    threads_per_worker = int(threads["OMP_NUM_THREADS"])
+    logger.info("Workers=%d, cores=%d, threads/worker=%d, LLM_THREADS/worker=%s",
+                args.workers, args.cores, threads_per_worker, threads["LLM_THREADS"])
+
+    # 스레드 수 환경 변수를 정한 뒤에 앱(과 torch/llama 설정)을 import
+    from app.config import settings
+    from app.main import app
+    from app.services import preload
+
+    if settings.preload_models and not args.no_preload:
+        start = time.perf_counter()
+        loaded = preload.load_weights(["detector", "classifier"])
+        logger.info("Loaded in parent (shared copy-on-write): %s (%.1fs)", loaded or "-", time.perf_counter() - start)
+
+    # 지금까지 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지를 건드려 복사되지 않도록
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(args.host, args.port)
+    logger.info("Listening on http://%s:%d", args.host, args.port)
+
+    workers: Dict[int, tuple] = {}  # pid → (index, started_at)
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(index, app, sock, threads_per_worker)
+        workers[pid] = (index, time.monotonic())
+        logger.info("Worker %d started (pid=%d)", index, pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(args.workers):
+        spawn(index)
+
+    try:
+        # 블로킹 waitpid는 시그널 처리 후 자동으로 재시도되어(PEP 475) 종료 요청을 놓치므로 폴링
+        while not stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            if pid not in workers or stopping:
+                continue
+            index, started_at = workers.pop(pid)
+            logger.warning("Worker %d (pid=%d) exited with status %d; restarting", index, pid, os.waitstatus_to_exitcode(status))
+            if time.monotonic() - started_at < MIN_WORKER_LIFETIME:
+                time.sleep(RESPAWN_BACKOFF)
+            spawn(index)
+    finally:
+        # uvicorn은 SIGTERM에서 진행 중인 요청을 마치고 종료
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        while workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                workers.clear()
+                break
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            workers.pop(pid, None)
+        for pid in workers:
+            logger.warning("Worker pid=%d did not stop in %.0fs; killing", pid, SHUTDOWN_TIMEOUT)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        sock.close()
+        logger.info("Launcher stopped")
+
+
+if __name__ == "__main__":
+    main()
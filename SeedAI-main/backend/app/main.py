@@ -2,21 +2,30 @@
 Unified FastAPI main — merge of our main.py and teammate's app.py
 - Single app instance
 - Combined CORS
-- Startup: detector preload (best-effort)
-- Endpoints: root, /api/health, /api/detect, /api/cleanup
-- Optional routers: health, plant (best-effort import)
+- Heavy ML stacks (torch/transformers/diffusers/ultralytics/cv2) import lazily on first use
+- Startup: parallel detector/classifier/llama preload + warmup inference (background, PRELOAD_MODELS),
+  care-guide/translation cache warmup (background)
+- Endpoints: root, /api/health, /api/ready, /api/detect, /api/detect/{id}/advice/stream, /api/cleanup
+- Optional routers: health, plant, images (best-effort import)
+- MODEL_SERVER_SOCKET: detector/classifier inference goes to app.services.model_server (shared across workers)
+- `python app/main.py` is the single-process dev server (reload); production uses `python -m app.launcher`
 """
 
+import asyncio
+import importlib.util
 import os
 import uuid
 import shutil
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.sse import SSE_HEADERS, sse_event
 
 # --- Optional settings & dotenv ---
 try:
@@ -40,13 +49,26 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("app.main")
 
 # --- External services (best-effort import) ---
-_detector_ok = False
-try:
-    from inference import get_detector  # teammate side
-    _HAS_DETECTOR = True
-except Exception as e:
-    logger.warning("inference.get_detector import failed: %s", e)
-    _HAS_DETECTOR = False
+from app.services import model_server
+
+# inference는 ultralytics/torch/cv2/scipy를 import하므로 첫 사용(또는 시작 시 preload)까지 미룸
+# MODEL_SERVER_SOCKET이 설정되어 있으면 감지 모델은 모델 서버 프로세스가 보유
+_HAS_DETECTOR = model_server.enabled() or importlib.util.find_spec("inference") is not None
+
+
+def get_detector():
+    """inference.get_detector (teammate side, 첫 호출 시 모듈 import, 실패하면 None) 또는 모델 서버 프록시"""
+    global _HAS_DETECTOR
+    if model_server.enabled():
+        return model_server.get_remote_detector()
+    try:
+        from inference import get_detector as load_detector
+    except Exception as e:
+        logger.warning("inference.get_detector import failed: %s", e)
+        _HAS_DETECTOR = False
+        return None
+    return load_detector()
+
 
 try:
     from llm_service import get_advisor  # teammate side
@@ -90,10 +112,11 @@ app.add_middleware(
 
 # --- Optional routers from our side ---
 try:
-    from app.api import health, plant  # our modules
+    from app.api import health, images, plant  # our modules
     app.include_router(health.router, tags=["Health"])
     app.include_router(plant.router, prefix="/api/plant", tags=["Plant"])
-    logger.info("Included routers: health, plant")
+    app.include_router(images.router, prefix="/api/images", tags=["Images"])
+    logger.info("Included routers: health, plant, images")
 except Exception as e:
     logger.warning("Optional routers not included (app.api.health/plant): %s", e)
 
@@ -103,21 +126,107 @@ RESULTS_DIR = Path("results")
 UPLOAD_DIR.mkdir(exist_ok=True)
 RESULTS_DIR.mkdir(exist_ok=True)
 
-# --- Startup: preload detector if available ---
+# --- Advice streaming sessions ---
+# stream_advice=true 로 /api/detect 호출 시 방제법 생성을 미루고,
+# /api/detect/{detection_id}/advice/stream 에서 SSE로 토큰 단위 전송
+# 세션은 sqlite 캐시 DB에 두어 pre-fork 워커(app.launcher) 어디로 후속 요청이 가도 조회 가능
+ADVICE_SESSION_TTL = 300  # 초
+ADVICE_SESSION_MAX_ENTRIES = 10000
+_advice_sessions = None
+_advice_sessions_lock = threading.Lock()
+
+
+def _get_advice_sessions():
+    """방제법 스트리밍 세션 저장소 (fork 이후 첫 사용 시 연결)"""
+    global _advice_sessions
+    with _advice_sessions_lock:
+        if _advice_sessions is None:
+            from app.services.cache_store import PersistentCache
+            _advice_sessions = PersistentCache(
+                "advice_session", max_entries=ADVICE_SESSION_MAX_ENTRIES, ttl=ADVICE_SESSION_TTL
+            )
+        return _advice_sessions
+
+
+def _create_advice_session(kind: str, params: Dict[str, Any]) -> str:
+    """방제법 스트리밍 세션을 등록하고 detection_id를 반환합니다."""
+    detection_id = uuid.uuid4().hex
+    _get_advice_sessions().set(detection_id, {"kind": kind, "params": params})
+    return detection_id
+
+
+def _get_advice_session(detection_id: str) -> Optional[Dict[str, Any]]:
+    """만료되지 않은 방제법 스트리밍 세션을 조회합니다."""
+    sessions = _get_advice_sessions()
+    entry = sessions.get(detection_id)
+    if entry is None:
+        return None
+    if entry.stale:
+        sessions.delete(detection_id)
+        return None
+    return entry.value
+
+
+def _finish_advice_session(detection_id: str) -> None:
+    """스트리밍을 마친 세션을 제거합니다 (같은 ID로 다시 생성하지 않음)."""
+    _get_advice_sessions().delete(detection_id)
+
+
+def _attach_advice_stream(resp: Dict[str, Any], kind: str, params: Dict[str, Any]) -> None:
+    """응답에 스트리밍 세션 정보를 넣습니다 (treatment_advice는 SSE로 전달)."""
+    detection_id = _create_advice_session(kind, params)
+    resp["detection_id"] = detection_id
+    resp["advice_stream_url"] = f"/api/detect/{detection_id}/advice/stream"
+    resp["treatment_advice"] = None
+    resp["llm_enabled"] = True
+
+
+def _translate_detection_names(advisor, plant_species: str, disease_name: str, confidence: float):
+    """종/병충해 이름을 한 번의 JSON 모드 호출로 번역합니다 (실패 시 개별 번역 호출)."""
+    bundle = advisor.get_detection_bundle(plant_species, disease_name, confidence, include_advice=False)
+    if bundle is not None:
+        return bundle.species_kr, bundle.disease_kr
+    return (
+        advisor.translate_to_korean(plant_species, context="plant"),
+        advisor.translate_to_korean(disease_name, context="disease"),
+    )
+
+def _run_cache_warmup() -> None:
+    """관리 가이드/번역 캐시를 채우고 커버리지를 로그로 남깁니다."""
+    from app.services import warmup
+    try:
+        report = warmup.run_warmup()
+        for category, stats in report.get("categories", {}).items():
+            logger.info("Cache warmup %s: coverage=%.1f%% (warmed=%d, missing=%d)",
+                        category, stats["coverage"] * 100, stats["warmed"], len(stats["missing"]))
+        for name, reason in report.get("skipped", {}).items():
+            logger.info("Cache warmup skipped %s: %s", name, reason)
+    except Exception as e:
+        logger.error("Cache warmup failed: %s", e)
+
+
+_warmup_task: Optional[asyncio.Task] = None
+
+
+# --- Startup: preload models in background, readiness via /api/ready ---
 @app.on_event("startup")
 async def on_startup():
-    global _detector_ok
-    if _HAS_DETECTOR:
-        try:
-            logger.info("Preloading detector model...")
-            det = get_detector()
-            _detector_ok = getattr(det, "disease_model", None) is not None
-            logger.info("Detector preload done (loaded=%s)", _detector_ok)
-        except Exception as e:
-            logger.error("Detector preload failed: %s", e)
-            _detector_ok = False
+    global _warmup_task
+    from app.config import settings as app_settings
+    from app.services import preload
+
+    # 감지/분류/llama 모델을 동시에 로드 + 워밍 추론 (시작은 막지 않고, 끝날 때까지 /api/ready가 503)
+    if app_settings.preload_models:
+        logger.info("Preloading models in background (detector, classifier, llama)...")
+        preload.start_preload()
     else:
-        logger.info("Detector module not present; skipping preload")
+        logger.info("Model preload disabled (PRELOAD_MODELS=false); models load on first use")
+        preload.skip_all("PRELOAD_MODELS=false (첫 사용 시 로드)")
+
+    # 관리 가이드/번역 캐시 워밍 (시작을 막지 않도록 백그라운드, 이미 캐시된 항목은 건너뜀)
+    if app_settings.warmup_on_startup:
+        logger.info("Starting cache warmup in background...")
+        _warmup_task = asyncio.create_task(asyncio.to_thread(_run_cache_warmup))
 
 # --- Root ---
 @app.get("/")
@@ -144,12 +253,25 @@ async def health_check():
         "note": "단일 모델로 식물 종과 병충해를 함께 감지합니다.",
     }
 
+# --- Readiness (load balancer) ---
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    모델별 사전 로드 상태. 모든 모델이 ready/failed/skipped가 되기 전에는 503을 반환하므로
+    로드밸런서 readiness probe로 쓰면 워밍이 끝난 프로세스에만 트래픽이 갑니다.
+    """
+    from app.services import preload
+
+    state = preload.readiness()
+    return JSONResponse(content=state, status_code=200 if state["ready"] else 503)
+
 # --- Detect (from teammate app.py) ---
 @app.post("/api/detect")
 async def detect_plant_disease(
     file: UploadFile = File(...),
     conf_threshold: Optional[float] = Form(0.01),
     user_notes: Optional[str] = Form(None),
+    stream_advice: Optional[bool] = Form(False),
 ):
     # 디버깅: user_notes 수신 확인
     logger.info(f"📝 /api/detect 호출 - user_notes: {repr(user_notes)[:100] if user_notes else 'None'}")
@@ -216,26 +338,43 @@ async def detect_plant_disease(
             if _HAS_ADVISOR:
                 try:
                     advisor = get_advisor()
-                    
-                    # 식물 종 이름 한국어 번역
                     plant_species = disease_info.get("species", "")
-                    plant_species_kr = advisor.translate_to_korean(plant_species, context="plant")
-                    resp["species"]["name_kr"] = plant_species_kr
-                    
-                    # 병충해 이름 한국어 번역
                     disease_name = disease_info.get("name", "")
-                    disease_name_kr = advisor.translate_to_korean(disease_name, context="disease")
-                    resp["diseases"][0]["name_kr"] = disease_name_kr
+                    confidence = disease_info.get("confidence")
                     
-                    # 방제법 제공
-                    treatment = advisor.get_treatment_advice(
-                        plant_species=plant_species,
-                        disease=disease_name,
-                        confidence=disease_info.get("confidence"),
-                        user_notes=user_notes,
-                    )
-                    resp["treatment_advice"] = treatment
-                    resp["llm_enabled"] = True
+                    if stream_advice:
+                        # 번역만 먼저 받고 방제법은 SSE 엔드포인트로 위임
+                        plant_species_kr, disease_name_kr = _translate_detection_names(
+                            advisor, plant_species, disease_name, confidence
+                        )
+                        _attach_advice_stream(resp, "treatment", {
+                            "plant_species": plant_species,
+                            "disease": disease_name,
+                            "confidence": confidence,
+                            "user_notes": user_notes,
+                        })
+                    else:
+                        # 번역 + 방제법을 단일 JSON 모드 호출로 생성 (실패 시 개별 호출 폴백)
+                        bundle = advisor.get_detection_bundle(
+                            plant_species, disease_name, confidence, user_notes=user_notes
+                        )
+                        if bundle is not None:
+                            plant_species_kr, disease_name_kr = bundle.species_kr, bundle.disease_kr
+                            resp["treatment_advice"] = bundle.format_advice()
+                            resp["advice_sections"] = bundle.advice_sections()
+                        else:
+                            plant_species_kr = advisor.translate_to_korean(plant_species, context="plant")
+                            disease_name_kr = advisor.translate_to_korean(disease_name, context="disease")
+                            resp["treatment_advice"] = advisor.get_treatment_advice(
+                                plant_species=plant_species,
+                                disease=disease_name,
+                                confidence=confidence,
+                                user_notes=user_notes,
+                            )
+                        resp["llm_enabled"] = True
+                    
+                    resp["species"]["name_kr"] = plant_species_kr
+                    resp["diseases"][0]["name_kr"] = disease_name_kr
                 except Exception as e:
                     logger.error("LLM 호출 실패: %s", e)
                     resp["treatment_advice"] = None
@@ -251,12 +390,13 @@ async def detect_plant_disease(
             if _HAS_ADVISOR:
                 try:
                     advisor = get_advisor()
-                    plant_species = disease_info.get("species", "")
-                    plant_species_kr = advisor.translate_to_korean(plant_species, context="plant")
+                    plant_species_kr, disease_name_kr = _translate_detection_names(
+                        advisor,
+                        disease_info.get("species", ""),
+                        disease_info.get("name", ""),
+                        disease_info.get("confidence"),
+                    )
                     resp["species"]["name_kr"] = plant_species_kr
-                    
-                    disease_name = disease_info.get("name", "")
-                    disease_name_kr = advisor.translate_to_korean(disease_name, context="disease")
                     resp["diseases"][0]["name_kr"] = disease_name_kr
                     
                     resp["status_message"] = (
@@ -289,7 +429,9 @@ async def detect_plant_disease(
             
             # user_notes가 있으면 무조건 LLM 호출
             if user_notes and user_notes.strip():
-                if _HAS_ADVISOR:
+                if _HAS_ADVISOR and stream_advice:
+                    _attach_advice_stream(resp, "user_notes", {"user_notes": user_notes})
+                elif _HAS_ADVISOR:
                     try:
                         advisor = get_advisor()
                         treatment = advisor.get_user_notes_advice(user_notes)
@@ -334,6 +476,54 @@ async def detect_plant_disease(
         except Exception as e:
             logger.warning("임시 파일 삭제 실패: %s", e)
 
+# --- Advice stream (SSE) ---
+@app.get("/api/detect/{detection_id}/advice/stream")
+async def stream_detection_advice(detection_id: str):
+    """
+    /api/detect(stream_advice=true)로 미뤄둔 방제법을 SSE로 스트리밍합니다.
+
+    이벤트:
+    - start: 스트림 시작 (detection_id)
+    - delta: 생성된 텍스트 조각 {"text": ...}
+    - done: 전체 방제법 {"treatment_advice": ...}
+    - error: 생성 실패 {"message": ...}
+    """
+    session = _get_advice_session(detection_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="만료되었거나 존재하지 않는 진단 ID입니다.")
+    if not _HAS_ADVISOR:
+        raise HTTPException(status_code=503, detail="LLM 모듈 없음(llm_service). 설치/배치 후 재시도하세요.")
+
+    def event_stream():
+        yield sse_event({"detection_id": detection_id}, event="start")
+        chunks = []
+        try:
+            advisor = get_advisor()
+            params = session["params"]
+            cached = None
+            if session["kind"] == "treatment":
+                cached = advisor.get_cached_bundle(
+                    params["plant_species"], params["disease"], params["user_notes"]
+                )
+            if cached is not None:
+                # 동일 진단의 번들이 캐시되어 있으면 LLM 호출 없이 즉시 전송
+                deltas = iter([cached.format_advice()])
+            elif session["kind"] == "treatment":
+                deltas = advisor.stream_treatment_advice(**params)
+            else:
+                deltas = advisor.stream_user_notes_advice(params["user_notes"])
+            for delta in deltas:
+                chunks.append(delta)
+                yield sse_event({"text": delta}, event="delta")
+            yield sse_event({"treatment_advice": "".join(chunks).strip()}, event="done")
+            _finish_advice_session(detection_id)
+        except Exception as e:
+            logger.error("LLM 스트리밍 실패: %s", e)
+            yield sse_event({"message": f"방제법 생성 중 오류가 발생했습니다: {e}"}, event="error")
+
+    # 동기 제너레이터는 Starlette가 스레드풀에서 순회하므로 이벤트 루프를 막지 않음
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 # --- Cleanup (from teammate) ---
 @app.delete("/api/cleanup")
 async def cleanup_files():
@@ -49,6 +49,14 @@ class GrowthGraphPoint(BaseModel):
     size: float = Field(..., description="식물 크기 (cm 단위)")
 
 
+class GrowthBandPoint(BaseModel):
+    """Monte Carlo 성장 구간 포인트 (기간별 백분위 크기)"""
+    period: int = Field(..., description="현재로부터 예상 기간 (주 또는 월)")
+    p10: float = Field(..., description="하위 10% 크기 (cm)")
+    p50: float = Field(..., description="중앙값 크기 (cm)")
+    p90: float = Field(..., description="상위 10% 크기 (cm)")
+
+
 class PeriodAnalysis(BaseModel):
     """기간별 상세 분석"""
     period: int = Field(..., description="기간 (주 또는 월)")
@@ -69,7 +77,8 @@ class GrowthGraph(BaseModel):
     plant_name: str = Field(..., description="식물 이름")
     min_size: float = Field(..., description="발아단계 최소 크기 (cm) - Y축 시작값")
     max_size: float = Field(..., description="최대 성장 크기 (cm) - Y축 끝값")
-    period_analyses: List[PeriodAnalysis] = Field(default_factory=list, description="월별 상세 분석 정보")
+    period_analyses: List[PeriodAnalysis] = Field(default_factory=list, description="월별 상세 분석 정보 (include=period_analyses일 때만 채움)")
+    uncertainty_bands: List[GrowthBandPoint] = Field(default_factory=list, description="Monte Carlo 성장 구간 (p10/p50/p90)")
     note: str = Field("성장 그래프는 환경/관리 상태에 따라 달라질 수 있습니다.", description="해석 노트")
     # 그래프 시각화 정보
     graph_config: Dict[str, Any] = Field(
@@ -116,8 +125,58 @@ class MonthlyDataAnalysis(BaseModel):
     """월별 데이터 분석"""
     identification: PlantIdentification = Field(..., description="식물 식별 결과")
     growth_graph: GrowthGraph = Field(..., description="성장 예측 그래프")
-    monthly_data: List[MonthlyDataRow] = Field(..., description="월별 데이터 전체 테이블")
-    comprehensive_analysis: str = Field(..., description="AI 종합 분석 및 조언 (1-3개월, 4-6개월, 7-12개월 주기별 설명)")
+    monthly_data: Optional[List[MonthlyDataRow]] = Field(None, description="월별 데이터 전체 테이블 (include에 포함된 경우)")
+    comprehensive_analysis: Optional[str] = Field(None, description="AI 종합 분석 및 조언 (include에 포함된 경우)")
     success: bool = True
     message: str = "월별 데이터 분석이 완료되었습니다."
 
+
+class BatchPlantRef(BaseModel):
+    """일괄 성장 예측 대상 식물 (data_id 우선, 없으면 식물명의 최신 저장 데이터)"""
+    plant_name: Optional[str] = Field(None, description="식물 이름")
+    data_id: Optional[str] = Field(None, description="저장된 데이터 ID")
+
+
+class BatchGrowthRequest(BaseModel):
+    """여러 식물 성장 예측 요청"""
+    plants: List[BatchPlantRef] = Field(..., description="대상 식물 목록")
+    period_unit: str = Field("month", description="기간 단위 ('week' 또는 'month')")
+    max_periods: int = Field(12, ge=1, description="최대 기간 수 (단위별 상한으로 제한)")
+    simulate: bool = Field(True, description="Monte Carlo 성장 구간(uncertainty_bands) 포함 여부")
+
+
+class BatchGrowthItem(BaseModel):
+    """식물 한 개의 성장 예측 결과"""
+    identification: PlantIdentification = Field(..., description="식물 식별 결과 (저장 데이터가 없으면 기본값)")
+    growth_graph: GrowthGraph = Field(..., description="성장 예측 그래프 (기간별 상세 분석 제외)")
+    monthly_data: List[MonthlyDataRow] = Field(..., description="기간별 데이터 전체 테이블 (period_unit 단위 라벨)")
+    data_id: Optional[str] = Field(None, description="사용된 저장 데이터 ID")
+    found: bool = Field(True, description="저장된 식물 분석 데이터를 찾았는지 여부")
+
+
+class BatchGrowthResponse(BaseModel):
+    """여러 식물 성장 예측 응답 (요청 순서 유지)"""
+    items: List[BatchGrowthItem]
+    period_unit: str
+    success: bool = True
+    message: str = "일괄 성장 예측이 완료되었습니다."
+
+
+class ImageJobRequest(BaseModel):
+    """성장 단계 이미지 생성 작업 요청 (프롬프트는 plant_name + months로 서버가 만듦)"""
+    plant_name: str = Field(..., min_length=1, max_length=50, description="식물 이름")
+    months: int = Field(0, ge=0, le=120, description="성장 단계 (현재로부터 개월 수)")
+
+
+class ImageJobStatus(BaseModel):
+    """이미지 생성 작업 상태"""
+    job_id: str = Field(..., description="작업 ID")
+    key: str = Field(..., description="이미지 캐시 키 (프롬프트/모델/옵션 SHA-256)")
+    status: str = Field(..., description="queued / running / done / failed")
+    image_url: Optional[str] = Field(None, description="완료 시 이미지 다운로드 URL")
+    cached: bool = Field(False, description="제출 시점에 이미 생성되어 있었는지 여부")
+    queue_position: Optional[int] = Field(None, description="대기 순서 (0부터, 대기 중일 때만)")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
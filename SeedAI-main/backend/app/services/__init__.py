@@ -1,15 +1,33 @@
-from .classifier import classify_plant, classify_plant_with_plantrecog, classify_plant_multi_model, classify_plant_multi_model_kr, classify_plant_auto_select, classify_plant_auto_select_kr
-from .guide import generate_care_guide
-from .growth import generate_growth_prediction
-
-__all__ = [
-    "classify_plant",
-    "classify_plant_with_plantrecog",
-    "classify_plant_multi_model",
-    "classify_plant_multi_model_kr",
-    "classify_plant_auto_select",
-    "classify_plant_auto_select_kr",
-    "generate_care_guide",
-    "generate_growth_prediction"
-]
+"""
+서비스 패키지
+- 분류/가이드/성장 함수는 첫 접근 시 해당 모듈을 import (PEP 562 __getattr__)
+  → `from app.services import db_utils`처럼 일부만 쓰는 프로세스가 전체 서비스를 불러오지 않음
+"""
+import importlib
 
+# 공개 이름 → 정의 모듈
+_EXPORTS = {
+    "classify_plant": "classifier",
+    "classify_plant_with_plantrecog": "classifier",
+    "classify_plant_multi_model": "classifier",
+    "classify_plant_multi_model_kr": "classifier",
+    "classify_plant_auto_select": "classifier",
+    "classify_plant_auto_select_kr": "classifier",
+    "generate_care_guide": "guide",
+    "generate_growth_prediction": "growth",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
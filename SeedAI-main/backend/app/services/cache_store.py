@@ -0,0 +1,157 @@
+"""
+영속 캐시 저장소 (sqlite)
+- 네임스페이스별 key → JSON 값
+- LRU: 마지막 접근 시각 기준으로 max_entries 초과분 제거
+  (적중 시 접근 시각은 ACCESS_TOUCH_INTERVAL초보다 오래된 경우에만 기록 → 읽기 경로에서 쓰기/커밋 생략)
+- TTL: 기한이 지난 항목은 stale로 표시하여 반환 (호출자가 백그라운드 갱신 여부 결정)
+- 서버 재시작 후에도 유지되며, 여러 스레드에서 공유 (연결 1개 + 락)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+# 적중 시 접근 시각 갱신 최소 간격 (초, LRU 순서는 이 정밀도로 유지)
+ACCESS_TOUCH_INTERVAL = 60.0
+
+
+@dataclass
+class CacheEntry:
+    """캐시 조회 결과"""
+    value: Any
+    created_at: float
+    stale: bool
+
+
+class PersistentCache:
+    """sqlite 기반 TTL + LRU 캐시 (네임스페이스 단위)"""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int,
+        ttl: Optional[float],
+        path: Optional[str] = None,
+        touch_interval: float = ACCESS_TOUCH_INTERVAL
+    ):
+        """
+        Args:
+            namespace: 캐시 이름 (같은 DB 파일을 여러 캐시가 공유)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 접근하지 않은 항목부터 제거)
+            ttl: 항목 유효 기간 (초, None이면 만료 없음). 지난 항목은 stale=True로 반환
+            path: sqlite 파일 경로 (생략 시 settings.cache_db_path)
+            touch_interval: 적중 시 접근 시각 갱신 최소 간격 (초)
+        """
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+        self.path = path or settings.cache_db_path
+        self._conn = _connect(self.path)
+        self._lock = _lock_for(self.path)
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "touches": 0}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """항목을 조회합니다. 없으면 None. 접근 시각은 touch_interval보다 오래된 경우에만 갱신합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, accessed_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            if now - row[2] >= self.touch_interval:
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+                self._conn.commit()
+                self._stats["touches"] += 1
+            stale = self.ttl is not None and now - row[1] > self.ttl
+            self._stats["stale_hits" if stale else "hits"] += 1
+        return CacheEntry(value=json.loads(row[0]), created_at=row[1], stale=stale)
+
+    def set(self, key: str, value: Any) -> None:
+        """항목을 저장(덮어쓰기)하고 용량 초과분을 LRU로 제거합니다."""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now),
+            )
+            cursor = self._conn.execute(
+                """
+                DELETE FROM cache WHERE namespace = ? AND key IN (
+                    SELECT key FROM cache WHERE namespace = ?
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.namespace, self.namespace, self.max_entries),
+            )
+            self._conn.commit()
+            self._stats["sets"] += 1
+            self._stats["evictions"] += max(0, cursor.rowcount)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스/저장/제거/접근 시각 기록 횟수와 현재 항목 수"""
+        size = len(self)
+        with self._lock:
+            return {**self._stats, "entries": size, "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+# 파일 경로별 공유 연결
+_connections: Dict[str, sqlite3.Connection] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    with _registry_lock:
+        conn = _connections.get(path)
+        if conn is None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache (namespace, accessed_at)")
+            conn.commit()
+            _connections[path] = conn
+            _locks[path] = threading.Lock()
+        return conn
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _registry_lock:
+        return _locks[path]
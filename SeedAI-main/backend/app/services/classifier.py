@@ -1,17 +1,21 @@
+import threading
 from io import BytesIO
-from PIL import Image
-import torch
 import numpy as np
-from transformers import AutoImageProcessor, AutoModelForImageClassification, pipeline
 import requests
 from app.config import settings
 from app.models.schemas import PlantIdentification
+from app.services import model_server
+from app.services.cache_store import PersistentCache
+from app.services.llm_router import get_router
 
 # 전역 변수로 모델 캐싱
 _classifier_model = None
 _processor = None
+_classifier_lock = threading.Lock()  # 사전 로드 스레드와 첫 요청이 동시에 로드하지 않도록
 _translator = None
 _translation_cache = {}
+# 번역 영속 캐시 (서버 재시작 후에도 유지, 메모리 dict는 그 앞단)
+_persistent_translations = None
 
 
 def load_classifier():
@@ -19,30 +23,83 @@ def load_classifier():
     global _classifier_model, _processor
     
     if _classifier_model is None:
-        print(f"모델 로딩 중: {settings.plant_classifier_model}")
-        try:
-            _processor = AutoImageProcessor.from_pretrained(
-                settings.plant_classifier_model,
-                cache_dir=settings.cache_dir,
-                token=settings.huggingface_token
-            )
-            _classifier_model = AutoModelForImageClassification.from_pretrained(
-                settings.plant_classifier_model,
-                cache_dir=settings.cache_dir,
-                token=settings.huggingface_token
-            )
-            # GPU가 있으면 사용
-            if torch.cuda.is_available():
-                _classifier_model = _classifier_model.cuda()
-            _classifier_model.eval()
-            print("모델 로딩 완료!")
-        except Exception as e:
-            print(f"모델 로딩 실패: {e}")
-            raise
+        with _classifier_lock:
+            if _classifier_model is None:
+                # torch/transformers는 첫 사용(또는 preload) 시에만 import (서버 시작 속도)
+                import torch
+                from transformers import AutoImageProcessor, AutoModelForImageClassification
+                print(f"모델 로딩 중: {settings.plant_classifier_model}")
+                try:
+                    processor = AutoImageProcessor.from_pretrained(
+                        settings.plant_classifier_model,
+                        cache_dir=settings.cache_dir,
+                        token=settings.huggingface_token
+                    )
+                    model = AutoModelForImageClassification.from_pretrained(
+                        settings.plant_classifier_model,
+                        cache_dir=settings.cache_dir,
+                        token=settings.huggingface_token
+                    )
+                    # GPU가 있으면 사용
+                    if torch.cuda.is_available():
+                        model = model.cuda()
+                    model.eval()
+                    # 완전히 준비된 뒤에 공개 (다른 스레드가 로드 중인 모델을 보지 않도록)
+                    _processor, _classifier_model = processor, model
+                    print("모델 로딩 완료!")
+                except Exception as e:
+                    print(f"모델 로딩 실패: {e}")
+                    raise
     
     return _processor, _classifier_model
 
 
+def warmup_classifier() -> None:
+    """분류 모델을 로드하고 더미 입력으로 추론을 한 번 실행합니다 (첫 요청의 초기화 비용 제거)."""
+    import torch
+
+    _, model = load_classifier()
+    pixel_values = torch.zeros((1, 3, 224, 224), dtype=torch.float32)
+    if torch.cuda.is_available():
+        pixel_values = pixel_values.cuda()
+    with torch.no_grad():
+        model(pixel_values=pixel_values)
+
+
+def classify_array(pixel_values: np.ndarray, k: int = 3) -> list:
+    """
+    전처리된 이미지 배열의 상위 k개 레이블/확률 (모델 서버도 이 함수로 추론)
+
+    Args:
+        pixel_values: (1, 3, 224, 224) float32 배열
+
+    Returns:
+        list: [{"label": ..., "score": ...}, ...] (확률 내림차순)
+    """
+    import torch
+
+    _, model = load_classifier()
+    # from_numpy는 복사하지 않으므로 공유 메모리 버퍼를 그대로 입력으로 사용
+    inputs = torch.from_numpy(pixel_values)
+    
+    # GPU로 이동 (사용 가능한 경우)
+    if torch.cuda.is_available():
+        inputs = inputs.cuda()
+    
+    # 추론 실행
+    with torch.no_grad():
+        logits = model(pixel_values=inputs).logits
+    
+    # Softmax를 적용하여 확률로 변환
+    probabilities = torch.nn.functional.softmax(logits, dim=-1)
+    top_probs, top_indices = torch.topk(probabilities[0], k=k)
+    
+    return [
+        {"label": model.config.id2label.get(int(idx), f"Class {idx}"), "score": float(prob)}
+        for prob, idx in zip(top_probs, top_indices)
+    ]
+
+
 def classify_plant(image: bytes) -> PlantIdentification:
     """
     Transformers 라이브러리를 직접 사용하여 식물 종을 식별합니다.
@@ -53,6 +110,8 @@ def classify_plant(image: bytes) -> PlantIdentification:
     Returns:
         PlantIdentification: 식물 식별 결과
     """
+    from PIL import Image
+
     try:
         # 이미지 전처리
         img = Image.open(BytesIO(image))
@@ -61,9 +120,6 @@ def classify_plant(image: bytes) -> PlantIdentification:
         if img.mode != "RGB":
             img = img.convert("RGB")
         
-        # 모델 로드
-        processor, model = load_classifier()
-        
         # 수동 이미지 전처리 (NumPy 호환성 문제 우회)
         # 224x224로 리사이즈
         img_resized = img.resize((224, 224), Image.Resampling.LANCZOS)
@@ -76,35 +132,14 @@ def classify_plant(image: bytes) -> PlantIdentification:
         std = np.array([0.5, 0.5, 0.5])
         img_array = (img_array - mean) / std
         
-        # (H, W, C) -> (C, H, W) 변환
-        img_array = np.transpose(img_array, (2, 0, 1))
-        
-        # PyTorch 텐서로 변환
-        pixel_values = torch.tensor(img_array, dtype=torch.float32).unsqueeze(0)
-        inputs = {"pixel_values": pixel_values}
-        
-        # GPU로 이동 (사용 가능한 경우)
-        if torch.cuda.is_available():
-            inputs = {k: v.cuda() for k, v in inputs.items()}
+        # (H, W, C) -> (C, H, W) 변환, 배치 차원 추가
+        pixel_values = np.transpose(img_array, (2, 0, 1))[np.newaxis].astype(np.float32)
         
-        # 추론 실행
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-        
-        # 결과 파싱
-        # Softmax를 적용하여 확률로 변환
-        probabilities = torch.nn.functional.softmax(logits, dim=-1)
-        top_probs, top_indices = torch.topk(probabilities[0], k=3)
-        
-        # 결과 추출
-        results = []
-        for prob, idx in zip(top_probs, top_indices):
-            label = model.config.id2label.get(int(idx), f"Class {idx}")
-            results.append({
-                "label": label,
-                "score": float(prob)
-            })
+        # 모델 서버가 설정되어 있으면 공유 메모리로 넘겨 추론 (이 프로세스는 torch/가중치를 로드하지 않음)
+        if model_server.enabled():
+            results = model_server.get_client().call("classify", pixel_values, k=3)
+        else:
+            results = classify_array(pixel_values, k=3)
         
         if results:
             top_result = results[0]
@@ -150,9 +185,34 @@ def get_default_identification() -> PlantIdentification:
     )
 
 
+def get_translation_cache() -> PersistentCache:
+    """식물 이름 번역 영속 캐시 (영어 이름 → 한국어 이름)"""
+    global _persistent_translations
+    if _persistent_translations is None:
+        _persistent_translations = PersistentCache(
+            "plant_name_ko",
+            max_entries=settings.translation_cache_max_entries,
+            ttl=settings.translation_cache_ttl,
+        )
+    return _persistent_translations
+
+
+def get_classifier_labels() -> list:
+    """분류 모델의 전체 레이블 (id2label 순서, 가중치 없이 config만 로드)"""
+    if model_server.enabled():
+        return model_server.get_client().call("classifier_labels")
+    from transformers import AutoConfig
+    config = AutoConfig.from_pretrained(
+        settings.plant_classifier_model,
+        cache_dir=settings.cache_dir,
+        token=settings.huggingface_token
+    )
+    return [config.id2label[i] for i in sorted(config.id2label, key=int)]
+
+
 def translate_to_korean(text: str) -> str:
     """
-    GPT-4o-mini를 사용하여 영어 식물 이름을 한국어로 번역합니다.
+    LLM(OpenAI 또는 로컬 llama.cpp, llm_router가 선택)을 사용하여 영어 식물 이름을 한국어로 번역합니다.
 
     Args:
         text: 영어 식물 이름
@@ -165,19 +225,19 @@ def translate_to_korean(text: str) -> str:
     # 이미 번역된 것이 있으면 캐시에서 반환
     if text in _translation_cache:
         return _translation_cache[text]
+    try:
+        entry = get_translation_cache().get(text)
+    except Exception as e:
+        print(f"[번역 캐시 조회 실패] {text}: {e}")
+        entry = None
+    if entry is not None and not entry.stale:
+        _translation_cache[text] = entry.value
+        return entry.value
     
     try:
-        # OpenAI 클라이언트 import
-        from app.services.guide import load_openai_client
-
-        client = load_openai_client()
-        if client is None:
-            print(f"[번역 실패] OpenAI 클라이언트 없음: {text}")
-            return text
-        
-        # GPT-4o-mini로 식물 이름 번역
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        # 번역 요청은 라우터가 지연/오류율 기준으로 OpenAI 또는 로컬 LLM에 배정
+        result = get_router().complete(
+            "translation",
             messages=[
                 {
                     "role": "system",
@@ -192,16 +252,20 @@ def translate_to_korean(text: str) -> str:
             max_tokens=50
         )
         
-        translated = response.choices[0].message.content.strip()
+        translated = result.text
 
         # 캐시에 저장
         _translation_cache[text] = translated
-        print(f"[GPT 번역] {text} → {translated}")
+        get_translation_cache().set(text, translated)
+        print(f"[번역] {text} → {translated} ({result.provider})")
 
         return translated
         
     except Exception as e:
         print(f"[번역 오류] {text}: {e}")
+        if entry is not None:
+            # 기한이 지난 번역이라도 원문보다 나음
+            return entry.value
         # 오류 발생 시 원문 반환
         return text
 
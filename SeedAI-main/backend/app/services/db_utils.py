@@ -1,6 +1,6 @@
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from app.models.schemas import PlantIdentification
@@ -133,7 +133,50 @@ def load_identification_data(data_id: Optional[str] = None, plant_name: Optional
         return None
 
 
-def save_growth_log(plant_id: str, date: str, height: float):
+def load_identification_data_many(
+    keys: List[Tuple[Optional[str], Optional[str]]]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 식물의 분석 데이터를 파일을 한 번만 읽어 조회합니다.
+    각 항목의 조회 규칙은 load_identification_data와 같습니다 (data_id 우선, 없으면 식물명의 최신 데이터).
+
+    Args:
+        keys: (data_id, plant_name) 목록
+
+    Returns:
+        keys와 같은 순서의 식물 분석 데이터 (없으면 None)
+    """
+    if not IDENTIFICATION_FILE.exists():
+        return [None] * len(keys)
+
+    try:
+        with open(IDENTIFICATION_FILE, 'r', encoding='utf-8') as f:
+            identifications = json.load(f)
+    except Exception as e:
+        print(f"[db_utils] 식물 분석 데이터 일괄 로드 오류: {e}")
+        return [None] * len(keys)
+
+    # 식물명별 최신 데이터
+    latest_by_name: Dict[str, Dict[str, Any]] = {}
+    for data in identifications.values():
+        name = data.get("identification", {}).get("plant_name")
+        current = latest_by_name.get(name)
+        if current is None or data.get("timestamp", "") > current.get("timestamp", ""):
+            latest_by_name[name] = data
+
+    results = []
+    for data_id, plant_name in keys:
+        if data_id:
+            results.append(identifications.get(data_id))
+        elif plant_name:
+            results.append(latest_by_name.get(plant_name))
+        else:
+            results.append(None)
+    print(f"[db_utils] 식물 분석 데이터 일괄 로드: {len(keys)}개 요청, {sum(r is not None for r in results)}개 찾음")
+    return results
+
+
+def save_growth_log(plant_id: str, date: str, height: float) -> Optional[float]:
     """
     성장 기록을 로컬 파일과 메모리에 저장합니다.
     
@@ -141,7 +184,11 @@ def save_growth_log(plant_id: str, date: str, height: float):
         plant_id: 식물 ID
         date: 날짜 (문자열)
         height: 높이 (cm)
+
+    Returns:
+        같은 날짜의 기존 높이 (새 기록이면 None, 성장 곡선 적합 갱신에 사용)
     """
+    previous_height = None
     # 메모리에 저장
     if plant_id not in _growth_data:
         _growth_data[plant_id] = []
@@ -155,6 +202,7 @@ def save_growth_log(plant_id: str, date: str, height: float):
     
     if existing_index is not None:
         # 기존 기록 업데이트
+        previous_height = _growth_data[plant_id][existing_index]["height"]
         _growth_data[plant_id][existing_index]["height"] = height
     else:
         # 새 기록 추가
@@ -183,6 +231,8 @@ def save_growth_log(plant_id: str, date: str, height: float):
                 break
         
         if file_existing_index is not None:
+            # 파일 기록이 기준 (load_growth_history와 동일)
+            previous_height = growth_history[plant_id][file_existing_index].get("height")
             growth_history[plant_id][file_existing_index]["height"] = height
         else:
             growth_history[plant_id].append({"date": date, "height": height})
@@ -193,6 +243,8 @@ def save_growth_log(plant_id: str, date: str, height: float):
     except Exception as e:
         print(f"성장 기록 파일 저장 오류: {e}")
 
+    return previous_height
+
 
 def load_growth_history(plant_id: str) -> List[Dict]:
     """
@@ -1,9 +1,7 @@
 import base64
 from typing import List
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, FrozenSet
 from io import BytesIO
-import torch
-from diffusers import AutoPipelineForText2Image
 from app.config import settings
 from app.models.schemas import GrowthPrediction, GrowthStage
 from app.models.schemas import (
@@ -11,45 +9,100 @@ from app.models.schemas import (
     GrowthStage,
     GrowthGraph,
     GrowthGraphPoint,
+    GrowthBandPoint,
     PeriodAnalysis,
     PlantIdentification,
 )
 # koGPT2 모델 사용 중지 - Qwen 모델 사용
 # from app.services.guide import load_text_generator # <-- koGPT2는 주석 처리 유지
-from app.services.db_utils import load_identification_data
+from app.services.db_utils import load_identification_data, load_identification_data_many
 from app.services.textgen_adapter import render_plant_analysis
-import math
-import hashlib
+from app.services import growth_engine, image_jobs
+import numpy as np
 
 # 전역 변수로 모델 캐싱
 _image_pipeline = None
 
+# 성장 응답에서 요청 시에만 계산하는 필드 (include 쿼리)
+GROWTH_OPTIONAL_FIELDS: FrozenSet[str] = frozenset({"period_analyses", "monthly_data", "comprehensive_analysis"})
+# include를 생략했을 때 계산하는 필드 (프론트엔드가 사용하는 필드만)
+DEFAULT_GROWTH_FIELDS: FrozenSet[str] = frozenset({"monthly_data", "comprehensive_analysis"})
+
+
+def parse_growth_fields(include: Optional[str]) -> FrozenSet[str]:
+    """
+    include 쿼리 문자열을 계산할 필드 집합으로 변환합니다.
+
+    Args:
+        include: 쉼표로 구분한 필드 이름 (None이면 기본값, "all"이면 전체, ""이면 없음)
+
+    Raises:
+        ValueError: 알 수 없는 필드 이름
+    """
+    if include is None:
+        return DEFAULT_GROWTH_FIELDS
+    names = {name.strip() for name in include.split(",") if name.strip()}
+    if "all" in names:
+        return GROWTH_OPTIONAL_FIELDS
+    unknown = names - GROWTH_OPTIONAL_FIELDS
+    if unknown:
+        raise ValueError(
+            f"알 수 없는 필드: {', '.join(sorted(unknown))} "
+            f"(사용 가능: {', '.join(sorted(GROWTH_OPTIONAL_FIELDS))}, all)"
+        )
+    return frozenset(names)
+
+
+def create_image_pipeline():
+    """이미지 생성 파이프라인을 새로 로드합니다 (실패 시 None, 이미지 작업 큐의 복제본 생성에도 사용)"""
+    print(f"이미지 생성 모델 로딩 중: {settings.image_generation_model}")
+    try:
+        # torch/diffusers는 이미지 생성 시에만 import (서버 시작 속도, SD 미사용 프로세스 메모리)
+        import torch
+        from diffusers import AutoPipelineForText2Image
+        pipeline = AutoPipelineForText2Image.from_pretrained(
+            settings.image_generation_model,
+            torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
+            cache_dir=settings.cache_dir,
+            token=settings.huggingface_token
+        )
+        # GPU가 있으면 사용
+        if torch.cuda.is_available():
+            pipeline = pipeline.to("cuda")
+        print("이미지 생성 모델 로딩 완료!")
+        return pipeline
+    except Exception as e:
+        print(f"이미지 생성 모델 로딩 실패: {e}")
+        return None
+
 
 def load_image_generator():
     """이미지 생성 파이프라인을 로드합니다 (처음 한 번만 로드)"""
     global _image_pipeline
     
     if _image_pipeline is None:
-        print(f"이미지 생성 모델 로딩 중: {settings.image_generation_model}")
-        try:
-            _image_pipeline = AutoPipelineForText2Image.from_pretrained(
-                settings.image_generation_model,
-                torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-                cache_dir=settings.cache_dir,
-                token=settings.huggingface_token
-            )
-            # GPU가 있으면 사용
-            if torch.cuda.is_available():
-                _image_pipeline = _image_pipeline.to("cuda")
-            print("이미지 생성 모델 로딩 완료!")
-        except Exception as e:
-            print(f"이미지 생성 모델 로딩 실패: {e}")
-            # 모델 로딩 실패 시 None으로 유지
-            pass
+        # 모델 로딩 실패 시 None으로 유지
+        _image_pipeline = create_image_pipeline()
     
     return _image_pipeline
 
 
+def stage_image_prompt(plant_name: str, months: int) -> str:
+    """
+    성장 단계 이미지 프롬프트를 만듭니다.
+    단계 묘사는 4구간으로 나누어 같은 구간의 월은 같은 이미지(캐시 키)를 공유합니다.
+    """
+    if months == 0:
+        stage = "young seedling in a small pot"
+    elif months <= 3:
+        stage = "young plant with fresh new leaves"
+    elif months <= 6:
+        stage = "healthy growing plant with lush leaves"
+    else:
+        stage = "mature fully grown plant"
+    return f"a realistic photo of a potted {plant_name} houseplant, {stage}, soft natural light, plain background"
+
+
 def generate_growth_prediction(plant_name: str) -> GrowthPrediction:
     """
     식물 성장 예측 정보를 생성합니다.
@@ -133,6 +186,7 @@ def get_default_growth_prediction(plant_name: str) -> GrowthPrediction:
         "12개월": f"완전히 성장한 {plant_name}의 최종 모습입니다."
     }
 
+    images_available = image_jobs.images_available()
     for i in range(13):  # 0부터 12까지 (13개)
         if i == 0:
             timeframe = "현재"
@@ -141,10 +195,14 @@ def get_default_growth_prediction(plant_name: str) -> GrowthPrediction:
             timeframe = f"{i}개월"
             stage = f"{i}_months"
 
+        # 이미지는 참조 URL만 채우고 처음 조회될 때 생성 (app/api/images.py)
+        # (이미지 모델 로드가 최근 실패했으면 채우지 않음 → 클라이언트가 폴링하며 로드를 반복 시도하지 않도록)
+        image_url = image_jobs.image_url_for(stage_image_prompt(plant_name, i)) if images_available else None
+
         stages.append(GrowthStage(
             stage=stage,
             timeframe=timeframe,
-            image_url=None,
+            image_url=image_url,
             description=descriptions.get(timeframe, f"{plant_name}가 건강하게 성장하고 있습니다.")
         ))
     
@@ -152,16 +210,15 @@ def get_default_growth_prediction(plant_name: str) -> GrowthPrediction:
 
 
 def _seed_from_name(plant_name: str) -> float:
-    """식물 이름으로부터 0-1 범위의 결정적 시드를 생성합니다."""
-    digest = hashlib.sha256(plant_name.encode("utf-8")).hexdigest()
-    # 앞 8자리 정수화 후 0-1 스케일
-    value = int(digest[:8], 16) / 0xFFFFFFFF
-    return max(0.0, min(1.0, value))
+    """식물 이름으로부터 0-1 범위의 결정적 시드를 생성합니다 (이름당 한 번만 해시)."""
+    return growth_engine.seed_from_name(plant_name)
 
 
 def get_plant_size_range(plant_name: str, identification: Optional[PlantIdentification] = None) -> Tuple[float, float]:
     """
     식물 이름 및 종분석 데이터 기반으로 초기 크기와 최대 크기 범위를 반환합니다.
+    소형(5-30cm) / 중형(10-60cm) / 대형(20-150cm) 유형은 이름 시드로 결정되고,
+    종분석 신뢰도가 높을수록 범위 보정이 작아집니다.
 
     Args:
         plant_name: 식물 이름
@@ -170,115 +227,86 @@ def get_plant_size_range(plant_name: str, identification: Optional[PlantIdentifi
     Returns:
         (초기_크기, 최대_크기) 튜플 (cm 단위)
     """
-    seed = _seed_from_name(plant_name)
-
-    # 식물 유형별 기본 크기 범위 (cm)
-    # 소형 식물: 5-30cm, 중형 식물: 10-60cm, 대형 식물: 20-150cm
-    plant_type_seed = int(seed * 1000) % 3
-
-    # 종분석 데이터가 제공되면 신뢰도를 고려하여 범위 조정
-    confidence_factor = 1.0
-    if identification is not None:
-        # 신뢰도가 높을수록 더 정확한 범위 예측
-        confidence_factor = 0.8 + (identification.confidence * 0.2)  # 0.8 ~ 1.0 사이
-
-    if plant_type_seed == 0:  # 소형 식물
-        initial_size = (5.0 + seed * 5.0) * confidence_factor  # 5-10cm (조정)
-        max_size = (20.0 + seed * 10.0) * confidence_factor     # 20-30cm (조정)
-    elif plant_type_seed == 1:  # 중형 식물
-        initial_size = (8.0 + seed * 7.0) * confidence_factor   # 8-15cm (조정)
-        max_size = (40.0 + seed * 20.0) * confidence_factor     # 40-60cm (조정)
-    else:  # 대형 식물
-        initial_size = (15.0 + seed * 10.0) * confidence_factor  # 15-25cm (조정)
-        max_size = (80.0 + seed * 70.0) * confidence_factor      # 80-150cm (조정)
+    confidence = np.nan if identification is None else identification.confidence
+    initial, maximum = growth_engine.size_ranges(
+        np.array([_seed_from_name(plant_name)]), np.array([confidence])
+    )
+    return float(initial[0]), float(maximum[0])
 
-    # 최소값 보장
-    initial_size = max(3.0, initial_size)
-    max_size = max(initial_size * 2, max_size)
 
-    return round(initial_size, 1), round(max_size, 1)
+def _to_points(periods: List[int], sizes: np.ndarray) -> List[GrowthGraphPoint]:
+    """기간/크기 배열을 그래프 포인트 리스트로 변환합니다."""
+    return [GrowthGraphPoint(period=p, size=s) for p, s in zip(periods, sizes.tolist())]
 
 
-def generate_growth_graph(plant_name: str, period_unit: str = "month", max_periods: int = 12, identification: Optional[PlantIdentification] = None) -> GrowthGraph:
+def generate_growth_graph(plant_name: str, period_unit: str = "month", max_periods: int = 12, identification: Optional[PlantIdentification] = None, simulate: bool = True, period_analyses: bool = True) -> GrowthGraph:
     """
     종분석 데이터를 기반으로 성장 예측 그래프를 생성합니다.
-    좋은 생장/나쁜 생장 지표 2개를 생성합니다.
+    좋은 생장/나쁜 생장 지표 2개를 생성합니다 (곡선 계산은 growth_engine).
+    긴 기간은 단위별 상한으로 제한되고 포인트 수는 growth_engine.MAX_GRAPH_POINTS 이하로 줄어듭니다.
 
     Args:
         plant_name: 식물 이름
         period_unit: 기간 단위 ('week' 또는 'month')
         max_periods: 최대 기간 수 (주 또는 월)
         identification: 식물 종분석 데이터 (Y축 범위 계산에 사용)
+        simulate: Monte Carlo 성장 구간(p10/p50/p90) 포함 여부
+        period_analyses: 기간별 상세 분석 텍스트 포함 여부 (False면 빈 목록, generate_period_analysis로 개별 조회)
 
     Returns:
         GrowthGraph: 좋은/나쁜 생장 그래프 포함
     """
-    seed = _seed_from_name(plant_name)
-
-    # 종분석 데이터(identification)를 활용하여 Y축 범위 계산
-    # identification이 제공되면 신뢰도를 반영한 더 정확한 범위 계산
-    initial_size, max_size = get_plant_size_range(plant_name, identification)
-
-    # 기간별 데이터 포인트 생성
-    if period_unit == "week":
-        periods = list(range(0, max_periods + 1, max(1, max_periods // 12)))  # 최대 12개 포인트
-        if periods[-1] != max_periods:
-            periods.append(max_periods)
-    else:  # month
-        periods = list(range(0, max_periods + 1))
-
-    def generate_growth_curve(periods_list: List[int], growth_rate_multiplier: float) -> List[GrowthGraphPoint]:
-        """
-        성장 곡선을 생성합니다.
-
-        Args:
-            periods_list: 기간 리스트
-            growth_rate_multiplier: 성장률 배수 (1.0 = 예상, 1.3 = 좋은 생장, 0.7 = 나쁜 생장)
-
-        Returns:
-            GrowthGraphPoint 리스트
-        """
-        points = []
-
-        for period in periods_list:
-            # 로지스틱 곡선 기반 성장 계산
-            # k: 성장 속도 (period_unit에 따라 조정)
-            if period_unit == "week":
-                k = (0.15 + 0.1 * seed) * growth_rate_multiplier  # 주별 성장률
-                x0 = (8.0 - 4.0 * seed) * growth_rate_multiplier  # 전환점 (주)
-                normalized_period = period / max_periods * 24  # 24주 기준 정규화
-            else:  # month
-                k = (0.35 + 0.2 * seed) * growth_rate_multiplier  # 월별 성장률
-                x0 = (3.0 - 1.5 * seed) * growth_rate_multiplier  # 전환점 (월)
-                normalized_period = period
-
-            # 로지스틱 함수로 성장 지수 계산 (0-1)
-            growth_index = 1.0 / (1.0 + math.exp(-k * (normalized_period - x0)))
-
-            # 초기 크기에서 최대 크기로 변환
-            current_size = initial_size + (max_size - initial_size) * growth_index
-
-            # 작은 변동 추가 (자연스러운 성장 곡선)
-            variation = (seed * 0.1 - 0.05) * current_size
-            current_size += variation
-
-            # 크기는 최소 초기 크기 이상, 최대 크기 이하로 제한
-            current_size = max(initial_size * 0.8, min(current_size, max_size * 1.1))
-
-            points.append(GrowthGraphPoint(
-                period=period,
-                size=round(current_size, 1)
-            ))
-
-        return points
-
-    # 2가지 성장 곡선 생성 (좋은/나쁜 조건만)
-    good_growth = generate_growth_curve(periods, 1.3)  # 좋은 생장 (30% 빠른 성장)
-    bad_growth = generate_growth_curve(periods, 0.7)  # 나쁜 생장 (30% 느린 성장)
-
-    # 월별 상세 분석 생성 (identification 전달)
-    period_analyses = generate_period_analyses(plant_name, periods, period_unit, good_growth, bad_growth, identification)
+    # 종분석 데이터(identification)의 신뢰도를 반영한 크기 범위로 두 곡선을 한 번에 계산 (엔진 캐시)
+    curves = growth_engine.project_growth(
+        plant_name,
+        period_unit,
+        max_periods,
+        confidence=identification.confidence if identification is not None else None,
+    )
+    if curves.clamped:
+        print(f"[growth] 기간 상한 적용: {period_unit} {curves.requested_periods} → {curves.max_periods}")
+    initial_size, max_size = curves.initial_size, curves.max_size
+    periods = curves.periods.tolist()
 
+    good_growth = _to_points(periods, curves.curves["good"])  # 좋은 생장 (30% 빠른 성장)
+    bad_growth = _to_points(periods, curves.curves["bad"])    # 나쁜 생장 (30% 느린 성장)
+
+    # 월별 상세 분석 생성 (identification 전달, 요청 시에만)
+    analyses = []
+    if period_analyses:
+        analyses = generate_period_analyses(plant_name, periods, period_unit, good_growth, bad_growth, identification)
+
+    graph = _build_growth_graph(plant_name, period_unit, initial_size, max_size, good_growth, bad_growth, analyses)
+    if simulate:
+        _attach_bands(
+            graph, plant_name, period_unit, max_periods,
+            identification.confidence if identification is not None else None,
+        )
+    return graph
+
+
+def _attach_bands(graph: GrowthGraph, plant_name: str, period_unit: str, max_periods: int, confidence: Optional[float]) -> None:
+    """Monte Carlo 성장 구간(p10/p50/p90)을 그래프에 추가합니다 (growth_engine 캐시)."""
+    bands = growth_engine.simulate_bands(plant_name, period_unit, max_periods, confidence=confidence)
+    graph.uncertainty_bands = [
+        GrowthBandPoint(period=p, p10=lo, p50=mid, p90=hi)
+        for p, lo, mid, hi in zip(bands.periods.tolist(), bands.p10.tolist(), bands.p50.tolist(), bands.p90.tolist())
+    ]
+    graph.graph_config["show_bands"] = True
+    # 구간이 최대 크기보다 높을 수 있으므로 Y축 상한을 맞춤
+    graph.max_size = round(max(graph.max_size, float(bands.p90.max()) * 1.05), 1)
+
+
+def _build_growth_graph(
+    plant_name: str,
+    period_unit: str,
+    initial_size: float,
+    max_size: float,
+    good_growth: List[GrowthGraphPoint],
+    bad_growth: List[GrowthGraphPoint],
+    period_analyses: List[PeriodAnalysis]
+) -> GrowthGraph:
+    """곡선 포인트와 크기 범위로 GrowthGraph를 구성합니다."""
     # Y축 범위 계산 (발아단계부터 최대 크기까지, 약간의 여유 공간 추가)
     y_min = max(0, initial_size * 0.9)  # 발아단계 크기의 90% (여유 공간)
     y_max = max_size * 1.1  # 최대 크기의 110% (여유 공간)
@@ -296,7 +324,9 @@ def generate_growth_graph(plant_name: str, period_unit: str = "month", max_perio
             "good_growth_color": "#22c55e",  # 초록색 (좋은 조건)
             "bad_growth_color": "#ef4444",   # 빨간색 (나쁜 조건)
             "show_two_lines": True,          # 2개 지표선 표시
-            "chart_type": "line"            # 선 그래프
+            "chart_type": "line",           # 선 그래프
+            "band_color": "#3b82f6",         # 파란색 (Monte Carlo p10-p90 구간)
+            "show_bands": False              # 구간이 있을 때만 True
         }
     )
 
@@ -330,56 +360,100 @@ def generate_period_analyses(
     for i, period in enumerate(periods):
         if i >= len(good_growth) or i >= len(bad_growth):
             continue
+        analyses.append(_period_analysis(
+            plant_name, period, unit_label, good_growth[i].size, bad_growth[i].size, identification
+        ))
 
-        good_size = good_growth[i].size
-        bad_size = bad_growth[i].size
-        size_diff = good_size - bad_size
+    return analyses
 
-        # 기간별 단계 분류
-        if period == 0:
-            stage = "초기"
-            growth_rate_desc = "적응"
-        elif period <= 3:
-            stage = "초기 성장"
-            growth_rate_desc = "활발한 성장"
-        elif period <= 6:
-            stage = "중기 성장"
-            growth_rate_desc = "안정적 성장"
-        else:
-            stage = "후기 성장"
-            growth_rate_desc = "성숙 단계"
 
-        # 좋은 조건 분석
-        good_analysis = generate_good_condition_analysis(
-            plant_name, period, unit_label, stage, good_size, size_diff
-        )
+def _period_analysis(
+    plant_name: str,
+    period: int,
+    unit_label: str,
+    good_size: float,
+    bad_size: float,
+    identification: Optional[PlantIdentification] = None
+) -> PeriodAnalysis:
+    """한 기간의 상세 분석 텍스트 4종을 생성합니다."""
+    size_diff = good_size - bad_size
 
-        # 나쁜 조건 설명
-        bad_description = generate_bad_condition_description(
-            plant_name, period, unit_label, stage, bad_size
-        )
+    # 기간별 단계 분류
+    if period == 0:
+        stage = "초기"
+        growth_rate_desc = "적응"
+    elif period <= 3:
+        stage = "초기 성장"
+        growth_rate_desc = "활발한 성장"
+    elif period <= 6:
+        stage = "중기 성장"
+        growth_rate_desc = "안정적 성장"
+    else:
+        stage = "후기 성장"
+        growth_rate_desc = "성숙 단계"
 
-        # 나쁜 조건 영향
-        bad_impact = generate_bad_condition_impact(
-            plant_name, period, unit_label, stage, bad_size, size_diff
-        )
+    # 좋은 조건 분석
+    good_analysis = generate_good_condition_analysis(
+        plant_name, period, unit_label, stage, good_size, size_diff
+    )
 
-        # LLM 기반 전체 설명 생성 (식물종 분석 + 그래프 데이터 종합)
-        llm_analysis = generate_period_llm_analysis(
-            plant_name, period, unit_label, stage, good_size, bad_size,
-            size_diff, identification
-        )
+    # 나쁜 조건 설명
+    bad_description = generate_bad_condition_description(
+        plant_name, period, unit_label, stage, bad_size
+    )
 
-        analyses.append(PeriodAnalysis(
-            period=period,
-            good_condition_analysis=good_analysis,
-            bad_condition_description=bad_description,
-            bad_condition_impact=bad_impact,
-            llm_comprehensive_analysis=llm_analysis,
-            layout_type="split"  # 좌우 분할 레이아웃
-        ))
+    # 나쁜 조건 영향
+    bad_impact = generate_bad_condition_impact(
+        plant_name, period, unit_label, stage, bad_size, size_diff
+    )
 
-    return analyses
+    # LLM 기반 전체 설명 생성 (식물종 분석 + 그래프 데이터 종합)
+    llm_analysis = generate_period_llm_analysis(
+        plant_name, period, unit_label, stage, good_size, bad_size,
+        size_diff, identification
+    )
+
+    return PeriodAnalysis(
+        period=period,
+        good_condition_analysis=good_analysis,
+        bad_condition_description=bad_description,
+        bad_condition_impact=bad_impact,
+        llm_comprehensive_analysis=llm_analysis,
+        layout_type="split"  # 좌우 분할 레이아웃
+    )
+
+
+def generate_period_analysis(
+    plant_name: str,
+    period: int,
+    period_unit: str = "month",
+    max_periods: int = 12,
+    data_id: Optional[str] = None
+) -> PeriodAnalysis:
+    """
+    한 기간의 상세 분석만 생성합니다 (성장 응답에서 period_analyses를 생략했을 때 개별 조회용).
+    크기는 같은 조건의 성장 그래프와 동일한 곡선에서 계산합니다.
+
+    Args:
+        plant_name: 식물 이름
+        period: 기간 (0 ~ max_periods)
+        period_unit: 기간 단위 ('week' 또는 'month')
+        max_periods: 그래프의 최대 기간 수 (주 단위 곡선 형태에 영향)
+        data_id: 저장된 데이터 ID (선택사항, 신뢰도 반영)
+
+    Raises:
+        ValueError: period가 범위를 벗어난 경우
+    """
+    saved_data = load_identification_data(data_id=data_id, plant_name=plant_name)
+    identification = _identification_from_saved(saved_data, plant_name)
+    sizes = growth_engine.sizes_at(
+        identification.plant_name, period, period_unit, max_periods,
+        confidence=identification.confidence,
+    )
+    unit_label = "주" if period_unit == "week" else "개월"
+    return _period_analysis(
+        identification.plant_name, period, unit_label, sizes["good"], sizes["bad"], identification
+    )
 
 
 def generate_good_condition_analysis(
@@ -520,6 +594,7 @@ def generate_growth_inference_text(plant_name: str) -> str:
     try:
         if tokenizer is None or model is None:
             raise RuntimeError("text model unavailable")
+        import torch
 
         # 경량 생성 (짧은 길이, 반복 최소화)
         inputs = tokenizer(prompt, return_tensors="pt")
@@ -640,10 +715,102 @@ def generate_comprehensive_monthly_analysis_template(
     return f"식물 {display_name}의 생장 예측에 대한 종합 분석입니다.\n\n{period_1_3_text}\n\n{period_4_6_text}\n\n{period_7_12_text}{comprehensive_tip}"
 
 
+def _identification_from_saved(saved_data: Optional[Dict[str, Any]], plant_name: str) -> PlantIdentification:
+    """저장된 식물 분석 데이터로 PlantIdentification을 만듭니다 (없으면 신뢰도 0.5 기본값)."""
+    if saved_data:
+        identification_dict = saved_data.get("identification", {})
+        return PlantIdentification(
+            plant_name=identification_dict.get("plant_name", plant_name),
+            scientific_name=identification_dict.get("scientific_name"),
+            confidence=identification_dict.get("confidence", 0.5),
+            common_names=identification_dict.get("common_names", [])
+        )
+    # 저장된 데이터가 없으면 기본값으로 생성
+    return PlantIdentification(
+        plant_name=plant_name,
+        scientific_name=None,
+        confidence=0.5,
+        common_names=[]
+    )
+
+
+def generate_growth_projection_batch(
+    plants: List[Dict[str, Optional[str]]],
+    period_unit: str = "month",
+    max_periods: int = 12,
+    simulate: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    여러 식물의 성장 그래프와 기간별 테이블을 한 번에 생성합니다 (대시보드용).
+    저장 데이터는 파일을 한 번만 읽고, 곡선은 식물 × 기간 배열로 한 번에 계산합니다.
+    LLM 종합 분석과 기간별 상세 분석 텍스트는 포함하지 않습니다.
+
+    Args:
+        plants: [{"plant_name": ..., "data_id": ...}, ...] (data_id 우선)
+        period_unit: 기간 단위 ('week' 또는 'month')
+        max_periods: 최대 기간 수 (1 ~ 단위별 상한으로 제한)
+        simulate: Monte Carlo 성장 구간(p10/p50/p90) 포함 여부 (generate_growth_graph와 같은 기본값)
+
+    Returns:
+        요청 순서대로 {"identification", "growth_graph", "monthly_data", "data_id", "found"} 목록
+    """
+    if not plants:
+        return []
+
+    saved = load_identification_data_many([(p.get("data_id"), p.get("plant_name")) for p in plants])
+    identifications = [
+        _identification_from_saved(data, p.get("plant_name") or p.get("data_id") or "")
+        for p, data in zip(plants, saved)
+    ]
+    batch = growth_engine.project_growth_batch(
+        [ident.plant_name for ident in identifications],
+        period_unit,
+        max_periods,
+        confidences=[ident.confidence for ident in identifications],
+    )
+    if batch.max_periods != max_periods:
+        print(f"[growth] 기간 상한 적용: {period_unit} {max_periods} → {batch.max_periods}")
+    periods = batch.periods.tolist()
+    good, bad = batch.curves["good"], batch.curves["bad"]
+    # 예상 크기 = 좋은 조건과 나쁜 조건의 평균
+    expected = np.round((good + bad) / 2, 1)
+    unit_label = "주" if period_unit == "week" else "개월"
+    labels = ["현재" if period == 0 else f"{period}{unit_label}" for period in periods]
+
+    results = []
+    for i, (ident, data) in enumerate(zip(identifications, saved)):
+        good_row, bad_row, expected_row = good[i].tolist(), bad[i].tolist(), expected[i].tolist()
+        graph = _build_growth_graph(
+            ident.plant_name, period_unit,
+            float(batch.initial_sizes[i]), float(batch.max_sizes[i]),
+            _to_points(periods, good[i]), _to_points(periods, bad[i]),
+            period_analyses=[],
+        )
+        if simulate:
+            _attach_bands(graph, ident.plant_name, period_unit, batch.max_periods, ident.confidence)
+        results.append({
+            "identification": ident,
+            "growth_graph": graph,
+            "monthly_data": [
+                {
+                    "period": label,
+                    "expected_height": e,
+                    "good_condition_height": g,
+                    "bad_condition_height": b,
+                }
+                for label, e, g, b in zip(labels, expected_row, good_row, bad_row)
+            ],
+            "data_id": data.get("id") if data else None,
+            "found": data is not None,
+        })
+    return results
+
+
 def generate_monthly_data_analysis(
     plant_name: str,
     max_months: int = 12,
-    data_id: Optional[str] = None
+    data_id: Optional[str] = None,
+    fields: FrozenSet[str] = GROWTH_OPTIONAL_FIELDS
 ) -> Dict[str, Any]:
     """
     저장된 식물 데이터를 기반으로 월별 데이터 분석을 생성합니다.
@@ -653,6 +820,7 @@ def generate_monthly_data_analysis(
         plant_name: 식물 이름
         max_months: 최대 월 수 (기본값: 12)
         data_id: 저장된 데이터 ID (선택사항)
+        fields: 계산할 선택 필드 (GROWTH_OPTIONAL_FIELDS 중, 빠진 필드는 None/빈 목록)
 
     Returns:
         월별 데이터 분석 결과 (dict)
@@ -663,30 +831,15 @@ def generate_monthly_data_analysis(
     # 저장된 식물 분석 데이터 로드
     saved_data = load_identification_data(data_id=data_id, plant_name=plant_name)
     print(f"[월별 분석] 데이터 로드 완료: {time.time() - start_time:.2f}초")
-
-    if saved_data:
-        identification_dict = saved_data.get("identification", {})
-        identification = PlantIdentification(
-            plant_name=identification_dict.get("plant_name", plant_name),
-            scientific_name=identification_dict.get("scientific_name"),
-            confidence=identification_dict.get("confidence", 0.5),
-            common_names=identification_dict.get("common_names", [])
-        )
-    else:
-        # 저장된 데이터가 없으면 기본값으로 생성
-        identification = PlantIdentification(
-            plant_name=plant_name,
-            scientific_name=None,
-            confidence=0.5,
-            common_names=[]
-        )
+    identification = _identification_from_saved(saved_data, plant_name)
 
     # 성장 그래프 생성 (저장된 데이터 기반)
     growth_graph = generate_growth_graph(
         plant_name=identification.plant_name,
         period_unit="month",
         max_periods=max_months,
-        identification=identification
+        identification=identification,
+        period_analyses="period_analyses" in fields
     )
 
     # 월별 데이터 행 생성
@@ -738,17 +891,19 @@ def generate_monthly_data_analysis(
     start_cm = good_series[0] if good_series else 15.0
     K = max(good_series) if good_series else 200.0
 
-    analysis_start = time.time()
-    comprehensive_analysis = render_plant_analysis(
-        plant_name=identification.plant_name,
-        K=K,
-        start_cm=start_cm,
-        unit="month",
-        periods=12,
-        good_series=good_series,
-        bad_series=bad_series
-    )
-    print(f"[월별 분석] 종합 분석 생성 완료: {time.time() - analysis_start:.2f}초")
+    comprehensive_analysis = None
+    if "comprehensive_analysis" in fields:
+        analysis_start = time.time()
+        comprehensive_analysis = render_plant_analysis(
+            plant_name=identification.plant_name,
+            K=K,
+            start_cm=start_cm,
+            unit="month",
+            periods=12,
+            good_series=good_series,
+            bad_series=bad_series
+        )
+        print(f"[월별 분석] 종합 분석 생성 완료: {time.time() - analysis_start:.2f}초")
 
     total_time = time.time() - start_time
     print(f"[월별 분석] 전체 소요 시간: {total_time:.2f}초")
@@ -756,7 +911,7 @@ def generate_monthly_data_analysis(
     return {
         "identification": identification,
         "growth_graph": growth_graph,  # 차트 데이터 포함
-        "monthly_data": monthly_rows,
+        "monthly_data": monthly_rows if "monthly_data" in fields else None,
         "comprehensive_analysis": comprehensive_analysis
     }
 
@@ -821,6 +976,7 @@ def generate_period_llm_analysis(
     try:
         if tokenizer is None or model is None:
             raise RuntimeError("text model unavailable")
+        import torch
 
         # 경량 생성
         inputs = tokenizer(prompt, return_tensors="pt", max_length=512, truncation=True)
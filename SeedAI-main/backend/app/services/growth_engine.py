@@ -0,0 +1,376 @@
+"""
+성장 곡선 엔진 (NumPy)
+- 식물 이름 → 결정적 시드(SHA-256)는 이름당 한 번만 계산 (lru_cache)
+- 로지스틱 성장 곡선을 시나리오(성장률 배수) × 기간 배열로 한 번에 계산
+- (식물, 단위, 기간 수, 신뢰도 구간) 단위로 결과를 메모이즈 (읽기 전용 배열)
+- 긴 기간(예: week × 520)은 기간 상한으로 제한하고 그래프 포인트를 MAX_GRAPH_POINTS개로 다운샘플
+- 여러 식물은 식물 × 기간 2차원 배열로 한 번에 계산 (project_growth_batch)
+- Monte Carlo: 종별 분포에서 성장 파라미터(k, x0, K, 변동)를 샘플링해 기간별 p10/p50/p90 구간 계산 (simulate_bands)
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 기본 시나리오 (성장률 배수): 좋은 생장 30% 빠름, 나쁜 생장 30% 느림
+SCENARIOS: Dict[str, float] = {"good": 1.3, "bad": 0.7}
+# 단위별 최대 기간 (이보다 길면 상한으로 제한)
+MAX_PERIODS = {"week": 520, "month": 120}
+# 그래프 한 선의 최대 포인트 수 (초과 시 양 끝을 포함해 균등 다운샘플)
+MAX_GRAPH_POINTS = 49
+# 신뢰도는 이 간격으로 구간화하여 캐시 키로 사용
+# (구간 경계에 맞지 않는 신뢰도는 기존 per-point 계산과 크기가 최대 ±0.3cm 달라짐: 소형/중형 ±0.2, 대형 ±0.3)
+CONFIDENCE_STEP = 0.01
+# Monte Carlo 궤적 수 (2000개 × 49포인트 기준 수 ms)
+MC_SAMPLES = int(os.getenv("GROWTH_MC_SAMPLES", "2000"))
+
+
+@lru_cache(maxsize=4096)
+def seed_from_name(plant_name: str) -> float:
+    """식물 이름으로부터 0-1 범위의 결정적 시드를 생성합니다."""
+    digest = hashlib.sha256(plant_name.encode("utf-8")).hexdigest()
+    # 앞 8자리 정수화 후 0-1 스케일
+    value = int(digest[:8], 16) / 0xFFFFFFFF
+    return max(0.0, min(1.0, value))
+
+
+def confidence_bucket(confidence: Optional[float]) -> Optional[float]:
+    """
+    신뢰도를 CONFIDENCE_STEP 단위로 구간화합니다 (종분석 데이터가 없으면 None).
+
+    크기 범위는 구간화된 값으로 계산하므로, 0.873 같은 신뢰도는 0.87일 때의 곡선을 받습니다
+    (크기 차이 최대 ±0.3cm). 구간 경계 값과 None은 기존 계산과 같습니다.
+    """
+    if confidence is None:
+        return None
+    return round(round(confidence / CONFIDENCE_STEP) * CONFIDENCE_STEP, 4)
+
+
+def size_ranges(seeds: np.ndarray, confidences: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시드 배열로 식물별 (초기 크기, 최대 크기) 배열을 계산합니다 (cm, 소수 첫째 자리 반올림).
+
+    Args:
+        seeds: 시드 배열 (0-1)
+        confidences: 신뢰도 배열 (NaN이면 종분석 데이터 없음 → 보정 없음)
+    """
+    seeds = np.asarray(seeds, dtype=np.float64)
+    confidences = np.asarray(confidences, dtype=np.float64)
+    # 식물 유형: 0=소형(5-30cm), 1=중형(10-60cm), 2=대형(20-150cm)
+    plant_type = (seeds * 1000).astype(np.int64) % 3
+    # 신뢰도가 높을수록 더 정확한 범위 예측 (0.8 ~ 1.0)
+    factor = np.where(np.isnan(confidences), 1.0, 0.8 + np.nan_to_num(confidences) * 0.2)
+
+    init_base = np.choose(plant_type, [5.0, 8.0, 15.0])
+    init_span = np.choose(plant_type, [5.0, 7.0, 10.0])
+    max_base = np.choose(plant_type, [20.0, 40.0, 80.0])
+    max_span = np.choose(plant_type, [10.0, 20.0, 70.0])
+
+    initial = np.maximum(3.0, (init_base + seeds * init_span) * factor)
+    maximum = np.maximum(initial * 2, (max_base + seeds * max_span) * factor)
+    return np.round(initial, 1), np.round(maximum, 1)
+
+
+def graph_periods(period_unit: str, max_periods: int) -> np.ndarray:
+    """그래프에 표시할 기간 배열 (주 단위는 약 12개 포인트, 월 단위는 매월, 최대 MAX_GRAPH_POINTS개)"""
+    if period_unit == "week":
+        periods = list(range(0, max_periods + 1, max(1, max_periods // 12)))
+        if periods[-1] != max_periods:
+            periods.append(max_periods)
+        result = np.array(periods, dtype=np.int64)
+    else:
+        result = np.arange(0, max_periods + 1, dtype=np.int64)
+    if len(result) > MAX_GRAPH_POINTS:
+        result = np.unique(np.round(np.linspace(0, max_periods, MAX_GRAPH_POINTS)).astype(np.int64))
+    return result
+
+
+def logistic_sizes(
+    seeds: np.ndarray,
+    initial: np.ndarray,
+    maximum: np.ndarray,
+    periods: np.ndarray,
+    multipliers: np.ndarray,
+    period_unit: str,
+    max_periods: int
+) -> np.ndarray:
+    """
+    로지스틱 성장 곡선을 브로드캐스팅으로 계산합니다.
+
+    seeds/initial/maximum은 식물 축, multipliers는 시나리오 축, periods는 기간 축이며
+    결과 shape는 (시나리오, 식물, 기간)입니다.
+    """
+    seed = np.asarray(seeds, dtype=np.float64)[None, :, None]
+    init = np.asarray(initial, dtype=np.float64)[None, :, None]
+    top = np.asarray(maximum, dtype=np.float64)[None, :, None]
+    mult = np.asarray(multipliers, dtype=np.float64)[:, None, None]
+    t = _normalized_time(np.asarray(periods, dtype=np.float64)[None, None, :], period_unit, max_periods)
+
+    k_base, x0_base = _base_rates(seed, period_unit)
+    # 작은 변동 (자연스러운 성장 곡선, 이름 시드로 고정)
+    return _logistic(k_base * mult, x0_base * mult, init, top, seed * 0.1 - 0.05, t)
+
+
+def _base_rates(seed, period_unit: str):
+    """성장 속도 k와 전환점 x0의 기준값 (성장률 배수 1.0)"""
+    if period_unit == "week":
+        return 0.15 + 0.1 * seed, 8.0 - 4.0 * seed     # 주별 성장률, 전환점 (주)
+    return 0.35 + 0.2 * seed, 3.0 - 1.5 * seed          # 월별 성장률, 전환점 (월)
+
+
+def _normalized_time(periods: np.ndarray, period_unit: str, max_periods: int) -> np.ndarray:
+    """주 단위는 24주 기준으로 정규화, 월 단위는 그대로"""
+    if period_unit == "week":
+        return periods / max_periods * 24
+    return periods
+
+
+def _logistic(k, x0, init, top, variation, t) -> np.ndarray:
+    """로지스틱 성장 지수(0-1)를 크기로 변환하고 변동/범위 제한을 적용합니다 (브로드캐스팅)."""
+    growth_index = 1.0 / (1.0 + np.exp(-k * (t - x0)))
+    sizes = init + (top - init) * growth_index
+    sizes = sizes * (1.0 + variation)
+    # 크기는 초기 크기의 80% 이상, 최대 크기의 110% 이하로 제한
+    sizes = np.clip(sizes, init * 0.8, top * 1.1)
+    return np.round(sizes, 1)
+
+
+@dataclass(frozen=True)
+class GrowthCurves:
+    """한 식물의 성장 곡선 계산 결과 (배열은 읽기 전용)"""
+    plant_name: str
+    period_unit: str
+    max_periods: int              # 상한 적용 후 기간 수
+    requested_periods: int        # 요청한 기간 수
+    periods: np.ndarray           # 그래프 기간 (다운샘플 후)
+    initial_size: float
+    max_size: float
+    curves: Dict[str, np.ndarray] # 시나리오 이름 → 크기 배열
+
+    @property
+    def clamped(self) -> bool:
+        return self.max_periods != self.requested_periods
+
+
+def clamp_periods(period_unit: str, max_periods: int) -> int:
+    """기간 수를 1 ~ 단위별 상한으로 제한합니다."""
+    return max(1, min(int(max_periods), MAX_PERIODS.get(period_unit, MAX_PERIODS["month"])))
+
+
+@lru_cache(maxsize=2048)
+def _project(
+    plant_name: str,
+    period_unit: str,
+    max_periods: int,
+    confidence: Optional[float],
+    scenarios: Tuple[Tuple[str, float], ...]
+) -> GrowthCurves:
+    limited = clamp_periods(period_unit, max_periods)
+    seed = seed_from_name(plant_name)
+    initial, maximum = size_ranges(
+        np.array([seed]), np.array([np.nan if confidence is None else confidence])
+    )
+    periods = graph_periods(period_unit, limited)
+    sizes = logistic_sizes(
+        np.array([seed]), initial, maximum, periods,
+        np.array([m for _, m in scenarios]), period_unit, limited
+    )[:, 0, :]
+    sizes.setflags(write=False)
+    periods.setflags(write=False)
+    return GrowthCurves(
+        plant_name=plant_name,
+        period_unit=period_unit,
+        max_periods=limited,
+        requested_periods=int(max_periods),
+        periods=periods,
+        initial_size=float(initial[0]),
+        max_size=float(maximum[0]),
+        curves={name: sizes[i] for i, (name, _) in enumerate(scenarios)},
+    )
+
+
+def project_growth(
+    plant_name: str,
+    period_unit: str = "month",
+    max_periods: int = 12,
+    confidence: Optional[float] = None,
+    scenarios: Optional[Dict[str, float]] = None
+) -> GrowthCurves:
+    """
+    한 식물의 시나리오별 성장 곡선을 계산합니다 (식물, 단위, 기간 수, 신뢰도 구간 단위로 캐시).
+
+    Args:
+        plant_name: 식물 이름
+        period_unit: 'week' 또는 'month'
+        max_periods: 기간 수 (단위별 상한 MAX_PERIODS로 제한)
+        confidence: 종분석 신뢰도 (None이면 보정 없음)
+        scenarios: 시나리오 이름 → 성장률 배수 (기본 SCENARIOS)
+    """
+    items = tuple((scenarios or SCENARIOS).items())
+    return _project(plant_name, period_unit, int(max_periods), confidence_bucket(confidence), items)
+
+
+def sizes_at(
+    plant_name: str,
+    period: int,
+    period_unit: str = "month",
+    max_periods: int = 12,
+    confidence: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    한 기간의 시나리오별 크기를 계산합니다 (project_growth 곡선과 같은 값, 다운샘플과 무관).
+
+    Raises:
+        ValueError: period가 0 ~ 기간 수(상한 적용 후) 범위를 벗어난 경우
+    """
+    limited = clamp_periods(period_unit, max_periods)
+    if not 0 <= period <= limited:
+        raise ValueError(f"period는 0 ~ {limited} 범위여야 합니다: {period}")
+    seed = seed_from_name(plant_name)
+    bucket = confidence_bucket(confidence)
+    initial, maximum = size_ranges(np.array([seed]), np.array([np.nan if bucket is None else bucket]))
+    sizes = logistic_sizes(
+        np.array([seed]), initial, maximum, np.array([period]),
+        np.array(list(SCENARIOS.values())), period_unit, limited
+    )[:, 0, 0]
+    return {name: float(sizes[i]) for i, name in enumerate(SCENARIOS)}
+
+
+@dataclass(frozen=True)
+class BatchGrowthCurves:
+    """여러 식물의 성장 곡선 (시나리오별 식물 × 기간 2차원 배열)"""
+    plant_names: Tuple[str, ...]
+    period_unit: str
+    max_periods: int
+    periods: np.ndarray
+    initial_sizes: np.ndarray     # (식물,)
+    max_sizes: np.ndarray         # (식물,)
+    curves: Dict[str, np.ndarray] # 시나리오 이름 → (식물, 기간)
+
+
+def project_growth_batch(
+    plant_names: Sequence[str],
+    period_unit: str = "month",
+    max_periods: int = 12,
+    confidences: Optional[Sequence[Optional[float]]] = None,
+    scenarios: Optional[Dict[str, float]] = None
+) -> BatchGrowthCurves:
+    """
+    여러 식물의 성장 곡선을 한 번의 배열 연산으로 계산합니다 (모든 식물이 같은 기간 축을 공유).
+
+    Args:
+        plant_names: 식물 이름 목록
+        period_unit: 'week' 또는 'month'
+        max_periods: 기간 수 (단위별 상한 MAX_PERIODS로 제한)
+        confidences: 식물별 종분석 신뢰도 (None 항목은 보정 없음)
+        scenarios: 시나리오 이름 → 성장률 배수 (기본 SCENARIOS)
+    """
+    names = tuple(plant_names)
+    limited = clamp_periods(period_unit, max_periods)
+    confidences = list(confidences) if confidences is not None else [None] * len(names)
+    items = tuple((scenarios or SCENARIOS).items())
+
+    seeds = np.array([seed_from_name(name) for name in names], dtype=np.float64)
+    buckets = np.array(
+        [np.nan if c is None else confidence_bucket(c) for c in confidences], dtype=np.float64
+    )
+    initial, maximum = size_ranges(seeds, buckets)
+    periods = graph_periods(period_unit, limited)
+    sizes = logistic_sizes(
+        seeds, initial, maximum, periods, np.array([m for _, m in items]), period_unit, limited
+    )
+    return BatchGrowthCurves(
+        plant_names=names,
+        period_unit=period_unit,
+        max_periods=limited,
+        periods=periods,
+        initial_sizes=initial,
+        max_sizes=maximum,
+        curves={name: sizes[i] for i, (name, _) in enumerate(items)},
+    )
+
+
+@dataclass(frozen=True)
+class GrowthBands:
+    """Monte Carlo 성장 구간 (기간별 백분위, 배열은 읽기 전용)"""
+    periods: np.ndarray
+    p10: np.ndarray
+    p50: np.ndarray
+    p90: np.ndarray
+    samples: int
+
+
+@lru_cache(maxsize=2048)
+def _simulate(
+    plant_name: str,
+    period_unit: str,
+    max_periods: int,
+    confidence: Optional[float],
+    samples: int
+) -> GrowthBands:
+    limited = clamp_periods(period_unit, max_periods)
+    seed = seed_from_name(plant_name)
+    initial, maximum = size_ranges(
+        np.array([seed]), np.array([np.nan if confidence is None else confidence])
+    )
+    init, top = float(initial[0]), float(maximum[0])
+    periods = graph_periods(period_unit, limited)
+    t = _normalized_time(periods.astype(np.float64)[None, :], period_unit, limited)
+
+    # 같은 식물은 항상 같은 궤적 (이름 시드 + 신뢰도 구간으로 RNG 고정)
+    rng = np.random.default_rng([int(seed * 0xFFFFFFFF), int(round((confidence or 0.0) * 100))])
+    k_base, x0_base = _base_rates(seed, period_unit)
+    # 관리 상태 배수: 1.0 중심, 좋은(1.3)/나쁜(0.7) 시나리오가 대략 ±1.5σ
+    mult = np.clip(rng.normal(1.0, 0.2, samples), 0.5, 1.6)[:, None]
+    # 종 고유 속도/전환점 불확실성
+    k = k_base * mult * rng.lognormal(0.0, 0.1, samples)[:, None]
+    x0 = x0_base * mult * rng.lognormal(0.0, 0.1, samples)[:, None]
+    # 최대 크기 불확실성: 식별 신뢰도가 낮을수록 넓게 (σ 0.05 ~ 0.20)
+    k_sigma = 0.05 + 0.15 * (1.0 - (confidence if confidence is not None else 0.5))
+    K = np.maximum(init * 1.2, top * rng.lognormal(0.0, k_sigma, samples))[:, None]
+    variation = rng.uniform(-0.05, 0.05, samples)[:, None]
+
+    trajectories = _logistic(k, x0, init, K, variation, t)
+    # np.percentile(보간)보다 빠른 순위 통계: 필요한 순위만 부분 정렬
+    ranks = np.round(np.array([0.1, 0.5, 0.9]) * (samples - 1)).astype(np.intp)
+    by_period = np.ascontiguousarray(trajectories.T)
+    p10, p50, p90 = np.round(np.partition(by_period, ranks, axis=1)[:, ranks].T, 1)
+    for array in (periods, p10, p50, p90):
+        array.setflags(write=False)
+    return GrowthBands(periods=periods, p10=p10, p50=p50, p90=p90, samples=samples)
+
+
+def simulate_bands(
+    plant_name: str,
+    period_unit: str = "month",
+    max_periods: int = 12,
+    confidence: Optional[float] = None,
+    samples: int = MC_SAMPLES
+) -> GrowthBands:
+    """
+    종별 파라미터 분포에서 성장 궤적을 samples개 샘플링하여 기간별 p10/p50/p90을 계산합니다.
+    기간 축은 project_growth와 같고, 결과는 (식물, 단위, 기간 수, 신뢰도 구간) 단위로 캐시됩니다.
+
+    Args:
+        plant_name: 식물 이름
+        period_unit: 'week' 또는 'month'
+        max_periods: 기간 수 (단위별 상한 MAX_PERIODS로 제한)
+        confidence: 종분석 신뢰도 (낮을수록 최대 크기 분산이 커짐, None이면 0.5로 간주)
+        samples: 궤적 수
+    """
+    return _simulate(plant_name, period_unit, int(max_periods), confidence_bucket(confidence), int(samples))
+
+
+def cache_info() -> Dict[str, int]:
+    """곡선/Monte Carlo/시드 캐시 적중 통계"""
+    curves = _project.cache_info()
+    bands = _simulate.cache_info()
+    seeds = seed_from_name.cache_info()
+    return {
+        "curve_hits": curves.hits, "curve_misses": curves.misses, "curve_entries": curves.currsize,
+        "band_hits": bands.hits, "band_misses": bands.misses, "band_entries": bands.currsize,
+        "seed_hits": seeds.hits, "seed_misses": seeds.misses,
+    }
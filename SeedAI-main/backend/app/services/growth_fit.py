@@ -0,0 +1,223 @@
+"""
+식물별 성장 곡선 온라인 적합 (로지스틱)
+- 최대 크기 K를 종 사전값(growth_engine.size_ranges)으로 고정하면
+  로지스틱 h(t) = K / (1 + exp(-(a + b·t))) 는 logit(h/K) = a + b·t 로 선형화됨
+- 기록(날짜, 높이)마다 충분통계량(n, Σt, Σy, Σt², Σty, Σy²)만 O(1)로 갱신하고
+  예측 시 최소제곱 해 (a, b)를 바로 계산 (기록 전체 재적합 없음)
+- 같은 날짜 기록을 수정하면 이전 높이의 기여분을 빼고 새 높이를 더함
+- 기록이 부족하거나 성장률이 0 이하로 적합되면 종 사전 성장률로 마지막 기록에서 이어서 예측
+- 관측 높이가 K에 가까워지면 K를 늘리고 그때만 기록 전체로 다시 계산 (드묾)
+  최대 기록을 낮게 수정하면 종 사전값 K로 되돌리기 위해 다시 계산
+- 상태는 sqlite 캐시 DB에 식물별로 저장 (기록마다 해당 식물 1건만 쓰고, pre-fork 워커가 같은 상태를 공유)
+  항목이 없거나 LRU로 제거되면 다음 조회 때 성장 기록 전체로 다시 계산
+"""
+import math
+import threading
+from datetime import date as date_type, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services import growth_engine
+from app.services.cache_store import PersistentCache
+from app.services.db_utils import load_growth_history
+
+# 적합에 필요한 최소 기록 수 (미만이면 종 사전값 사용)
+MIN_FIT_POINTS = 3
+# 관측 높이가 K의 이 비율을 넘으면 K를 늘려 다시 계산
+K_HEADROOM = 0.95
+# K를 늘릴 때 최대 관측 높이 대비 배수
+K_EXPAND = 1.25
+# 월 단위 성장률 → 일 단위
+DAYS_PER_MONTH = 30.44
+# 저장할 식물 수 상한 (초과분은 다음 조회 때 기록으로 다시 계산)
+MAX_FIT_ENTRIES = 100000
+
+_STAT_KEYS = ("n", "st", "sy", "stt", "sty", "syy")
+
+_lock = threading.Lock()
+_fits: Optional[PersistentCache] = None
+
+
+def _parse_day(value: str) -> Optional[int]:
+    """기록 날짜 문자열을 일 단위 서수로 변환합니다 (해석 불가면 None)."""
+    try:
+        return datetime.fromisoformat(str(value).strip()[:10]).date().toordinal()
+    except ValueError:
+        return None
+
+
+def species_prior(plant_name: str) -> Dict[str, float]:
+    """종 사전값: 최대 크기 K (cm)와 일 단위 성장률 r (성장률 배수 1.0 기준)"""
+    seed = growth_engine.seed_from_name(plant_name)
+    _, maximum = growth_engine.size_ranges(np.array([seed]), np.array([np.nan]))
+    k_month, _ = growth_engine._base_rates(seed, "month")
+    return {"K": float(maximum[0]), "r": float(k_month) / DAYS_PER_MONTH}
+
+
+def _logit(height: float, K: float) -> float:
+    ratio = min(max(height / K, 1e-3), 1 - 1e-3)
+    return math.log(ratio / (1 - ratio))
+
+
+def _empty_state(plant_name: str, K: float, prior_K: float, origin: Optional[int]) -> Dict[str, Any]:
+    state = {key: 0.0 for key in _STAT_KEYS}
+    state.update({"plant_name": plant_name, "K": K, "prior_K": prior_K, "origin": origin, "skipped": 0, "last_day": None, "last_height": None, "max_height": 0.0})
+    return state
+
+
+def _accumulate(state: Dict[str, Any], day: int, height: float, sign: float) -> None:
+    """(day, height) 한 점의 기여분을 충분통계량에 더하거나(sign=1) 뺍니다(sign=-1)."""
+    t = float(day - state["origin"])
+    y = _logit(height, state["K"])
+    state["n"] += sign
+    state["st"] += sign * t
+    state["sy"] += sign * y
+    state["stt"] += sign * t * t
+    state["sty"] += sign * t * y
+    state["syy"] += sign * y * y
+
+
+def _get_fits() -> PersistentCache:
+    """적합 상태 저장소 (fork 이후 첫 사용 시 연결)"""
+    global _fits
+    if _fits is None:
+        _fits = PersistentCache("growth_fit", max_entries=MAX_FIT_ENTRIES, ttl=None)
+    return _fits
+
+
+def _load_state(plant_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        entry = _get_fits().get(plant_id)
+    except Exception as e:
+        print(f"[growth_fit] 적합 상태 로드 실패: {e}")
+        return None
+    return entry.value if entry is not None else None
+
+
+def _persist(plant_id: str, state: Dict[str, Any]) -> None:
+    try:
+        _get_fits().set(plant_id, state)
+    except Exception as e:
+        print(f"[growth_fit] 적합 상태 저장 실패: {e}")
+
+
+def _rebuild(plant_id: str, plant_name: str, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """기록 전체로 상태를 다시 계산합니다 (최초 적합, K 확장, 기록 불일치 시에만)."""
+    points = [(_parse_day(r.get("date")), float(r.get("height", 0.0))) for r in history]
+    valid = [(day, height) for day, height in points if day is not None]
+    max_height = max((height for _, height in valid), default=0.0)
+    prior_K = K = species_prior(plant_name)["K"]
+    if max_height >= K * K_HEADROOM:
+        K = round(max_height * K_EXPAND, 1)
+
+    state = _empty_state(plant_name, K, prior_K, valid[0][0] if valid else None)
+    state["skipped"] = len(points) - len(valid)
+    for day, height in valid:
+        _accumulate(state, day, height, 1.0)
+    state["max_height"] = max_height
+    if valid:
+        last_day, last_height = max(valid, key=lambda p: p[0])
+        state["last_day"], state["last_height"] = last_day, last_height
+    return state
+
+
+def observe(plant_id: str, date: str, height: float, previous_height: Optional[float] = None, plant_name: Optional[str] = None) -> None:
+    """
+    성장 기록 한 건을 적합 상태에 반영합니다 (save_growth_log 직후 호출).
+
+    Args:
+        plant_id: 식물 ID
+        date: 기록 날짜
+        height: 높이 (cm)
+        previous_height: 같은 날짜의 기존 높이 (save_growth_log 반환값, 새 기록이면 None)
+        plant_name: 종 사전값에 사용할 식물 이름 (생략 시 plant_id)
+    """
+    day = _parse_day(date)
+    with _lock:
+        state = _load_state(plant_id)
+        if (
+            state is None
+            or height >= state["K"] * K_HEADROOM
+            or (previous_height is not None and state["K"] != state["prior_K"] and previous_height >= state["max_height"])
+        ):
+            # 최초 기록, K 확장, 확장된 K의 근거였던 최대 기록 수정 → 기록 전체로 계산 (이번 기록은 이미 저장됨)
+            state = _rebuild(plant_id, plant_name or (state or {}).get("plant_name") or plant_id, load_growth_history(plant_id))
+        elif day is None:
+            if previous_height is None:
+                state["skipped"] += 1
+        else:
+            if state["origin"] is None:
+                state["origin"] = day
+            if previous_height is not None:
+                _accumulate(state, day, previous_height, -1.0)
+            _accumulate(state, day, height, 1.0)
+            state["max_height"] = max(state["max_height"], height)
+            if state["last_day"] is None or day >= state["last_day"]:
+                state["last_day"], state["last_height"] = day, height
+        _persist(plant_id, state)
+
+
+def _solve(state: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """충분통계량으로 logit(h/K) = a + b·t 최소제곱 해를 구합니다 (적합 불가면 None)."""
+    n = state["n"]
+    if n < MIN_FIT_POINTS:
+        return None
+    var_t = n * state["stt"] - state["st"] ** 2
+    if var_t <= 1e-9:
+        return None
+    b = (n * state["sty"] - state["st"] * state["sy"]) / var_t
+    a = (state["sy"] - b * state["st"]) / n
+    if b <= 0:
+        return None
+    sse = max(0.0, state["syy"] - a * state["sy"] - b * state["sty"])
+    return {"a": a, "b": b, "rmse_logit": math.sqrt(sse / n)}
+
+
+def get_model(plant_id: str, history: List[Dict[str, Any]], plant_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    식물의 현재 성장 모델을 반환합니다.
+    저장된 상태가 없거나 기록 수와 맞지 않으면(기능 도입 이전 기록 등) 기록 전체로 한 번 계산합니다.
+
+    Returns:
+        {"source": "fit"|"prior", "K", "r" (일 단위), "a", "origin", "n", ...}
+    """
+    with _lock:
+        state = _load_state(plant_id)
+        if state is None or int(state["n"]) + state["skipped"] != len(history):
+            name = plant_name or (state or {}).get("plant_name") or plant_id
+            state = _rebuild(plant_id, name, history)
+            _persist(plant_id, state)
+
+    K = state["K"]
+    fit = _solve(state)
+    if fit is not None:
+        return {"source": "fit", "K": K, "r": fit["b"], "a": fit["a"], "origin": state["origin"], "n": int(state["n"]), "rmse_logit": round(fit["rmse_logit"], 4), "last_day": state["last_day"]}
+
+    # 종 사전 성장률로 마지막 기록을 지나는 곡선
+    r = species_prior(state["plant_name"])["r"]
+    a = None
+    if state["last_day"] is not None:
+        a = _logit(state["last_height"], K) - r * (state["last_day"] - state["origin"])
+    return {"source": "prior", "K": K, "r": r, "a": a, "origin": state["origin"], "n": int(state["n"]), "last_day": state["last_day"], "last_height": state["last_height"]}
+
+
+def predict(model: Dict[str, Any], days_ahead: int = 7) -> List[float]:
+    """마지막 기록일 다음 날부터 days_ahead일 동안의 예측 높이 (cm)"""
+    if model.get("a") is None:
+        return []
+    t_last = model["last_day"] - model["origin"]
+    t = np.arange(t_last + 1, t_last + days_ahead + 1, dtype=np.float64)
+    heights = model["K"] / (1.0 + np.exp(-(model["a"] + model["r"] * t)))
+    return np.round(heights, 2).tolist()
+
+
+def inflection_date(model: Dict[str, Any]) -> Optional[str]:
+    """성장 속도가 가장 빠른 날짜 (h = K/2, a + r·t = 0)"""
+    if model.get("a") is None or model["r"] <= 0:
+        return None
+    day = model["origin"] + int(round(-model["a"] / model["r"]))
+    try:
+        return date_type.fromordinal(day).isoformat()
+    except (ValueError, OverflowError):
+        return None
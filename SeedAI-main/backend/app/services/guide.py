@@ -1,16 +1,19 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
-import torch
 import json
 import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from openai import OpenAI
 from app.config import settings
 from app.models.schemas import CareGuide
+from app.services import llm_gateway
+from app.services.cache_store import PersistentCache
+from app.services.llm_router import get_router
+from app.services.singleflight import SingleFlight, request_key
 
 # 전역 변수로 모델 캐싱
 _text_model = None
 _tokenizer = None
-_openai_client = None
 
 
 def load_text_generator():
@@ -26,52 +29,45 @@ def load_text_generator():
 
 
 def load_openai_client():
-    """OpenAI 클라이언트를 로드합니다."""
-    global _openai_client
-
-    if _openai_client is None:
-        if settings.openai_api_key:
-            try:
-                # httpx 클라이언트를 직접 생성하여 proxies 문제 해결
-                import httpx
-                import os
-
-                # 환경 변수에서 proxies 완전히 제거
-                proxy_env_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-                saved_proxies = {}
-                for var in proxy_env_vars:
-                    if var in os.environ:
-                        saved_proxies[var] = os.environ.pop(var)
-
-                try:
-                    # httpx 클라이언트를 proxies 관련 설정 없이 생성
-                    http_client = httpx.Client(timeout=60.0)
-
-                    _openai_client = OpenAI(
-                        api_key=settings.openai_api_key,
-                        http_client=http_client
-                    )
-                    print("[OpenAI 클라이언트 로딩 완료]")
-                finally:
-                    # 환경 변수 복원
-                    for var, value in saved_proxies.items():
-                        os.environ[var] = value
-
-                return _openai_client
-            except Exception as e:
-                print(f"[OpenAI 클라이언트 로딩 실패] {e}")
-                import traceback
-                traceback.print_exc()
-                _openai_client = None
-        else:
-            print("[경고] OpenAI API 키가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
-
-    return _openai_client
+    """OpenAI 클라이언트를 로드합니다 (LLM 게이트웨이의 공유 클라이언트)."""
+    client = llm_gateway.get_openai_client()
+    if client is None:
+        print("[경고] OpenAI API 키가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
+    return client
+
+
+# 관리 가이드 출력 스키마 (CareGuide 필드). 로컬 llama.cpp는 이 스키마의 GBNF 문법으로만 토큰을 생성
+CARE_GUIDE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "watering": {"type": "string"},
+        "sunlight": {"type": "string"},
+        "temperature": {"type": "string"},
+        "humidity": {"type": "string"},
+        "fertilizer": {"type": "string"},
+        "soil": {"type": "string"},
+        "tips": {"type": "array", "items": {"type": "string"}, "minItems": 3, "maxItems": 5},
+    },
+    "required": ["watering", "sunlight", "temperature", "humidity", "fertilizer", "soil", "tips"],
+}
+
+
+def _parse_care_json(content: str) -> dict:
+    """LLM 응답에서 관리 가이드 JSON을 추출합니다 (code block 제거)."""
+    json_match = re.search(r'\{[\s\S]*\}', content)
+    if json_match:
+        json_str = json_match.group(0)
+    else:
+        json_str = content
+    return json.loads(json_str)
 
 
 def generate_care_guide_with_gpt(plant_name: str) -> Optional[dict]:
     """
-    GPT-4o-mini를 사용하여 직접 식물 관리 가이드를 생성합니다.
+    LLM으로 직접 식물 관리 가이드를 생성합니다.
+    llm_router가 로컬 llama.cpp(우선)와 GPT-4o-mini 중 지연/오류율 기준으로 선택합니다.
+    로컬 모델은 CARE_GUIDE_SCHEMA 문법으로 생성하므로 네트워크 없이 첫 시도에 파싱되며,
+    그래도 JSON 파싱에 실패한 응답은 해당 프로바이더의 파싱 실패로 기록되고 다음 프로바이더로 넘어갑니다.
 
     Args:
         plant_name: 식물 종명
@@ -80,12 +76,7 @@ def generate_care_guide_with_gpt(plant_name: str) -> Optional[dict]:
         dict: 한국 기준 관리 가이드 (JSON 형식)
     """
     try:
-        client = load_openai_client()
-        if client is None:
-            print(f"[GPT 직접 생성 실패] OpenAI 클라이언트가 없습니다.")
-            return None
-
-        print(f"[GPT API 호출 시작] 식물명: {plant_name}")
+        print(f"[LLM 호출 시작] 식물명: {plant_name}")
 
         prompt = f"""식물명: {plant_name}
 
@@ -97,6 +88,7 @@ def generate_care_guide_with_gpt(plant_name: str) -> Optional[dict]:
 - 햇빛: 원산지 환경을 고려한 광량 요구사항 (열대, 사막, 숲속 등)
 - 온도: 이 식물이 견딜 수 있는 온도 범위 (원산지 기후 반영)
 - 습도: 이 식물이 선호하는 습도 수준
+- 비료: 이 식물의 성장기/휴면기에 맞는 비료 주기와 종류
 - 토양: 이 식물에 최적화된 토양 배합 (배수성, 보수성 등)
 - 케어 팁: 이 식물을 키울 때만 해당되는 특별한 주의사항 (병충해, 번식 방법, 독성 여부 등)
 
@@ -109,44 +101,139 @@ def generate_care_guide_with_gpt(plant_name: str) -> Optional[dict]:
   "sunlight": "햇빛 정보",
   "temperature": "온도 정보",
   "humidity": "습도 정보",
+  "fertilizer": "비료 정보",
   "soil": "토양 정보",
   "tips": ["팁1", "팁2", "팁3", "팁4", "팁5"]
 }}"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        result = get_router().complete(
+            "care_guide",
             messages=[
                 {"role": "system", "content": "You are a plant care expert specializing in Korean indoor plant cultivation. You have extensive knowledge about various plants from around the world. Always respond with valid JSON only, no additional text."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            validate=_parse_care_json,
+            json_schema=CARE_GUIDE_SCHEMA
         )
 
-        content = response.choices[0].message.content.strip()
-        print(f"[GPT API 응답] {plant_name}: {content[:200]}...")
-
-        # JSON 추출 (code block 제거)
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
-            json_str = json_match.group(0)
-        else:
-            json_str = content
-
-        care_data = json.loads(json_str)
-        print(f"[GPT 파싱 성공] {plant_name}")
+        print(f"[LLM 응답] {plant_name} ({result.provider}): {result.text[:200]}...")
+        care_data = _parse_care_json(result.text)
+        print(f"[LLM 파싱 성공] {plant_name}")
         return care_data
 
     except Exception as e:
-        print(f"[GPT 직접 생성 오류] {plant_name}: {e}")
+        print(f"[LLM 직접 생성 오류] {plant_name}: {e}")
         import traceback
         traceback.print_exc()
         return None
 
 
+# --- 관리 가이드 캐시 ---
+# 같은 종이면 같은 가이드이므로 정규화한 식물명 + 프롬프트 버전으로 영속 캐시
+# 프롬프트/스키마를 바꾸면 버전을 올려 이전 캐시를 무효화
+CARE_GUIDE_PROMPT_VERSION = "care-v2"
+
+_care_guide_cache = None
+_care_guide_cache_lock = threading.Lock()
+_care_guide_flight = SingleFlight()
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="care-guide-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_care_guide_cache() -> PersistentCache:
+    """관리 가이드 영속 캐시 (sqlite, TTL + LRU)"""
+    global _care_guide_cache
+    with _care_guide_cache_lock:
+        if _care_guide_cache is None:
+            _care_guide_cache = PersistentCache(
+                "care_guide",
+                max_entries=settings.care_guide_cache_max_entries,
+                ttl=settings.care_guide_cache_ttl,
+            )
+        return _care_guide_cache
+
+
+def normalize_plant_name(plant_name: str) -> str:
+    """캐시 키용 식물명 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 1개, 대소문자 무시)"""
+    name = unicodedata.normalize("NFC", plant_name)
+    return " ".join(name.split()).casefold()
+
+
+def care_guide_cache_key(plant_name: str) -> str:
+    """정규화한 식물명 + 프롬프트 버전의 해시"""
+    return request_key(version=CARE_GUIDE_PROMPT_VERSION, plant_name=normalize_plant_name(plant_name))
+
+
+def _to_care_guide(data: dict) -> CareGuide:
+    """LLM JSON(dict)을 CareGuide로 변환합니다 (누락 필드는 빈 값)."""
+    return CareGuide(
+        watering=data.get("watering", ""),
+        sunlight=data.get("sunlight", ""),
+        temperature=data.get("temperature", ""),
+        humidity=data.get("humidity", ""),
+        fertilizer=data.get("fertilizer", ""),
+        soil=data.get("soil", ""),
+        tips=data.get("tips", [])
+    )
+
+
+def _generate_and_store(key: str, plant_name: str, force: bool = False) -> Optional[CareGuide]:
+    """
+    같은 키의 동시 요청은 하나만 LLM을 호출하고 나머지는 그 결과를 기다립니다.
+    LLM 결과만 캐시에 저장합니다 (기본 가이드 폴백은 저장하지 않음).
+
+    Args:
+        force: True면 캐시를 다시 확인하지 않고 생성 (stale 항목 갱신용)
+    """
+    def generate() -> Optional[CareGuide]:
+        if not force:
+            # 대기하던 사이 다른 요청이 채웠을 수 있으므로 다시 확인
+            entry = get_care_guide_cache().get(key)
+            if entry is not None:
+                return CareGuide(**entry.value)
+        korean_guide = generate_care_guide_with_gpt(plant_name)
+        if not korean_guide:
+            return None
+        try:
+            care_guide = _to_care_guide(korean_guide)
+        except Exception as e:
+            print(f"[GPT 직접 생성 CareGuide 변환 오류] {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+        get_care_guide_cache().set(key, care_guide.model_dump())
+        return care_guide
+
+    return _care_guide_flight.do(key, generate)
+
+
+def _schedule_refresh(key: str, plant_name: str) -> None:
+    """기한이 지난 항목을 백그라운드에서 재생성합니다 (키당 1건)."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _generate_and_store(key, plant_name, force=True)
+        except Exception as e:
+            print(f"[guide] 관리 가이드 백그라운드 갱신 실패: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(refresh)
+
+
 def generate_care_guide(plant_name: str) -> CareGuide:
     """
-    GPT-4o-mini를 사용하여 식물 관리 가이드를 생성합니다.
+    LLM(라우터)으로 식물 관리 가이드를 생성합니다.
+    결과는 식물명 기준으로 영속 캐시하며, 기한이 지난 항목은 즉시 반환하고 백그라운드에서 갱신합니다.
+    캐시에 없는 식물은 동시 요청이 몰려도 한 번만 생성합니다.
 
     Args:
         plant_name: 식물 종명
@@ -156,27 +243,22 @@ def generate_care_guide(plant_name: str) -> CareGuide:
     """
     print(f"[가이드 생성 시작] 식물명: {plant_name}")
 
-    # GPT-4o-mini로 직접 생성
-    korean_guide = generate_care_guide_with_gpt(plant_name)
-
-    if korean_guide:
-        print(f"[GPT 직접 생성 성공] {plant_name}: {korean_guide}")
-        try:
-            care_guide = CareGuide(
-                watering=korean_guide.get("watering", ""),
-                sunlight=korean_guide.get("sunlight", ""),
-                temperature=korean_guide.get("temperature", ""),
-                humidity=korean_guide.get("humidity", ""),
-                fertilizer=korean_guide.get("fertilizer", ""),
-                soil=korean_guide.get("soil", ""),
-                tips=korean_guide.get("tips", [])
-            )
-            print(f"[AI 가이드 생성 성공 (GPT 직접)] {plant_name}")
-            return care_guide
-        except Exception as e:
-            print(f"[GPT 직접 생성 CareGuide 변환 오류] {e}")
-            import traceback
-            traceback.print_exc()
+    key = care_guide_cache_key(plant_name)
+    try:
+        entry = get_care_guide_cache().get(key)
+    except Exception as e:
+        print(f"[guide] 관리 가이드 캐시 조회 실패: {e}")
+        entry = None
+    if entry is not None:
+        if entry.stale:
+            _schedule_refresh(key, plant_name)
+        print(f"[가이드 캐시 적중] {plant_name} (stale={entry.stale})")
+        return CareGuide(**entry.value)
+
+    care_guide = _generate_and_store(key, plant_name)
+    if care_guide is not None:
+        print(f"[AI 가이드 생성 성공] {plant_name}")
+        return care_guide
 
     # 최종 fallback: 기본 가이드 반환
     print(f"[경고] AI 생성 실패, 기본 가이드 사용: {plant_name}")
@@ -0,0 +1,467 @@
+"""
+성장 단계 이미지 생성 작업 큐 (Stable Diffusion)
+- CPU에서 SD-turbo 한 장이 HTTP 타임아웃보다 오래 걸리므로 요청 안에서 생성하지 않고
+  작업을 큐에 넣은 뒤 상태 조회/다운로드 API로 결과를 받음
+- 결과는 프롬프트/모델/생성 옵션의 SHA-256을 키로 디스크에 저장 (content-addressed)
+  → 같은 종/단계 이미지는 한 번만 생성되고, 같은 키의 진행 중 작업은 합쳐짐
+- 워커 스레드 IMAGE_JOB_WORKERS개, 큐 길이 IMAGE_JOB_QUEUE_SIZE 초과 시 거절
+- diffusers 파이프라인은 호출 중 스케줄러 상태를 바꾸므로 동시 생성 수만큼 복제본이 필요하고,
+  복제본 수는 메모리 예산(IMAGE_MEMORY_BUDGET_MB)으로 제한
+- IMAGE_PIPELINE_IDLE_UNLOAD초 동안 작업이 없으면 파이프라인을 내려 메모리 반환
+- 파이프라인 로드 실패는 IMAGE_LOAD_RETRY_SECONDS 동안 기억하고, 그동안 새 작업은 로드를 시도하지 않고 바로 failed
+- 캐시 디렉터리의 이미지는 IMAGE_CACHE_MAX_MB를 넘으면 가장 오래 조회되지 않은 것부터 삭제 (LRU, mtime 기준)
+- GrowthStage.image_url은 image_url_for()가 돌려주는 참조 URL로 채우고,
+  처음 조회될 때 생성 작업이 시작됨 (app/api/images.py)
+"""
+import gc
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+# false면 GrowthStage.image_url을 채우지 않음 (이미지 API는 그대로 동작)
+IMAGE_JOBS_ENABLED = os.getenv("IMAGE_JOBS_ENABLED", "true").lower() in ("1", "true", "yes")
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", os.path.join(settings.cache_dir, "images")))
+IMAGE_JOB_WORKERS = int(os.getenv("IMAGE_JOB_WORKERS", "1"))
+IMAGE_JOB_QUEUE_SIZE = int(os.getenv("IMAGE_JOB_QUEUE_SIZE", "64"))
+# 파이프라인 전체 메모리 예산 (MB). 첫 복제본은 예산과 무관하게 항상 허용
+IMAGE_MEMORY_BUDGET_MB = int(os.getenv("IMAGE_MEMORY_BUDGET_MB", "8192"))
+# 복제본 1개 메모리 추정치 (MB): 가중치 (sd-turbo fp32 기준, 첫 로드 후 실측값으로 갱신) + 생성 중 활성값
+IMAGE_MODEL_MEMORY_MB = int(os.getenv("IMAGE_MODEL_MEMORY_MB", "5200"))
+IMAGE_RENDER_MEMORY_MB = int(os.getenv("IMAGE_RENDER_MEMORY_MB", "1024"))
+IMAGE_PIPELINE_IDLE_UNLOAD = float(os.getenv("IMAGE_PIPELINE_IDLE_UNLOAD", "600"))
+# 파이프라인 로드 실패 후 다시 시도하기까지 기다리는 시간 (초)
+IMAGE_LOAD_RETRY_SECONDS = float(os.getenv("IMAGE_LOAD_RETRY_SECONDS", "600"))
+# 캐시 이미지 전체 크기 상한 (MB, 0이면 제한 없음)
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "2048"))
+# 완료/실패 작업 기록 보관 시간 (초)
+IMAGE_JOB_TTL = float(os.getenv("IMAGE_JOB_TTL", "3600"))
+# 생성 옵션 (캐시 키에 포함)
+IMAGE_STEPS = int(os.getenv("IMAGE_STEPS", "4"))
+IMAGE_GUIDANCE = float(os.getenv("IMAGE_GUIDANCE", "0.0"))
+
+IMAGE_URL_PREFIX = "/api/images"
+
+
+class ImageQueueFull(RuntimeError):
+    """대기 중인 작업이 IMAGE_JOB_QUEUE_SIZE를 넘음"""
+
+
+@dataclass
+class ImageJob:
+    """이미지 생성 작업 한 건"""
+    id: str
+    key: str
+    prompt: str
+    status: str = "queued"        # queued | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cached: bool = False          # 제출 시점에 이미 캐시되어 있었는지
+
+    @property
+    def image_url(self) -> Optional[str]:
+        return image_url(self.key) if self.status == "done" else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "image_url": self.image_url,
+            "cached": self.cached,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+def image_key(prompt: str) -> str:
+    """프롬프트/모델/생성 옵션으로 content-addressed 키를 만듭니다."""
+    payload = json.dumps(
+        {"model": settings.image_generation_model, "prompt": prompt, "steps": IMAGE_STEPS, "guidance": IMAGE_GUIDANCE},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def image_path(key: str) -> Path:
+    return IMAGE_CACHE_DIR / key[:2] / f"{key}.png"
+
+
+def _meta_path(key: str) -> Path:
+    return IMAGE_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def image_url(key: str) -> str:
+    return f"{IMAGE_URL_PREFIX}/{key}.png"
+
+
+def is_cached(key: str) -> bool:
+    return image_path(key).exists()
+
+
+def touch(key: str) -> None:
+    """이미지를 사용한 것으로 표시합니다 (LRU 삭제 순서용 mtime 갱신)."""
+    try:
+        os.utime(image_path(key))
+    except OSError:
+        pass
+
+
+def evict_images(max_mb: float = IMAGE_CACHE_MAX_MB) -> int:
+    """
+    캐시 이미지 합계가 max_mb를 넘으면 mtime이 가장 오래된 이미지부터 삭제합니다. 반환: 삭제한 개수
+    메타데이터(.json)는 남기므로 삭제된 이미지의 URL은 다시 조회될 때 재생성됩니다.
+    """
+    if max_mb <= 0 or not IMAGE_CACHE_DIR.exists():
+        return 0
+    files = []
+    for path in IMAGE_CACHE_DIR.glob("*/*.png"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    limit = max_mb * 1024 * 1024
+    evicted = 0
+    for _, size, path in sorted(files, key=lambda f: f[0]):
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        evicted += 1
+    if evicted:
+        print(f"[image_jobs] 캐시 상한 초과: 오래된 이미지 {evicted}개 삭제 (남은 크기 {total / (1024 * 1024):.0f}MB)")
+    return evicted
+
+
+def image_url_for(prompt: str) -> str:
+    """
+    프롬프트의 참조 URL을 반환합니다 (생성은 URL이 처음 조회될 때 시작).
+    키만으로 프롬프트를 찾을 수 있도록 메타데이터를 캐시 디렉터리에 한 번 기록합니다.
+    """
+    key = image_key(prompt)
+    meta = _meta_path(key)
+    if not meta.exists():
+        try:
+            meta.parent.mkdir(parents=True, exist_ok=True)
+            tmp = meta.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp.write_text(json.dumps({"prompt": prompt, "model": settings.image_generation_model}, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, meta)
+        except Exception as e:
+            print(f"[image_jobs] 메타데이터 기록 실패: {e}")
+    return image_url(key)
+
+
+def prompt_for_key(key: str) -> Optional[str]:
+    """image_url_for로 등록된 키의 프롬프트 (없으면 None)"""
+    try:
+        return json.loads(_meta_path(key).read_text(encoding="utf-8")).get("prompt")
+    except (OSError, ValueError):
+        return None
+
+
+def estimate_replicas(model_mb: float = IMAGE_MODEL_MEMORY_MB, workers: int = IMAGE_JOB_WORKERS) -> int:
+    """메모리 예산 안에서 동시에 둘 수 있는 파이프라인 복제본 수 (최소 1, 워커 수 이하)"""
+    per_replica = model_mb + IMAGE_RENDER_MEMORY_MB
+    return max(1, min(workers, int(IMAGE_MEMORY_BUDGET_MB // per_replica)))
+
+
+def _pipeline_memory_mb(pipeline: Any) -> Optional[float]:
+    """파이프라인 구성 요소의 파라미터 메모리 (MB, 계산 불가면 None)"""
+    try:
+        total = 0
+        for component in getattr(pipeline, "components", {}).values():
+            parameters = getattr(component, "parameters", None)
+            if callable(parameters):
+                total += sum(p.numel() * p.element_size() for p in parameters())
+        return total / (1024 * 1024) if total else None
+    except Exception:
+        return None
+
+
+class PipelinePool:
+    """메모리 예산 안에서 필요할 때 늘리는 diffusers 파이프라인 복제본 풀"""
+
+    def __init__(self, workers: int = IMAGE_JOB_WORKERS):
+        self.workers = workers
+        self.model_mb = float(IMAGE_MODEL_MEMORY_MB)
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._loaded = 0
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "unloads": 0, "waits": 0, "load_failures": 0}
+        self._load_error: Optional[str] = None
+        self._load_failed_at: Optional[float] = None
+
+    @property
+    def max_replicas(self) -> int:
+        return estimate_replicas(self.model_mb, self.workers)
+
+    def unavailable(self) -> Optional[str]:
+        """최근 로드 실패 사유 (IMAGE_LOAD_RETRY_SECONDS 동안 유지, 그동안은 로드를 다시 시도하지 않음)"""
+        with self._lock:
+            if self._load_failed_at is not None and time.monotonic() - self._load_failed_at < IMAGE_LOAD_RETRY_SECONDS:
+                return self._load_error
+            return None
+
+    def acquire(self) -> Any:
+        """
+        유휴 복제본을 대여합니다 (예산이 남으면 새로 로드, 아니면 반납될 때까지 대기).
+
+        Raises:
+            RuntimeError: 파이프라인 로드 실패 (최근 실패가 기록되어 있으면 로드하지 않고 바로)
+        """
+        try:
+            pipeline = self._idle.get_nowait()
+        except queue.Empty:
+            reason = self.unavailable()
+            if reason is not None and not self._loaded:
+                raise RuntimeError(reason)
+            with self._lock:
+                load = self._loaded < self.max_replicas
+                if load:
+                    self._loaded += 1
+                else:
+                    self._stats["waits"] += 1
+            if load:
+                try:
+                    pipeline = self._load()
+                except Exception as e:
+                    with self._lock:
+                        self._loaded -= 1
+                        self._stats["load_failures"] += 1
+                        self._load_error = f"이미지 생성 모델을 로드할 수 없습니다: {e}"
+                        self._load_failed_at = time.monotonic()
+                    raise
+            else:
+                pipeline = self._idle.get()
+        with self._lock:
+            self._in_use += 1
+        return pipeline
+
+    def release(self, pipeline: Any) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(pipeline)
+
+    def _load(self) -> Any:
+        from app.services.growth import create_image_pipeline
+        start = time.perf_counter()
+        pipeline = create_image_pipeline()
+        if pipeline is None:
+            raise RuntimeError(settings.image_generation_model)
+        measured = _pipeline_memory_mb(pipeline)
+        with self._lock:
+            self._stats["loads"] += 1
+            self._load_error = self._load_failed_at = None
+            if measured:
+                self.model_mb = measured
+        print(f"[image_jobs] 파이프라인 로드 ({self._loaded}/{self.max_replicas}), {time.perf_counter() - start:.1f}초, 가중치 {self.model_mb:.0f}MB")
+        return pipeline
+
+    def unload_idle(self) -> int:
+        """사용 중인 복제본이 없으면 모두 내려 메모리를 반환합니다."""
+        with self._lock:
+            if self._in_use or not self._loaded:
+                return 0
+            dropped = 0
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                dropped += 1
+            self._loaded -= dropped
+            self._stats["unloads"] += dropped
+        if dropped:
+            gc.collect()
+            print(f"[image_jobs] 유휴 파이프라인 {dropped}개 해제")
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "in_use": self._in_use,
+                "max_replicas": self.max_replicas,
+                "model_mb": round(self.model_mb),
+                "budget_mb": IMAGE_MEMORY_BUDGET_MB,
+                "unavailable": self._load_error if self._load_failed_at is not None else None,
+                **self._stats,
+            }
+
+
+class ImageJobQueue:
+    """작업 제출/조회와 워커 스레드 관리"""
+
+    def __init__(self, workers: int = IMAGE_JOB_WORKERS, queue_size: int = IMAGE_JOB_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.pool = PipelinePool(self.workers)
+        self._queue: "queue.Queue[ImageJob]" = queue.Queue(maxsize=queue_size)
+        self._jobs: Dict[str, ImageJob] = {}
+        self._active: Dict[str, ImageJob] = {}   # key → 대기/실행 중 작업 (중복 제출 병합)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stats = {"submitted": 0, "cache_hits": 0, "coalesced": 0, "rejected": 0, "rendered": 0, "failed": 0, "evicted": 0}
+
+    def submit(self, prompt: str) -> ImageJob:
+        """
+        생성 작업을 제출합니다. 이미 캐시되어 있으면 완료 상태 작업을, 같은 키가 진행 중이면 그 작업을 반환합니다.
+        최근 파이프라인 로드가 실패했으면 큐에 넣지 않고 failed 상태 작업을 반환합니다.
+
+        Raises:
+            ImageQueueFull: 대기열이 가득 참
+        """
+        key = image_key(prompt)
+        with self._lock:
+            self._prune()
+            self._stats["submitted"] += 1
+            if is_cached(key):
+                self._stats["cache_hits"] += 1
+                touch(key)
+                job = ImageJob(id=uuid.uuid4().hex, key=key, prompt=prompt, status="done", cached=True, finished_at=time.time())
+                self._jobs[job.id] = job
+                return job
+            active = self._active.get(key)
+            if active is not None:
+                self._stats["coalesced"] += 1
+                return active
+            reason = self.pool.unavailable()
+            if reason is not None:
+                self._stats["failed"] += 1
+                job = ImageJob(id=uuid.uuid4().hex, key=key, prompt=prompt, status="failed", error=reason, finished_at=time.time())
+                self._jobs[job.id] = job
+                return job
+            job = ImageJob(id=uuid.uuid4().hex, key=key, prompt=prompt)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._stats["rejected"] += 1
+                raise ImageQueueFull(f"이미지 생성 대기열이 가득 찼습니다 ({self._queue.maxsize}개)")
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._ensure_workers()
+        return job
+
+    def get(self, job_id: str) -> Optional[ImageJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job: ImageJob) -> Optional[int]:
+        """대기 중 작업의 대기열 순서 (0부터, 대기 중이 아니면 None)"""
+        if job.status != "queued":
+            return None
+        with self._queue.mutex:
+            pending = list(self._queue.queue)
+        return pending.index(job) if job in pending else None
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > IMAGE_JOB_TTL
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+
+    def _ensure_workers(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._run, name=f"image-job-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                job = self._queue.get(timeout=IMAGE_PIPELINE_IDLE_UNLOAD)
+            except queue.Empty:
+                self.pool.unload_idle()
+                continue
+            try:
+                self._render(job)
+            finally:
+                self._queue.task_done()
+
+    def _render(self, job: ImageJob) -> None:
+        job.status, job.started_at = "running", time.time()
+        try:
+            if not is_cached(job.key):
+                pipeline = self.pool.acquire()
+                try:
+                    image = pipeline(
+                        prompt=job.prompt,
+                        num_inference_steps=IMAGE_STEPS,
+                        guidance_scale=IMAGE_GUIDANCE
+                    ).images[0]
+                finally:
+                    self.pool.release(pipeline)
+                path = image_path(job.key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # 다른 프로세스가 읽는 중에도 깨진 파일이 보이지 않도록 임시 파일 후 교체
+                tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+                image.save(tmp, format="PNG")
+                os.replace(tmp, path)
+                evicted = evict_images()
+                with self._lock:
+                    self._stats["rendered"] += 1
+                    self._stats["evicted"] += evicted
+            job.status = "done"
+            print(f"[image_jobs] 생성 완료 {job.key[:12]} ({time.time() - job.started_at:.1f}초)")
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            with self._lock:
+                self._stats["failed"] += 1
+            print(f"[image_jobs] 생성 실패 {job.key[:12]}: {e}")
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    self._active.pop(job.key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "tracked_jobs": len(self._jobs),
+                "cache_max_mb": IMAGE_CACHE_MAX_MB,
+                "pipelines": self.pool.stats(),
+                **self._stats,
+            }
+
+
+# 싱글톤 인스턴스
+_queue: Optional[ImageJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def images_available() -> bool:
+    """GrowthStage.image_url을 채울지 여부 (비활성이거나 최근 파이프라인 로드가 실패했으면 False)"""
+    return IMAGE_JOBS_ENABLED and get_image_queue().pool.unavailable() is None
+
+
+def get_image_queue() -> ImageJobQueue:
+    """프로세스 공용 이미지 작업 큐 (워커는 첫 제출 시 시작)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ImageJobQueue()
+        return _queue
@@ -0,0 +1,157 @@
+"""
+llama.cpp 모델 풀
+- 프로세스 단위로 미리 로드한 Llama 컨텍스트를 보관하고 요청마다 대여/반납
+- 풀 크기는 메모리 예산(LLM_POOL_MEMORY_MB)으로 결정
+- 가중치는 mmap으로 인스턴스 간 공유되므로 추가 인스턴스는 KV 캐시/버퍼 메모리만 계산
+- LLM_THREADS를 인스턴스 수로 나누어 동시 생성 시 CPU 과다 할당 방지
+"""
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+LLM_MODEL_PATH = os.getenv("LLM_MODEL_PATH", "./models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf")
+LLM_THREADS = int(os.getenv("LLM_THREADS", str(os.cpu_count() or 4)))
+LLM_N_CTX = int(os.getenv("LLM_N_CTX", "4096"))
+# 풀 전체 메모리 예산 (MB, 0이면 인스턴스 1개)
+LLM_POOL_MEMORY_MB = int(os.getenv("LLM_POOL_MEMORY_MB", "0"))
+# 인스턴스 수 상한 (명시적으로 고정하려면 LLM_POOL_SIZE)
+LLM_POOL_MAX = int(os.getenv("LLM_POOL_MAX", "4"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "0"))
+# 컨텍스트 1개당 추가 메모리 추정치 (MB, n_ctx=4096 기준 KV 캐시 + 연산 버퍼)
+LLM_CONTEXT_MB = int(os.getenv("LLM_CONTEXT_MB", "256"))
+
+
+class LlamaPoolTimeout(RuntimeError):
+    """대기 시간 안에 사용 가능한 컨텍스트가 없음"""
+
+
+def estimate_pool_size(model_path: str = LLM_MODEL_PATH, memory_mb: int = LLM_POOL_MEMORY_MB) -> int:
+    """
+    메모리 예산으로 풀 크기를 계산합니다.
+
+    첫 인스턴스 = 모델 파일 크기 + 컨텍스트, 이후 인스턴스 = 컨텍스트 (가중치는 mmap 공유)
+    """
+    if LLM_POOL_SIZE > 0:
+        return LLM_POOL_SIZE
+    if memory_mb <= 0:
+        return 1
+    weights_mb = os.path.getsize(model_path) / (1024 * 1024) if os.path.exists(model_path) else 0
+    context_mb = LLM_CONTEXT_MB * LLM_N_CTX / 4096
+    spare_mb = memory_mb - weights_mb - context_mb
+    extra = int(spare_mb // context_mb) if spare_mb > 0 else 0
+    return max(1, min(LLM_POOL_MAX, 1 + extra))
+
+
+class LlamaPool:
+    """미리 로드한 Llama 컨텍스트 풀"""
+
+    def __init__(self, model_path: str, size: int, n_ctx: int = LLM_N_CTX, n_threads: int = LLM_THREADS):
+        self.model_path = model_path
+        self.size = size
+        self.n_ctx = n_ctx
+        # 동시에 size개가 생성할 수 있으므로 스레드를 나누어 배정
+        self.n_threads = max(1, n_threads // size)
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._instances: List[Any] = []
+        self._lock = threading.Lock()
+        self._stats = {"checkouts": 0, "waits": 0, "timeouts": 0}
+        self.load_seconds: Optional[float] = None
+
+    def load(self) -> None:
+        """풀 크기만큼 Llama 인스턴스를 로드합니다 (이미 로드되었으면 무시)."""
+        with self._lock:
+            if self._instances:
+                return
+            from llama_cpp import Llama
+            from app.services.speculative import make_draft_model
+            start = time.perf_counter()
+            for i in range(self.size):
+                print(f"[llama_pool] LLM 모델 로드 ({i + 1}/{self.size}): {self.model_path}")
+                # 초안 생성기는 상태를 가지므로 컨텍스트마다 따로 생성 (LLM_SPECULATIVE)
+                draft_model = make_draft_model(n_threads=self.n_threads)
+                llm = Llama(
+                    model_path=self.model_path,
+                    n_ctx=self.n_ctx,
+                    n_threads=self.n_threads,
+                    draft_model=draft_model,
+                    # draft_model이 있으면 내부적으로 logits_all이 켜지지만 scores 버퍼는 인자 기준(n_batch행)으로
+                    # 잡혀 n_batch 토큰을 넘는 순간 broadcast 오류가 남 → 명시적으로 n_ctx행 버퍼를 요청
+                    logits_all=draft_model is not None,
+                    verbose=False,
+                )
+                self._instances.append(llm)
+                self._idle.put(llm)
+            self.load_seconds = time.perf_counter() - start
+            print(f"[llama_pool] 로드 완료: {self.size}개, 인스턴스당 스레드 {self.n_threads}, {self.load_seconds:.1f}초")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        컨텍스트를 대여합니다. 블록을 벗어나면 자동 반납됩니다.
+
+        Args:
+            timeout: 대기 시간 (초, None이면 무한 대기)
+
+        Raises:
+            LlamaPoolTimeout: 대기 시간 안에 반납된 컨텍스트가 없음
+        """
+        self.load()
+        try:
+            llm = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self._stats["waits"] += 1
+            try:
+                llm = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise LlamaPoolTimeout(f"llama 컨텍스트 대기 시간 초과 ({timeout}초)")
+        with self._lock:
+            self._stats["checkouts"] += 1
+        try:
+            yield llm
+        finally:
+            self._idle.put(llm)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 크기/유휴 수/대여 통계"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "loaded": len(self._instances),
+                "idle": self._idle.qsize(),
+                "n_threads": self.n_threads,
+                "load_seconds": self.load_seconds,
+                **self._stats,
+            }
+
+
+# 싱글톤 인스턴스
+_pool: Optional[LlamaPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(model_path: str = LLM_MODEL_PATH) -> LlamaPool:
+    """프로세스 공용 LlamaPool을 반환합니다 (모델 로드는 첫 checkout 또는 preload 시)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LlamaPool(model_path, estimate_pool_size(model_path))
+        return _pool
+
+
+def preload(model_path: str = LLM_MODEL_PATH) -> bool:
+    """서버 시작 시 풀을 미리 로드합니다. 모델 파일이 없거나 로드에 실패하면 False."""
+    if not os.path.exists(model_path):
+        print(f"[llama_pool] 모델 파일 없음, 사전 로드 생략: {model_path}")
+        return False
+    try:
+        get_pool(model_path).load()
+        return True
+    except Exception as e:
+        print(f"[llama_pool] 사전 로드 실패: {e}")
+        return False
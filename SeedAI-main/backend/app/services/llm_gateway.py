@@ -0,0 +1,263 @@
+"""
+LLM 게이트웨이 - 모든 OpenAI 호출의 단일 진입점
+- 공유 커넥션 풀: httpx 클라이언트 1개 (trust_env=False로 프록시 환경 변수 무시)
+- 전역 + 엔드포인트별 동시성 제한
+- 엔드포인트별 호출 타임아웃
+- 토큰 사용량/지연/오류 집계
+- 동일 요청 single-flight 병합
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from openai import APITimeoutError, OpenAI
+
+from app.config import settings
+from app.services.singleflight import llm_flight, request_key
+
+# 엔드포인트(호출 종류)별 타임아웃 (초) - 목록에 없으면 settings.llm_default_timeout
+ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "translation": 10.0,
+    "treatment_advice": 45.0,
+    "care_guide": 30.0,
+}
+
+# 엔드포인트별 동시 호출 상한 - 목록에 없으면 settings.llm_endpoint_concurrency
+ENDPOINT_CONCURRENCY: Dict[str, int] = {
+    "translation": 8,
+}
+
+
+class LLMGatewayBusy(RuntimeError):
+    """동시성 한도로 대기 시간 안에 호출 슬롯을 얻지 못함"""
+
+
+# --- 공유 클라이언트 ---
+_client_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_openai_clients: Dict[str, OpenAI] = {}
+
+
+def _resolve_api_key(api_key: Optional[str]) -> Optional[str]:
+    return api_key or settings.openai_api_key or os.getenv("OPENAI_API_KEY")
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_pool_connections,
+        max_keepalive_connections=settings.llm_pool_connections,
+    )
+
+
+def is_configured(api_key: Optional[str] = None) -> bool:
+    """OpenAI API 키가 설정되어 있는지 여부"""
+    return bool(_resolve_api_key(api_key))
+
+
+def get_openai_client(api_key: Optional[str] = None) -> Optional[OpenAI]:
+    """
+    공유 커넥션 풀을 사용하는 동기 OpenAI 클라이언트를 반환합니다.
+    API 키가 없으면 None.
+    """
+    global _http_client
+    key = _resolve_api_key(api_key)
+    if not key:
+        return None
+    with _client_lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            if _http_client is None:
+                # os.environ을 건드리지 않고 프록시 환경 변수만 무시 (스레드 안전)
+                _http_client = httpx.Client(
+                    timeout=settings.llm_default_timeout,
+                    limits=_pool_limits(),
+                    trust_env=False,
+                )
+            client = OpenAI(api_key=key, http_client=_http_client, max_retries=1)
+            _openai_clients[key] = client
+            print("[llm_gateway] OpenAI 클라이언트 로딩 완료 (공유 커넥션 풀)")
+        return client
+
+
+# --- 동시성 제한 ---
+_limit_lock = threading.Lock()
+_global_slots: Optional[threading.BoundedSemaphore] = None
+_endpoint_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def _slots_for(endpoint: str):
+    global _global_slots
+    with _limit_lock:
+        if _global_slots is None:
+            _global_slots = threading.BoundedSemaphore(settings.llm_max_concurrency)
+        slots = _endpoint_slots.get(endpoint)
+        if slots is None:
+            limit = ENDPOINT_CONCURRENCY.get(endpoint, settings.llm_endpoint_concurrency)
+            slots = threading.BoundedSemaphore(limit)
+            _endpoint_slots[endpoint] = slots
+        return _global_slots, slots
+
+
+def _acquire_slots(endpoint: str, wait: float) -> None:
+    global_slots, endpoint_slots = _slots_for(endpoint)
+    deadline = time.monotonic() + wait
+    if not endpoint_slots.acquire(timeout=wait):
+        _record(endpoint, rejected=1)
+        raise LLMGatewayBusy(f"LLM 엔드포인트 '{endpoint}' 동시 호출 한도 초과")
+    if not global_slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+        endpoint_slots.release()
+        _record(endpoint, rejected=1)
+        raise LLMGatewayBusy("LLM 전역 동시 호출 한도 초과")
+
+
+def _release_slots(endpoint: str) -> None:
+    global_slots, endpoint_slots = _slots_for(endpoint)
+    global_slots.release()
+    endpoint_slots.release()
+
+
+@contextmanager
+def _limited(endpoint: str, wait: float):
+    _acquire_slots(endpoint, wait)
+    try:
+        yield
+    finally:
+        _release_slots(endpoint)
+
+
+# --- 사용량 집계 ---
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _record(endpoint: str, **deltas: float) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(endpoint, {
+            "calls": 0, "errors": 0, "timeouts": 0, "rejected": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "latency_total": 0.0,
+        })
+        for k, v in deltas.items():
+            row[k] = row.get(k, 0) + v
+
+
+def _record_response(endpoint: str, response: Any, elapsed: float) -> None:
+    usage = getattr(response, "usage", None)
+    _record(
+        endpoint,
+        calls=1,
+        latency_total=elapsed,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def _record_error(endpoint: str, error: BaseException, elapsed: float) -> None:
+    if isinstance(error, APITimeoutError):
+        _record(endpoint, calls=1, errors=1, timeouts=1, latency_total=elapsed)
+    else:
+        _record(endpoint, calls=1, errors=1, latency_total=elapsed)
+
+
+def get_stats() -> Dict[str, Any]:
+    """엔드포인트별 호출/토큰/지연 통계와 single-flight 통계"""
+    with _stats_lock:
+        endpoints = {}
+        for name, row in _stats.items():
+            calls = row["calls"] or 1
+            endpoints[name] = {**row, "avg_latency": round(row["latency_total"] / calls, 3)}
+    return {
+        "endpoints": endpoints,
+        "singleflight": llm_flight.stats(),
+        "limits": {
+            "global": settings.llm_max_concurrency,
+            "per_endpoint": {**{"default": settings.llm_endpoint_concurrency}, **ENDPOINT_CONCURRENCY},
+        },
+    }
+
+
+def _timeout_for(endpoint: str, timeout: Optional[float]) -> float:
+    if timeout is not None:
+        return timeout
+    return ENDPOINT_TIMEOUTS.get(endpoint, settings.llm_default_timeout)
+
+
+# --- 호출 ---
+def chat_completion(
+    endpoint: str,
+    api_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **params: Any
+):
+    """
+    chat.completions.create를 게이트웨이 정책(동시성/타임아웃/집계/single-flight) 아래에서 호출합니다.
+
+    Args:
+        endpoint: 호출 종류 (예: "translation", "care_guide", "treatment_advice")
+        api_key: API 키 (생략 시 설정/환경 변수)
+        timeout: 호출 타임아웃 (생략 시 ENDPOINT_TIMEOUTS)
+        **params: chat.completions.create 인자 (model, messages, ...)
+
+    Returns:
+        ChatCompletion 응답 (동시 동일 요청은 같은 객체를 공유)
+    """
+    client = get_openai_client(api_key)
+    if client is None:
+        raise RuntimeError("OpenAI API 키가 설정되지 않았습니다.")
+    call_timeout = _timeout_for(endpoint, timeout)
+
+    def call():
+        with _limited(endpoint, wait=call_timeout):
+            start = time.perf_counter()
+            try:
+                response = client.chat.completions.create(timeout=call_timeout, **params)
+            except Exception as e:
+                _record_error(endpoint, e, time.perf_counter() - start)
+                raise
+            _record_response(endpoint, response, time.perf_counter() - start)
+            return response
+
+    key = request_key(endpoint=endpoint, api_key=client.api_key, **params)
+    return llm_flight.do(key, call)
+
+
+def stream_chat_completion(
+    endpoint: str,
+    api_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+    **params: Any
+) -> Iterator[str]:
+    """
+    stream=True 호출의 텍스트 조각을 반환합니다. 스트림이 끝날 때까지 동시성 슬롯을 점유합니다.
+    스트리밍 응답에는 usage가 없으므로 completion_tokens는 청크 수로 근사합니다.
+    """
+    client = get_openai_client(api_key)
+    if client is None:
+        raise RuntimeError("OpenAI API 키가 설정되지 않았습니다.")
+    call_timeout = _timeout_for(endpoint, timeout)
+
+    with _limited(endpoint, wait=call_timeout):
+        start = time.perf_counter()
+        chunks = 0
+        try:
+            stream = client.chat.completions.create(stream=True, timeout=call_timeout, **params)
+        except Exception as e:
+            _record_error(endpoint, e, time.perf_counter() - start)
+            raise
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks += 1
+                    yield delta
+        except Exception as e:
+            _record_error(endpoint, e, time.perf_counter() - start)
+            raise
+        finally:
+            # 클라이언트가 중간에 연결을 끊어도 업스트림 응답을 정리
+            stream.response.close()
+        _record(endpoint, calls=1, completion_tokens=chunks, latency_total=time.perf_counter() - start)
@@ -0,0 +1,404 @@
+"""
+LLM 프로바이더 라우터
+- 프로바이더: OpenAI(llm_gateway), 로컬 llama.cpp(textgen_adapter)
+- (프로바이더, 요청 종류)별 최근 호출의 p95 지연, 오류율, 응답 파싱(검증) 실패율을 추적
+- 요청 종류(번역, 관리 가이드, 방제법, 성장 요약)마다 SLO 안에 드는 가장 빠른 정상 프로바이더로 전송
+- 실패 시 다음 순위 프로바이더로 폴백
+- 프로바이더는 생성자 주입이 가능하므로 로컬 스텁으로 테스트 가능
+"""
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 통계 윈도 (최근 N회 호출)
+WINDOW_SIZE = 50
+# 이 횟수 미만으로 관측된 프로바이더는 "미측정"으로 취급
+MIN_SAMPLES = 5
+# 오류율이 이 값을 넘으면 비정상
+MAX_ERROR_RATE = 0.5
+# 비정상 판정 후 이 시간(초)이 지나면 다시 시도 대상에 포함
+UNHEALTHY_COOLDOWN = 60.0
+
+
+@dataclass
+class RequestClassPolicy:
+    """요청 종류별 라우팅 정책"""
+    slo: float                       # 목표 p95 지연 (초)
+    timeout: float                   # 프로바이더 호출 타임아웃 (초)
+    providers: Tuple[str, ...]       # 허용 프로바이더 (선호 순서)
+
+
+# 요청 종류별 기본 정책
+DEFAULT_POLICIES: Dict[str, RequestClassPolicy] = {
+    "translation": RequestClassPolicy(slo=3.0, timeout=10.0, providers=("openai", "llama_cpp")),
+    # 관리 가이드는 로컬 llama.cpp가 JSON 스키마 문법으로 생성 (네트워크 없이 항상 파싱 가능), 느리면 OpenAI
+    "care_guide": RequestClassPolicy(slo=15.0, timeout=30.0, providers=("llama_cpp", "openai")),
+    "treatment_advice": RequestClassPolicy(slo=20.0, timeout=45.0, providers=("openai", "llama_cpp")),
+    "growth_summary": RequestClassPolicy(slo=10.0, timeout=10.0, providers=("llama_cpp", "openai")),
+}
+
+
+@dataclass
+class LLMRequest:
+    """프로바이더에 전달되는 요청"""
+    request_class: str
+    messages: List[Dict[str, str]]
+    max_tokens: int
+    temperature: float
+    timeout: float
+    json_mode: bool = False
+    json_schema: Optional[Dict[str, Any]] = None   # 출력 JSON 스키마 (로컬 모델은 문법으로 강제)
+
+
+@dataclass
+class LLMResult:
+    """라우팅된 호출 결과"""
+    text: str
+    provider: str
+    latency: float
+
+
+class NoProviderAvailable(RuntimeError):
+    """사용 가능한 프로바이더가 없거나 모두 실패함"""
+
+
+class LLMProvider:
+    """프로바이더 인터페이스"""
+    name: str = "base"
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def complete(self, request: LLMRequest) -> Optional[str]:
+        """생성 텍스트를 반환합니다. 실패 시 예외 또는 None."""
+        raise NotImplementedError
+
+    def stream(self, request: LLMRequest) -> Iterator[str]:
+        """생성 텍스트 조각을 순서대로 반환합니다. 기본 구현은 complete 결과를 한 조각으로 반환."""
+        text = self.complete(request)
+        if text:
+            yield text
+
+
+class OpenAIProvider(LLMProvider):
+    """GPT-4o mini (llm_gateway 경유)"""
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None):
+        self.model = model
+        self.api_key = api_key
+
+    def available(self) -> bool:
+        from app.services import llm_gateway
+        return llm_gateway.is_configured(self.api_key)
+
+    def complete(self, request: LLMRequest) -> Optional[str]:
+        from app.services import llm_gateway
+        params: Dict[str, Any] = {}
+        if request.json_mode or request.json_schema is not None:
+            params["response_format"] = {"type": "json_object"}
+        response = llm_gateway.chat_completion(
+            request.request_class,
+            api_key=self.api_key,
+            timeout=request.timeout,
+            model=self.model,
+            messages=request.messages,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            **params
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    def stream(self, request: LLMRequest) -> Iterator[str]:
+        from app.services import llm_gateway
+        yield from llm_gateway.stream_chat_completion(
+            request.request_class,
+            api_key=self.api_key,
+            timeout=request.timeout,
+            model=self.model,
+            messages=request.messages,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+        )
+
+
+class LlamaCppProvider(LLMProvider):
+    """로컬 llama.cpp GGUF 모델 (textgen_adapter 경유)"""
+    name = "llama_cpp"
+
+    def available(self) -> bool:
+        from app.services import textgen_adapter
+        return textgen_adapter.local_llm_available()
+
+    def complete(self, request: LLMRequest) -> Optional[str]:
+        from app.services import textgen_adapter
+        return textgen_adapter.local_chat_completion(
+            request.messages,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            timeout=request.timeout,
+            json_mode=request.json_mode,
+            json_schema=request.json_schema,
+        )
+
+    def stream(self, request: LLMRequest) -> Iterator[str]:
+        from app.services import textgen_adapter
+        yield from textgen_adapter.local_chat_stream(
+            request.messages,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            timeout=request.timeout,
+        )
+
+
+class _ProviderStats:
+    """(프로바이더, 요청 종류) 한 쌍의 최근 호출 통계"""
+
+    def __init__(self):
+        # (지연, 성공 여부, 응답 검증 실패 여부)
+        self.samples: Deque[Tuple[float, bool, bool]] = deque(maxlen=WINDOW_SIZE)
+        self.last_failure = 0.0
+
+    def record(self, latency: float, ok: bool, invalid: bool = False) -> None:
+        self.samples.append((latency, ok, invalid))
+        if not ok:
+            self.last_failure = time.monotonic()
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    def p95(self) -> Optional[float]:
+        latencies = sorted(lat for lat, ok, _ in self.samples if ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)
+        return latencies[index]
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok, _ in self.samples if not ok) / len(self.samples)
+
+    def parse_failure_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, _, invalid in self.samples if invalid) / len(self.samples)
+
+    def healthy(self) -> bool:
+        if self.count < MIN_SAMPLES or self.error_rate() <= MAX_ERROR_RATE:
+            return True
+        # 쿨다운이 지나면 회복 여부 확인을 위해 다시 시도
+        return time.monotonic() - self.last_failure > UNHEALTHY_COOLDOWN
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "samples": self.count,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "parse_failure_rate": round(self.parse_failure_rate(), 3),
+            "healthy": self.healthy(),
+        }
+
+
+class LLMRouter:
+    """지연/오류율 기반 LLM 프로바이더 라우터"""
+
+    def __init__(
+        self,
+        providers: Sequence[LLMProvider],
+        policies: Optional[Dict[str, RequestClassPolicy]] = None
+    ):
+        self.providers: Dict[str, LLMProvider] = {p.name: p for p in providers}
+        self.policies = dict(policies or DEFAULT_POLICIES)
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _ProviderStats] = {}
+
+    def _stats_for(self, provider: str, request_class: str) -> _ProviderStats:
+        key = (provider, request_class)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = _ProviderStats()
+                self._stats[key] = stats
+            return stats
+
+    def record(self, provider: str, request_class: str, latency: float, ok: bool, invalid: bool = False) -> None:
+        """호출 결과를 통계에 반영합니다 (invalid: 응답은 받았으나 검증/파싱 실패)."""
+        stats = self._stats_for(provider, request_class)
+        with self._lock:
+            stats.record(latency, ok, invalid)
+
+    def rank(self, request_class: str) -> List[str]:
+        """
+        요청 종류에 대해 시도할 프로바이더 순서를 반환합니다.
+
+        순위: 정상 + SLO 충족(빠른 순) → 정상 + 미측정(선호 순) → 정상 + SLO 초과(빠른 순) → 비정상
+        """
+        policy = self.policies[request_class]
+        ranked = []
+        for preference, name in enumerate(policy.providers):
+            provider = self.providers.get(name)
+            if provider is None or not provider.available():
+                continue
+            stats = self._stats_for(name, request_class)
+            with self._lock:
+                healthy = stats.healthy()
+                p95 = stats.p95() if stats.count >= MIN_SAMPLES else None
+            if not healthy:
+                tier = 3
+            elif p95 is None:
+                tier = 1
+            elif p95 <= policy.slo:
+                tier = 0
+            else:
+                tier = 2
+            ranked.append((tier, p95 if p95 is not None else 0.0, preference, name))
+        ranked.sort()
+        return [name for _, _, _, name in ranked]
+
+    def complete(
+        self,
+        request_class: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.7,
+        json_mode: bool = False,
+        timeout: Optional[float] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> LLMResult:
+        """
+        요청을 가장 적합한 프로바이더로 보내고, 실패하면 다음 프로바이더로 폴백합니다.
+
+        Args:
+            request_class: 요청 종류 (DEFAULT_POLICIES 키)
+            messages: chat 메시지
+            max_tokens: 최대 생성 토큰
+            temperature: 샘플링 온도
+            json_mode: JSON 객체 출력 요청 여부
+            timeout: 호출 타임아웃 (생략 시 정책 값)
+            validate: 응답 검증 함수 (예외 발생 시 해당 프로바이더 실패 + 파싱 실패로 기록 후 폴백)
+            json_schema: 출력 JSON 스키마 (llama.cpp는 문법 제약 생성, OpenAI는 JSON 모드)
+
+        Returns:
+            LLMResult
+
+        Raises:
+            NoProviderAvailable: 사용 가능한 프로바이더가 없거나 모두 실패
+        """
+        policy = self.policies[request_class]
+        request = LLMRequest(
+            request_class=request_class,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout if timeout is not None else policy.timeout,
+            json_mode=json_mode,
+            json_schema=json_schema,
+        )
+        order = self.rank(request_class)
+        if not order:
+            raise NoProviderAvailable(f"'{request_class}' 요청을 처리할 수 있는 LLM 프로바이더가 없습니다.")
+
+        errors = []
+        for name in order:
+            start = time.perf_counter()
+            invalid = False
+            try:
+                text = self.providers[name].complete(request)
+                if not text:
+                    raise RuntimeError("빈 응답 또는 타임아웃")
+                if validate is not None:
+                    invalid = True
+                    validate(text)
+                    invalid = False
+            except Exception as e:
+                self.record(name, request_class, time.perf_counter() - start, ok=False, invalid=invalid)
+                errors.append(f"{name}: {e}")
+                print(f"[llm_router] {request_class} → {name} 실패, 다음 프로바이더 시도: {e}")
+                continue
+            latency = time.perf_counter() - start
+            self.record(name, request_class, latency, ok=True)
+            return LLMResult(text=text, provider=name, latency=latency)
+
+        raise NoProviderAvailable(f"'{request_class}' 요청이 모든 프로바이더에서 실패했습니다: {'; '.join(errors)}")
+
+    def stream(
+        self,
+        request_class: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        complete의 스트리밍 버전입니다. 첫 조각을 내기 전에 실패하면 다음 프로바이더로 폴백하고,
+        조각을 보낸 뒤 실패하면 프로바이더를 바꿀 수 없으므로 예외를 그대로 전달합니다.
+
+        Raises:
+            NoProviderAvailable: 사용 가능한 프로바이더가 없거나 모두 첫 조각 전에 실패
+        """
+        policy = self.policies[request_class]
+        request = LLMRequest(
+            request_class=request_class,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout if timeout is not None else policy.timeout,
+        )
+        order = self.rank(request_class)
+        if not order:
+            raise NoProviderAvailable(f"'{request_class}' 요청을 처리할 수 있는 LLM 프로바이더가 없습니다.")
+
+        errors = []
+        for name in order:
+            start = time.perf_counter()
+            produced = False
+            try:
+                for delta in self.providers[name].stream(request):
+                    produced = True
+                    yield delta
+            except Exception as e:
+                self.record(name, request_class, time.perf_counter() - start, ok=False)
+                if produced:
+                    raise
+                errors.append(f"{name}: {e}")
+                print(f"[llm_router] {request_class} 스트림 → {name} 실패, 다음 프로바이더 시도: {e}")
+                continue
+            self.record(name, request_class, time.perf_counter() - start, ok=produced)
+            if produced:
+                return
+            errors.append(f"{name}: 빈 응답 또는 타임아웃")
+
+        raise NoProviderAvailable(f"'{request_class}' 스트림이 모든 프로바이더에서 실패했습니다: {'; '.join(errors)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 종류 → 프로바이더 → {samples, p95, error_rate, parse_failure_rate, healthy}"""
+        with self._lock:
+            items = list(self._stats.items())
+            result: Dict[str, Dict[str, Any]] = {}
+            for (provider, request_class), stats in items:
+                result.setdefault(request_class, {})[provider] = stats.snapshot()
+        return {
+            "routes": {name: self.rank(name) for name in self.policies},
+            "providers": result,
+        }
+
+
+# 싱글톤 인스턴스
+_router_instance: Optional[LLMRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> LLMRouter:
+    """기본 프로바이더(OpenAI, llama.cpp)로 구성된 LLMRouter 싱글톤을 반환합니다."""
+    global _router_instance
+    with _router_lock:
+        if _router_instance is None:
+            _router_instance = LLMRouter([OpenAIProvider(), LlamaCppProvider()])
+        return _router_instance
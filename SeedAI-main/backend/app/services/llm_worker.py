@@ -0,0 +1,368 @@
+"""
+로컬 LLM 생성 서버 (continuous batching)
+- GGUF 모델을 이 프로세스에 한 번만 로드하고, uvicorn 워커들은 LLM_WORKER_URL로 공유
+- 동시 요청은 슬롯(seq_id)에 배정되고, 매 스텝 모든 활성 슬롯의 다음 토큰을 하나의 llama_batch로 디코딩
+- 새 요청의 prompt는 남는 배치 공간에 나누어 합류 (진행 중인 생성을 멈추지 않음)
+- 표준 라이브러리 HTTP 서버: POST /generate, GET /health
+
+실행:
+    python -m app.services.llm_worker --port 8765
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+LLM_MODEL_PATH = os.getenv("LLM_MODEL_PATH", "./models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf")
+LLM_THREADS = int(os.getenv("LLM_THREADS", str(os.cpu_count() or 4)))
+LLM_WORKER_PORT = int(os.getenv("LLM_WORKER_PORT", "8765"))
+LLM_WORKER_SLOTS = int(os.getenv("LLM_WORKER_SLOTS", "4"))         # 동시 생성 슬롯 수
+LLM_WORKER_SLOT_CTX = int(os.getenv("LLM_WORKER_SLOT_CTX", "2048"))  # 슬롯당 컨텍스트 길이
+LLM_WORKER_BATCH = int(os.getenv("LLM_WORKER_BATCH", "512"))       # 한 스텝 최대 토큰 수
+LLM_WORKER_QUEUE = int(os.getenv("LLM_WORKER_QUEUE", "16"))        # 슬롯 대기 요청 상한
+
+TOP_K = 40
+TOP_P = 0.95
+
+
+class WorkerBusy(RuntimeError):
+    """대기열이 가득 참"""
+
+
+def _kv_seq_rm(lib):
+    """
+    시퀀스 KV 제거 함수 (ctx, seq_id, p0, p1)를 반환합니다.
+    llama-cpp-python 버전마다 이름이 다름: 0.2.x llama_kv_cache_seq_rm → llama_kv_self_seq_rm → 0.3.x llama_memory_seq_rm
+    """
+    for name in ("llama_kv_cache_seq_rm", "llama_kv_self_seq_rm"):
+        fn = getattr(lib, name, None)
+        if fn is not None:
+            return fn
+    if hasattr(lib, "llama_memory_seq_rm") and hasattr(lib, "llama_get_memory"):
+        return lambda ctx, seq_id, p0, p1: lib.llama_memory_seq_rm(lib.llama_get_memory(ctx), seq_id, p0, p1)
+    raise RuntimeError(f"지원하지 않는 llama-cpp-python 버전입니다 (시퀀스 KV 제거 함수 없음): {getattr(lib, '__version__', '?')}")
+
+
+class GenerationRequest:
+    """슬롯 하나에서 진행되는 생성 요청"""
+
+    def __init__(self, prompt_tokens: List[int], max_tokens: int, temperature: float, deadline: float):
+        self.prompt_tokens = prompt_tokens
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.deadline = deadline
+        self.slot: Optional[int] = None
+        self.n_past = 0              # KV 캐시에 들어간 토큰 수 (= 다음 토큰 위치)
+        self.prefill_cursor = 0      # 평가한 prompt 토큰 수
+        self.last_token: Optional[int] = None
+        self.generated = 0
+        self.text = bytearray()
+        self.finish_reason: Optional[str] = None
+        self.error: Optional[str] = None
+        self.cancelled = False
+        self.done = threading.Event()
+        self.created_at = time.monotonic()
+        self.first_token_at: Optional[float] = None
+
+    @property
+    def prefilling(self) -> bool:
+        return self.prefill_cursor < len(self.prompt_tokens)
+
+
+class BatchEngine:
+    """슬롯 기반 continuous batching 엔진 (단일 스레드가 llama 컨텍스트를 소유)"""
+
+    def __init__(
+        self,
+        model_path: str = LLM_MODEL_PATH,
+        n_slots: int = LLM_WORKER_SLOTS,
+        slot_ctx: int = LLM_WORKER_SLOT_CTX,
+        n_batch: int = LLM_WORKER_BATCH,
+        n_threads: int = LLM_THREADS,
+        max_queue: int = LLM_WORKER_QUEUE,
+    ):
+        import llama_cpp
+
+        self._lib = llama_cpp
+        self._seq_rm = _kv_seq_rm(llama_cpp)
+        # 가중치와 토크나이저는 고수준 Llama 객체에서 가져오고 (자체 컨텍스트는 최소 크기),
+        # 배치 디코딩용 컨텍스트는 슬롯 수만큼 시퀀스를 허용하도록 직접 생성
+        self.llm = llama_cpp.Llama(model_path=model_path, n_ctx=256, n_threads=n_threads, verbose=False)
+        cparams = llama_cpp.llama_context_default_params()
+        cparams.n_ctx = n_slots * slot_ctx
+        cparams.n_batch = n_batch
+        cparams.n_seq_max = n_slots
+        cparams.n_threads = n_threads
+        cparams.n_threads_batch = n_threads
+        self.ctx = llama_cpp.llama_new_context_with_model(self.llm.model, cparams)
+        if not self.ctx:
+            raise RuntimeError("llama 배치 컨텍스트 생성 실패")
+        self.batch = llama_cpp.llama_batch_init(n_batch, 0, n_slots)
+
+        self.n_slots = n_slots
+        self.slot_ctx = slot_ctx
+        self.n_batch = n_batch
+        self.n_vocab = self.llm.n_vocab()
+        self.stop_tokens = {self.llm.token_eos()}
+        im_end = self.llm.tokenize("<|im_end|>".encode("utf-8"), add_bos=False, special=True)
+        if len(im_end) == 1:
+            self.stop_tokens.add(im_end[0])
+
+        self._rng = np.random.default_rng()
+        self._pending: "queue.Queue[GenerationRequest]" = queue.Queue(maxsize=max_queue)
+        self._free_slots = list(range(n_slots))
+        self._active: List[GenerationRequest] = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0, "completed": 0, "timed_out": 0, "rejected": 0, "errors": 0,
+            "prompt_tokens": 0, "generated_tokens": 0, "steps": 0, "decode_seconds": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="llm-batch-engine", daemon=True)
+        self._thread.start()
+
+    # --- 요청 API (HTTP 핸들러 스레드에서 호출) ---
+    def generate(self, prompt: str, max_tokens: int, temperature: float, timeout: float) -> Dict[str, Any]:
+        """prompt를 슬롯 대기열에 넣고 생성이 끝날 때까지 기다립니다."""
+        tokens = self.llm.tokenize(prompt.encode("utf-8"), special=True)
+        if len(tokens) >= self.slot_ctx:
+            raise ValueError(f"prompt가 슬롯 컨텍스트({self.slot_ctx})보다 깁니다: {len(tokens)} 토큰")
+        max_tokens = min(max_tokens, self.slot_ctx - len(tokens))
+        req = GenerationRequest(tokens, max_tokens, temperature, time.monotonic() + timeout)
+        try:
+            self._pending.put_nowait(req)
+        except queue.Full:
+            self._record(rejected=1)
+            raise WorkerBusy("생성 대기열이 가득 찼습니다")
+        self._record(requests=1)
+
+        if not req.done.wait(timeout + 1.0):
+            # 엔진이 다음 스텝에서 슬롯을 정리
+            req.cancelled = True
+            req.done.wait(1.0)
+        return {
+            "text": req.text.decode("utf-8", errors="ignore"),
+            "finish_reason": req.finish_reason or "timeout",
+            "error": req.error,
+            "prompt_tokens": len(tokens),
+            "completion_tokens": req.generated,
+            "ttft": round(req.first_token_at - req.created_at, 3) if req.first_token_at else None,
+            "seconds": round(time.monotonic() - req.created_at, 3),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            active = len(self._active)
+        decode_seconds = stats["decode_seconds"] or 1e-9
+        return {
+            **stats,
+            "slots": self.n_slots,
+            "active": active,
+            "queued": self._pending.qsize(),
+            "tokens_per_second": round(stats["generated_tokens"] / decode_seconds, 2),
+        }
+
+    def _record(self, **deltas: float) -> None:
+        with self._lock:
+            for k, v in deltas.items():
+                self._stats[k] += v
+
+    # --- 엔진 루프 ---
+    def _admit(self) -> None:
+        """빈 슬롯에 대기 요청을 배정합니다. 활성 요청이 없으면 새 요청을 기다립니다."""
+        while self._free_slots:
+            try:
+                block = not self._active
+                req = self._pending.get(timeout=0.1) if block else self._pending.get_nowait()
+            except queue.Empty:
+                return
+            if req.cancelled or time.monotonic() > req.deadline:
+                self._finish(req, "timeout")
+                continue
+            req.slot = self._free_slots.pop()
+            with self._lock:
+                self._active.append(req)
+            self._record(prompt_tokens=len(req.prompt_tokens))
+
+    def _add(self, i: int, token: int, pos: int, seq_id: int, logits: bool) -> None:
+        b = self.batch
+        b.token[i] = token
+        b.pos[i] = pos
+        b.n_seq_id[i] = 1
+        b.seq_id[i][0] = seq_id
+        b.logits[i] = logits
+
+    def _sample(self, logits: np.ndarray, temperature: float) -> int:
+        if temperature <= 0:
+            return int(np.argmax(logits))
+        top = np.argpartition(logits, -TOP_K)[-TOP_K:]
+        scaled = logits[top].astype(np.float64) / temperature
+        probs = np.exp(scaled - scaled.max())
+        probs /= probs.sum()
+        order = np.argsort(probs)[::-1]
+        cutoff = int(np.searchsorted(np.cumsum(probs[order]), TOP_P)) + 1
+        keep = order[:cutoff]
+        p = probs[keep] / probs[keep].sum()
+        return int(top[keep[self._rng.choice(len(keep), p=p)]])
+
+    def _finish(self, req: GenerationRequest, reason: str, error: Optional[str] = None) -> None:
+        if req.slot is not None:
+            # 슬롯의 KV 캐시 제거 후 반환 (제거에 실패한 슬롯은 이전 토큰이 남아 있으므로 다시 배정하지 않음)
+            try:
+                self._seq_rm(self.ctx, req.slot, -1, -1)
+                self._free_slots.append(req.slot)
+            except Exception as e:
+                print(f"[llm_worker] 슬롯 {req.slot} KV 제거 실패, 슬롯을 사용하지 않음: {e}")
+            req.slot = None
+            with self._lock:
+                self._active.remove(req)
+        req.finish_reason = reason
+        req.error = error
+        if reason == "timeout":
+            self._record(timed_out=1)
+        elif error:
+            self._record(errors=1)
+        else:
+            self._record(completed=1)
+        req.done.set()
+
+    def _step(self) -> None:
+        """활성 슬롯 전체를 한 배치로 디코딩하고 슬롯마다 다음 토큰을 샘플링합니다."""
+        n = 0
+        sample_at: Dict[int, GenerationRequest] = {}
+        active = list(self._active)
+
+        # 1) 생성 중인 슬롯: 직전 토큰 1개씩
+        for req in active:
+            if not req.prefilling:
+                self._add(n, req.last_token, req.n_past, req.slot, True)
+                sample_at[n] = req
+                req.n_past += 1
+                n += 1
+        # 2) 새 슬롯의 prompt: 남은 배치 공간만큼 나누어 평가
+        for req in active:
+            if not req.prefilling:
+                continue
+            take = min(len(req.prompt_tokens) - req.prefill_cursor, self.n_batch - n)
+            if take <= 0:
+                break
+            for j in range(take):
+                idx = req.prefill_cursor + j
+                last = idx == len(req.prompt_tokens) - 1
+                self._add(n, req.prompt_tokens[idx], req.n_past, req.slot, last)
+                if last:
+                    sample_at[n] = req
+                req.n_past += 1
+                n += 1
+            req.prefill_cursor += take
+
+        self.batch.n_tokens = n
+        start = time.perf_counter()
+        rc = self._lib.llama_decode(self.ctx, self.batch)
+        self._record(steps=1, decode_seconds=time.perf_counter() - start)
+        if rc != 0:
+            for req in active:
+                self._finish(req, "error", error=f"llama_decode 실패 (rc={rc})")
+            return
+
+        now = time.monotonic()
+        for i, req in sample_at.items():
+            logits = np.ctypeslib.as_array(self._lib.llama_get_logits_ith(self.ctx, i), shape=(self.n_vocab,))
+            token = self._sample(logits, req.temperature)
+            if req.first_token_at is None:
+                req.first_token_at = now
+            if token in self.stop_tokens:
+                self._finish(req, "stop")
+                continue
+            req.text += self.llm.detokenize([token])
+            req.last_token = token
+            req.generated += 1
+            self._record(generated_tokens=1)
+            if req.generated >= req.max_tokens or req.n_past + 1 >= self.slot_ctx:
+                self._finish(req, "length")
+
+        # 3) 타임아웃/취소된 슬롯은 즉시 반환
+        for req in list(self._active):
+            if req.cancelled or now > req.deadline:
+                self._finish(req, "timeout")
+
+    def _run(self) -> None:
+        while True:
+            self._admit()
+            if not self._active:
+                if not self._free_slots:
+                    # 사용할 수 있는 슬롯이 없음 → 대기 요청은 generate()에서 타임아웃
+                    time.sleep(0.1)
+                continue
+            try:
+                self._step()
+            except Exception as e:
+                print(f"[llm_worker] 배치 스텝 오류: {e}")
+                for req in list(self._active):
+                    self._finish(req, "error", error=str(e))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    engine: BatchEngine = None
+
+    def _json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._json(200, {"status": "ok", **self.engine.stats()})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            result = self.engine.generate(
+                body["prompt"],
+                max_tokens=int(body.get("max_tokens", 512)),
+                temperature=float(body.get("temperature", 0.6)),
+                timeout=float(body.get("timeout", 10)),
+            )
+        except WorkerBusy as e:
+            self._json(503, {"error": str(e)})
+            return
+        except (KeyError, ValueError) as e:
+            self._json(400, {"error": str(e)})
+            return
+        self._json(200, result)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = LLM_WORKER_PORT, **engine_kwargs: Any) -> None:
+    """엔진을 로드하고 HTTP 서버를 실행합니다."""
+    print(f"[llm_worker] 모델 로드: {engine_kwargs.get('model_path', LLM_MODEL_PATH)}")
+    _Handler.engine = BatchEngine(**engine_kwargs)
+    server = ThreadingHTTPServer((host, port), _Handler)
+    print(f"[llm_worker] http://{host}:{port} 대기 중 (슬롯 {_Handler.engine.n_slots}개)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 LLM continuous batching 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=LLM_WORKER_PORT)
+    parser.add_argument("--model", default=LLM_MODEL_PATH)
+    parser.add_argument("--slots", type=int, default=LLM_WORKER_SLOTS)
+    args = parser.parse_args()
+    serve(args.host, args.port, model_path=args.model, n_slots=args.slots)
@@ -0,0 +1,412 @@
+"""
+모델 서버 프로세스 (멀티 워커 배포용)
+- 분류(ViT)/감지(YOLO) 가중치를 이 프로세스에 한 번만 로드하고, uvicorn 워커들은 Unix 소켓으로 추론을 요청
+  → API 워커 수를 코어 수만큼 늘려도 모델 메모리는 늘지 않음 (워커는 torch/ultralytics를 import하지 않음)
+- 이미지 배열은 직렬화하지 않고 multiprocessing.shared_memory로 전달:
+  클라이언트 연결마다 공유 메모리 버퍼 하나를 만들어 재사용하고, 서버는 같은 버퍼를 numpy 배열/torch 텐서로 감싸
+  복사 없이 추론. 소켓으로는 작은 헤더와 결과 dict만 오감
+- 로컬 llama는 이미 별도 프로세스(llm_worker, LLM_WORKER_URL)로 공유되므로 여기서 다루지 않음
+- 프로토콜: multiprocessing.connection (길이 prefix 프레이밍 + authkey 인증)
+  수신 메시지는 pickle이므로 인증 키가 곧 코드 실행 권한: MODEL_SERVER_AUTHKEY를 지정하지 않으면 서버가 시작할 때
+  무작위 키를 만들어 소켓 옆 `<소켓>.key`(0600)에 기록하고, 같은 사용자로 실행한 워커가 그 파일을 읽음
+  요청 {"op": ..., [shm, shape, dtype], ...} → 응답 {"ok": True, "result": ...} / {"ok": False, "error": ...}
+
+실행 (backend 디렉터리에서):
+    python -m app.services.model_server --socket /tmp/seedai-models.sock
+
+API 서버 쪽 설정:
+    MODEL_SERVER_SOCKET=/tmp/seedai-models.sock
+"""
+import argparse
+import atexit
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import AuthenticationError, resource_tracker, shared_memory
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+MODEL_SERVER_SOCKET = os.getenv("MODEL_SERVER_SOCKET", "")  # 설정 시 API 워커는 모델을 로드하지 않고 이 소켓으로 추론 요청
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "")  # 비우면 서버가 무작위 키를 만들어 `<소켓>.key`에 기록
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", "60"))  # 요청 하나의 응답 대기 (초)
+MODEL_SERVER_READY_TIMEOUT = float(os.getenv("MODEL_SERVER_READY_TIMEOUT", "600"))  # 시작 시 서버 준비 대기 (초)
+
+# 공유 메모리 버퍼 최소 크기 (640x640 BGR 이미지 기준, 더 큰 입력이 오면 그 크기로 다시 만듦)
+MIN_BUFFER_BYTES = 640 * 640 * 3
+
+# 서버가 직접 보유하는 모델 (preload 이름)
+SERVED_MODELS = ["detector", "classifier"]
+
+# 이 프로세스가 모델 서버이면 True (서버 안에서는 항상 로컬 모델 사용)
+_serving = False
+
+
+class ModelServerError(RuntimeError):
+    """모델 서버가 요청 처리에 실패함"""
+
+
+def enabled() -> bool:
+    """API 워커가 추론을 모델 서버에 맡기는지 여부"""
+    return bool(MODEL_SERVER_SOCKET) and not _serving
+
+
+def key_path(socket_path: str) -> str:
+    """서버가 만든 인증 키 파일 경로"""
+    return f"{socket_path}.key"
+
+
+def load_authkey(socket_path: str) -> bytes:
+    """
+    인증 키를 반환합니다 (MODEL_SERVER_AUTHKEY, 없으면 서버가 기록한 키 파일).
+
+    Raises:
+        ModelServerError: 키를 찾을 수 없음 (서버가 아직 시작 전이거나 파일을 읽을 권한 없음)
+    """
+    if MODEL_SERVER_AUTHKEY:
+        return MODEL_SERVER_AUTHKEY.encode("utf-8")
+    try:
+        with open(key_path(socket_path), "rb") as f:
+            return f.read().strip()
+    except OSError as e:
+        raise ModelServerError(f"모델 서버 인증 키를 읽을 수 없습니다 (MODEL_SERVER_AUTHKEY 또는 {key_path(socket_path)}): {e}")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """클라이언트가 만든 공유 메모리에 연결합니다 (해제 책임은 클라이언트)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # 3.12 이하는 연결만 해도 resource_tracker에 등록되어 서버 종료 시 클라이언트 버퍼를 지우므로 등록 해제
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+# ---------------------------------------------------------------------------
+# 클라이언트 (API 워커)
+# ---------------------------------------------------------------------------
+
+class _Channel:
+    """서버 연결 하나 + 그 연결 전용 공유 메모리 버퍼"""
+
+    def __init__(self, address: str, authkey: bytes):
+        try:
+            self.conn: Connection = Client(address, family="AF_UNIX", authkey=authkey)
+        except AuthenticationError as e:
+            raise ModelServerError(f"모델 서버 인증 실패 (키 불일치): {e}")
+        self.shm: Optional[shared_memory.SharedMemory] = None
+
+    def buffer(self, nbytes: int) -> shared_memory.SharedMemory:
+        if self.shm is None or self.shm.size < nbytes:
+            self._release_buffer()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(nbytes, MIN_BUFFER_BYTES))
+        return self.shm
+
+    def _release_buffer(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        finally:
+            self._release_buffer()
+
+
+class ModelServerClient:
+    """
+    모델 서버 클라이언트. 동시 요청마다 채널(연결 + 버퍼)을 하나씩 대여하며, 반납된 채널은 재사용됩니다.
+    """
+
+    def __init__(self, address: str = MODEL_SERVER_SOCKET, authkey: Optional[bytes] = None, timeout: float = MODEL_SERVER_TIMEOUT):
+        self.address = address
+        self.authkey = authkey  # None이면 연결할 때마다 load_authkey (서버 재시작으로 키가 바뀔 수 있음)
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_Channel]" = queue.LifoQueue()
+        self._channels: List[_Channel] = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @contextmanager
+    def _channel(self) -> Iterator[_Channel]:
+        try:
+            channel = self._idle.get_nowait()
+        except queue.Empty:
+            channel = _Channel(self.address, self.authkey or load_authkey(self.address))
+            with self._lock:
+                self._channels.append(channel)
+        try:
+            yield channel
+        except BaseException:
+            # 응답을 다 읽지 못한 연결은 재사용할 수 없음
+            self._discard(channel)
+            raise
+        self._idle.put(channel)
+
+    def _discard(self, channel: _Channel) -> None:
+        with self._lock:
+            if channel in self._channels:
+                self._channels.remove(channel)
+        channel.close()
+
+    def call(self, op: str, array: Optional[np.ndarray] = None, **params: Any) -> Any:
+        """
+        요청 하나를 보내고 결과를 반환합니다.
+
+        Args:
+            op: 연산 이름 (classify, detect, list_classes, classifier_labels, ready, stats)
+            array: 공유 메모리로 넘길 입력 배열 (선택)
+            **params: 작은 부가 인자 (소켓으로 전송)
+
+        Raises:
+            ModelServerError: 서버가 처리에 실패했거나 응답 대기 시간을 넘김
+        """
+        request: Dict[str, Any] = {"op": op, **params}
+        with self._channel() as channel:
+            if array is not None:
+                array = np.ascontiguousarray(array)
+                shm = channel.buffer(array.nbytes)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                request.update(shm=shm.name, shape=array.shape, dtype=array.dtype.str)
+            channel.conn.send(request)
+            if not channel.conn.poll(self.timeout):
+                raise ModelServerError(f"모델 서버 응답 대기 시간 초과 ({self.timeout}초, op={op})")
+            reply = channel.conn.recv()
+        if not reply["ok"]:
+            raise ModelServerError(reply["error"])
+        return reply["result"]
+
+    def close(self) -> None:
+        with self._lock:
+            channels, self._channels = self._channels, []
+        for channel in channels:
+            try:
+                channel.close()
+            except Exception:
+                pass
+
+
+_client: Optional[ModelServerClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ModelServerClient:
+    """프로세스 공용 클라이언트 (연결은 첫 요청 시)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ModelServerClient()
+        return _client
+
+
+def wait_until_ready(model: str, timeout: float = MODEL_SERVER_READY_TIMEOUT) -> None:
+    """
+    모델 서버가 model의 로드/워밍을 마칠 때까지 기다립니다 (API 워커의 사전 로드 단계).
+
+    Raises:
+        RuntimeError: 서버에서 모델 로드가 실패했거나, timeout 안에 서버가 준비되지 않음
+    """
+    deadline = time.monotonic() + timeout
+    last_error = None
+    while time.monotonic() < deadline:
+        try:
+            status = get_client().call("ready")["models"][model]
+            if status["state"] == "ready":
+                return
+            if status["state"] in ("failed", "skipped"):
+                raise RuntimeError(f"모델 서버에서 {model} 사용 불가: {status['detail']}")
+        except (OSError, EOFError, ModelServerError) as e:
+            last_error = e  # 서버가 아직 시작 중
+        time.sleep(1.0)
+    raise RuntimeError(f"모델 서버 준비 대기 시간 초과 ({timeout}초): {last_error}")
+
+
+class RemoteDetector:
+    """inference.PlantDiseaseDetector와 같은 인터페이스로 모델 서버의 감지 모델을 호출합니다."""
+
+    def __init__(self, client: ModelServerClient):
+        self._client = client
+        self._loaded = False
+
+    @property
+    def disease_model(self) -> Optional[bool]:
+        """서버에서 감지 모델이 준비되었으면 True (main.py의 로드 여부 확인용, 준비된 뒤에는 캐시)"""
+        if not self._loaded:
+            try:
+                self._loaded = self._client.call("ready")["models"]["detector"]["state"] == "ready"
+            except Exception:
+                return None
+        return True if self._loaded else None
+
+    def detect(self, image_path: str, conf_threshold: float = 0.01, filter_by_confidence: bool = True) -> Dict:
+        from PIL import Image, ImageOps
+
+        try:
+            # cv2.imread와 같은 형식 (EXIF 회전 적용, BGR uint8)
+            with Image.open(image_path) as img:
+                rgb = np.asarray(ImageOps.exif_transpose(img).convert("RGB"))
+        except OSError as e:
+            raise ValueError(f"이미지를 로드할 수 없습니다: {image_path}") from e
+        return self._client.call(
+            "detect", rgb[:, :, ::-1],
+            conf_threshold=conf_threshold, filter_by_confidence=filter_by_confidence,
+        )
+
+    def list_classes(self) -> List[Any]:
+        return [tuple(pair) for pair in self._client.call("list_classes")]
+
+
+_remote_detector: Optional[RemoteDetector] = None
+
+
+def get_remote_detector() -> RemoteDetector:
+    global _remote_detector
+    if _remote_detector is None:
+        _remote_detector = RemoteDetector(get_client())
+    return _remote_detector
+
+
+# ---------------------------------------------------------------------------
+# 서버
+# ---------------------------------------------------------------------------
+
+# 모델별 추론 락 (YOLO predictor는 스레드 안전하지 않음, 서로 다른 모델은 동시에 실행)
+_model_locks = {name: threading.Lock() for name in SERVED_MODELS}
+_server_stats = {"connections": 0, "requests": 0, "errors": 0, "shm_bytes": 0}
+_server_stats_lock = threading.Lock()
+
+
+def _record(**deltas) -> None:
+    with _server_stats_lock:
+        for k, v in deltas.items():
+            _server_stats[k] += v
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _dispatch(request: Dict[str, Any], array: Optional[np.ndarray]) -> Any:
+    op = request["op"]
+    if op == "classify":
+        from app.services.classifier import classify_array
+        with _model_locks["classifier"]:
+            return classify_array(array, k=int(request.get("k", 3)))
+    if op == "detect":
+        from inference import get_detector
+        with _model_locks["detector"]:
+            return get_detector().detect_image(
+                array,
+                conf_threshold=float(request.get("conf_threshold", 0.01)),
+                filter_by_confidence=bool(request.get("filter_by_confidence", True)),
+            )
+    if op == "list_classes":
+        from inference import get_detector
+        return get_detector().list_classes()
+    if op == "classifier_labels":
+        from app.services.classifier import get_classifier_labels
+        return get_classifier_labels()
+    if op == "ready":
+        from app.services import preload
+        return preload.readiness()
+    if op == "stats":
+        with _server_stats_lock:
+            return {"pid": os.getpid(), "rss_mb": _rss_mb(), **_server_stats}
+    raise ValueError(f"알 수 없는 op: {op}")
+
+
+def _handle(conn: Connection) -> None:
+    """연결 하나의 요청을 순서대로 처리합니다 (클라이언트는 응답을 받은 뒤에 버퍼를 다시 씀)."""
+    _record(connections=1)
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                break
+            array = None
+            try:
+                name = request.get("shm")
+                if name is not None:
+                    if name not in attached:
+                        # 클라이언트가 더 큰 버퍼로 바꿨으면 이전 버퍼 연결 해제
+                        for old in attached.values():
+                            old.close()
+                        attached = {name: _attach(name)}
+                    array = np.ndarray(tuple(request["shape"]), dtype=np.dtype(request["dtype"]), buffer=attached[name].buf)
+                    _record(shm_bytes=array.nbytes)
+                reply = {"ok": True, "result": _dispatch(request, array)}
+            except Exception as e:
+                _record(errors=1)
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            finally:
+                # 버퍼를 감싼 배열이 남아 있으면 close할 수 없으므로 응답 전에 참조 해제
+                del array
+            _record(requests=1)
+            conn.send(reply)
+    finally:
+        for shm in attached.values():
+            shm.close()
+        conn.close()
+
+
+def serve(socket_path: str = MODEL_SERVER_SOCKET, models: Optional[List[str]] = None) -> None:
+    """모델을 백그라운드로 사전 로드하고 Unix 소켓에서 요청을 받습니다 (준비 상태는 op=ready)."""
+    global _serving
+    if not socket_path:
+        raise SystemExit("--socket 또는 MODEL_SERVER_SOCKET을 지정하세요")
+    _serving = True
+    from app.services import preload
+
+    for path in (socket_path, key_path(socket_path)):
+        if os.path.exists(path):
+            os.unlink(path)
+    # 소켓과 키 파일을 처음부터 소유자 전용(0600)으로 생성 (bind 후 chmod하면 그 사이에 다른 사용자가 연결할 수 있음)
+    previous_umask = os.umask(0o077)
+    try:
+        if MODEL_SERVER_AUTHKEY:
+            authkey = MODEL_SERVER_AUTHKEY.encode("utf-8")
+        else:
+            authkey = secrets.token_hex(32).encode("ascii")
+            fd = os.open(key_path(socket_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(authkey)
+        listener = Listener(socket_path, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(previous_umask)
+    preload.start_preload(models or SERVED_MODELS)
+    print(f"[model_server] {socket_path} 대기 중 (모델: {', '.join(models or SERVED_MODELS)})")
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # 인증 실패 등은 해당 연결만 거절
+                print(f"[model_server] 연결 거절: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn,), name="model-server-conn", daemon=True).start()
+    finally:
+        listener.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분류/감지 모델 서버 (Unix 소켓 + 공유 메모리)")
+    parser.add_argument("--socket", default=MODEL_SERVER_SOCKET or "/tmp/seedai-models.sock")
+    parser.add_argument("--models", nargs="*", choices=SERVED_MODELS, help="보유할 모델 (기본: 전체)")
+    args = parser.parse_args()
+    serve(args.socket, args.models)
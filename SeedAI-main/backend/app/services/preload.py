@@ -0,0 +1,212 @@
+"""
+모델 사전 로드 / 준비 상태
+- 서버 시작 시 활성화된 모델(감지 YOLO, 분류 ViT, 로컬 llama 풀)을 백그라운드 스레드에서 동시에 로드하고,
+  각각 더미 입력으로 추론을 한 번 실행해 첫 사용자 요청이 로드/초기화 비용을 떠안지 않도록 함
+- 모델별 상태: pending → loading → warming → ready, 실패 시 failed, 비활성/해당 없음이면 skipped
+- /api/ready가 이 상태를 그대로 보여주며, 모든 모델이 끝난 상태(ready/failed/skipped)가 되면 준비 완료
+  → 로드밸런서는 준비 완료된 프로세스에만 트래픽을 보냄 (실패한 모델은 지금처럼 해당 기능만 503/폴백)
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PENDING, LOADING, WARMING, READY, FAILED, SKIPPED = "pending", "loading", "warming", "ready", "failed", "skipped"
+_SETTLED = {READY, FAILED, SKIPPED}
+
+
+@dataclass
+class ModelStatus:
+    """모델 하나의 사전 로드 상태"""
+    state: str = PENDING
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    detail: Optional[str] = None  # 실패 사유 또는 생략 사유
+
+
+# 모델별 (로드, 워밍 추론) 단계. 로드가 None을 반환하면 워밍 없이 ready
+# (MODEL_SERVER_SOCKET 사용 시 감지/분류는 모델 서버가 로드/워밍을 마칠 때까지 기다리기만 함)
+def _load_detector() -> Any:
+    from app.services import model_server
+
+    if model_server.enabled():
+        model_server.wait_until_ready("detector")
+        return None
+    from inference import get_detector
+
+    det = get_detector()
+    if getattr(det, "disease_model", None) is None:
+        raise RuntimeError(f"감지 모델 파일 없음: {det.disease_model_path}")
+    return det
+
+
+def _warm_detector(det: Any) -> None:
+    if det is None:
+        return
+    import numpy as np
+
+    det.disease_model.predict(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+
+
+def _load_classifier() -> Any:
+    from app.services import classifier, model_server
+
+    if model_server.enabled():
+        model_server.wait_until_ready("classifier")
+        return None
+    classifier.load_classifier()
+    return classifier
+
+
+def _warm_classifier(classifier: Any) -> None:
+    if classifier is not None:
+        classifier.warmup_classifier()
+
+
+def _load_llama() -> Any:
+    from app.services import llama_pool
+
+    if not llama_pool.preload():
+        raise RuntimeError(f"llama.cpp 풀 로드 실패: {llama_pool.LLM_MODEL_PATH}")
+    return llama_pool
+
+
+def _warm_llama(_pool_module: Any) -> None:
+    from app.services.textgen_adapter import warmup_local_llm
+
+    warmup_local_llm()
+
+
+def _skip_reason(name: str) -> Optional[str]:
+    """사전 로드하지 않을 모델이면 사유를 반환합니다."""
+    if name == "detector":
+        import importlib.util
+        from app.services import model_server
+        if model_server.enabled():
+            return None
+        return None if importlib.util.find_spec("inference") else "inference 모듈 없음"
+    if name == "llama":
+        from app.services.textgen_adapter import local_llm_available, uses_worker
+        if uses_worker():
+            return "llm_worker 프로세스가 모델 보유"
+        return None if local_llm_available() else "LLM_PROVIDER가 llama_cpp가 아니거나 모델 파일 없음"
+    return None
+
+
+_MODELS: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {
+    "detector": (_load_detector, _warm_detector),
+    "classifier": (_load_classifier, _warm_classifier),
+    "llama": (_load_llama, _warm_llama),
+}
+
+_status: Dict[str, ModelStatus] = {name: ModelStatus() for name in _MODELS}
+_status_lock = threading.Lock()
+_started_at: Optional[float] = None
+_finished_at: Optional[float] = None
+_thread: Optional[threading.Thread] = None
+
+
+def _set(name: str, **fields) -> None:
+    with _status_lock:
+        for key, value in fields.items():
+            setattr(_status[name], key, value)
+
+
+def _preload_one(name: str) -> None:
+    load, warm = _MODELS[name]
+    _set(name, state=LOADING)
+    start = time.perf_counter()
+    try:
+        loaded = load()
+        _set(name, state=WARMING, load_seconds=time.perf_counter() - start)
+        start = time.perf_counter()
+        warm(loaded)
+        _set(name, state=READY, warmup_seconds=time.perf_counter() - start)
+        print(f"[preload] {name} 준비 완료")
+    except Exception as e:
+        _set(name, state=FAILED, detail=f"{type(e).__name__}: {e}")
+        print(f"[preload] {name} 사전 로드 실패: {e}")
+
+
+def run_preload(models: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    활성화된 모델을 스레드마다 하나씩 동시에 로드/워밍하고 끝날 때까지 기다립니다.
+
+    Args:
+        models: 대상 모델 이름 (None이면 전체)
+
+    Returns:
+        Dict[str, Any]: readiness() 결과
+    """
+    global _started_at, _finished_at
+    _started_at, _finished_at = time.time(), None
+    targets = []
+    for name in _MODELS:
+        reason = "사전 로드 대상 아님" if models and name not in models else _skip_reason(name)
+        if reason:
+            _set(name, state=SKIPPED, detail=reason)
+        else:
+            targets.append(name)
+    if targets:
+        # 모델 로드는 대부분 네이티브 코드(파일 읽기, 가중치 변환)라 GIL을 놓으므로 스레드로도 겹쳐짐
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="preload") as executor:
+            list(executor.map(_preload_one, targets))
+    _finished_at = time.time()
+    return readiness()
+
+
+def load_weights(models: List[str]) -> List[str]:
+    """
+    워밍 없이 가중치만 동시에 로드합니다 (pre-fork 런처의 부모 프로세스용). 반환: 로드한 모델 이름
+    워밍 추론은 torch(OpenMP) 스레드 풀을 만드는데 fork한 자식에는 그 스레드가 없으므로,
+    워커가 시작 시 run_preload로 수행합니다 (이미 로드된 모델은 로드 단계가 바로 끝남). 상태는 바꾸지 않습니다.
+    """
+    from app.services import model_server
+
+    targets = [
+        name for name in models
+        if not _skip_reason(name) and not (model_server.enabled() and name in model_server.SERVED_MODELS)
+    ]
+
+    def load(name: str) -> Optional[str]:
+        try:
+            _MODELS[name][0]()
+            return name
+        except Exception as e:
+            print(f"[preload] {name} 가중치 로드 실패: {e}")
+            return None
+
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="preload") as executor:
+        return [name for name in executor.map(load, targets) if name]
+
+
+def start_preload(models: Optional[List[str]] = None) -> threading.Thread:
+    """run_preload를 백그라운드 스레드에서 시작합니다 (서버 시작을 막지 않음, 이미 실행 중이면 그 스레드 반환)."""
+    global _thread
+    with _status_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=run_preload, args=(models,), name="model-preload", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def skip_all(reason: str) -> None:
+    """사전 로드를 하지 않는 설정일 때 모든 모델을 skipped로 표시합니다 (첫 사용 시 로드)."""
+    for name in _MODELS:
+        _set(name, state=SKIPPED, detail=reason)
+
+
+def readiness() -> Dict[str, Any]:
+    """모델별 상태와 전체 준비 여부 (ready: 모든 모델이 ready/failed/skipped, degraded: 실패한 모델 있음)"""
+    with _status_lock:
+        models = {name: asdict(status) for name, status in _status.items()}
+    return {
+        "ready": all(m["state"] in _SETTLED for m in models.values()),
+        "degraded": any(m["state"] == FAILED for m in models.values()),
+        "started_at": _started_at,
+        "finished_at": _finished_at,
+        "models": models,
+    }
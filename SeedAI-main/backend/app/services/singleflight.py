@@ -0,0 +1,84 @@
+"""
+Single-flight 요청 병합
+- 동일한 키로 동시에 들어온 호출은 첫 호출(리더)만 실제로 실행
+- 나머지 호출은 리더의 결과(또는 예외)를 그대로 공유
+- 완료 후 키를 제거하므로 캐시가 아닌 "진행 중 요청" 병합 용도
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """진행 중인 호출 한 건"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키 단위로 동시 호출을 하나로 합치는 그룹"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn을 실행합니다.
+
+        Args:
+            key: 요청 식별 키 (동일 요청이면 동일 키)
+            fn: 실제 호출 함수
+
+        Returns:
+            fn의 반환값 (동시 호출자 모두 같은 객체를 공유)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """실행/병합 횟수와 현재 진행 중인 키 수"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+def request_key(**params: Any) -> str:
+    """요청 파라미터를 정규화(JSON, 키 정렬)하여 해시 키를 만듭니다."""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# LLM 호출 공용 그룹 (llm_gateway)
+llm_flight = SingleFlight()
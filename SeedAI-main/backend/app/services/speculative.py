@@ -0,0 +1,73 @@
+"""
+로컬 llama.cpp 생성용 speculative decoding 설정
+- prompt_lookup: 프롬프트/생성 이력에서 n-gram이 일치하는 다음 토큰을 초안으로 사용 (추가 모델 없음)
+- draft: 작은 GGUF 모델(예: Qwen2.5-0.5B)이 greedy로 초안 토큰을 생성
+- 본 모델이 초안을 한 번의 배치로 검증하므로 greedy(temperature=0)에서는 일반 디코딩과 출력이 같음
+
+환경 변수:
+    LLM_SPECULATIVE=none|prompt_lookup|draft
+    LLM_DRAFT_MODEL_PATH=./models/Qwen2.5-0.5B-Instruct-Q4_K_M.gguf
+    LLM_DRAFT_TOKENS=10     (초안 토큰 수, draft 모드는 4 내외 권장)
+"""
+import itertools
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+LLM_SPECULATIVE = os.getenv("LLM_SPECULATIVE", "none")
+LLM_DRAFT_MODEL_PATH = os.getenv("LLM_DRAFT_MODEL_PATH", "./models/Qwen2.5-0.5B-Instruct-Q4_K_M.gguf")
+LLM_DRAFT_TOKENS = int(os.getenv("LLM_DRAFT_TOKENS", "10"))
+
+try:
+    from llama_cpp.llama_speculative import LlamaDraftModel
+except ImportError:  # llama-cpp-python 미설치 시에도 모듈 import는 가능하도록
+    LlamaDraftModel = object
+
+
+class GGUFDraftModel(LlamaDraftModel):
+    """
+    작은 GGUF 모델을 초안 생성기로 사용하는 LlamaDraftModel.
+    Llama.generate(reset=True)가 이전 호출과 공통된 prefix의 KV를 재사용하므로
+    초안 모델은 매 호출마다 새로 추가된 토큰만 평가합니다.
+    """
+
+    def __init__(self, model_path: str, num_pred_tokens: int = 4, n_ctx: int = 4096, n_threads: Optional[int] = None):
+        from llama_cpp import Llama
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+        self.num_pred_tokens = num_pred_tokens
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs: Any) -> np.ndarray:
+        tokens = self.llm.generate(input_ids.tolist(), temp=0.0, top_k=1, reset=True)
+        drafted = list(itertools.islice(tokens, self.num_pred_tokens))
+        tokens.close()
+        return np.array(drafted, dtype=np.intc)
+
+
+def make_draft_model(
+    mode: str = LLM_SPECULATIVE,
+    n_threads: Optional[int] = None,
+    draft_model_path: str = LLM_DRAFT_MODEL_PATH,
+    num_pred_tokens: int = LLM_DRAFT_TOKENS
+) -> Optional[Any]:
+    """
+    Llama(draft_model=...)에 넘길 초안 생성기를 만듭니다. 컨텍스트마다 별도 인스턴스가 필요합니다.
+
+    Args:
+        mode: "none" | "prompt_lookup" | "draft"
+        n_threads: 초안 모델 스레드 수 (draft 모드)
+        draft_model_path: 초안 GGUF 모델 경로 (draft 모드)
+        num_pred_tokens: 한 번에 제안할 초안 토큰 수
+
+    Returns:
+        LlamaDraftModel 또는 None (비활성/초안 모델 파일 없음)
+    """
+    if mode == "prompt_lookup":
+        from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+        return LlamaPromptLookupDecoding(num_pred_tokens=num_pred_tokens)
+    if mode == "draft":
+        if not os.path.exists(draft_model_path):
+            print(f"[speculative] 초안 모델 파일 없음, speculative decoding 비활성화: {draft_model_path}")
+            return None
+        return GGUFDraftModel(draft_model_path, num_pred_tokens=num_pred_tokens, n_threads=n_threads)
+    return None
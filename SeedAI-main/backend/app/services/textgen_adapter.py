@@ -1,8 +1,17 @@
-
 from __future__ import annotations
+import json
 import os
-from typing import List
+from contextlib import ExitStack
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.services.cache_store import PersistentCache
+from app.services.llama_pool import get_pool
+from app.services.singleflight import SingleFlight, request_key
+from app.services.speculative import LLM_SPECULATIVE
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "none")  # 기본값을 "none"으로 변경하여 LLM 비활성화
 LLM_MODEL_PATH = os.getenv("LLM_MODEL_PATH", "./models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf")
@@ -10,25 +19,91 @@ LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "512"))
 LLM_THREADS = int(os.getenv("LLM_THREADS", str(os.cpu_count() or 4)))
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.6"))
 LLM_TIMEOUT = int(os.getenv("LLM_TIMEOUT", "10"))  # LLM 호출 타임아웃 (초, 기본 10초)
+LLM_QUEUE_SIZE = int(os.getenv("LLM_QUEUE_SIZE", "4"))  # 대기 + 실행 중 생성 상한 (초과 시 즉시 거절)
+LLM_CHAT_FORMAT = os.getenv("LLM_CHAT_FORMAT", "chatml")  # Qwen2.5 = ChatML
+LLM_PREFIX_CACHE = os.getenv("LLM_PREFIX_CACHE", "1") == "1"  # 고정 프롬프트 prefix의 KV 상태 재사용
+LLM_WORKER_URL = os.getenv("LLM_WORKER_URL", "").rstrip("/")  # 설정 시 llm_worker 프로세스에 생성 위임 (모델 공유)
+
+# 성장 분석 프롬프트의 고정 부분 (식물명/수치가 들어가지 않으므로 KV 상태를 재사용할 수 있음)
+GROWTH_SYSTEM_PROMPT = "당신은 한국어로 간결하게 조언하는 원예 보조가이드입니다."
+GROWTH_INSTRUCTION = (
+    "아래 데이터(식물명, 성장시나리오)로 8~12문장 내 "
+    "해당 식물의 월별 성장 경향 요약, 관리 팁 4개, 주의사항 3개를 bullet로 제시하세요.\n"
+    "한국어로 짧고 실무적으로 쓰며, 불필요한 수식어는 피하고, 동일한 사실 반복 금지.\n"
+    "섹션 제목은 '요약', '관리 팁', '주의할 점'을 사용하세요.\n\n"
+)
+
+
+class LocalLLMBusy(RuntimeError):
+    """로컬 생성 대기열이 가득 참"""
+
+
+# 대기 + 실행 중인 로컬 생성 수 제한 (슬롯은 생성 스레드가 실제로 끝날 때 반환)
+_generation_slots = threading.BoundedSemaphore(LLM_QUEUE_SIZE)
+_generation_stats_lock = threading.Lock()
+_generation_stats = {
+    "started": 0, "completed": 0, "failed": 0, "timed_out": 0, "rejected": 0,
+    "in_flight": 0, "cancel_seconds_total": 0.0,
+    "prefix_hits": 0, "prefix_misses": 0,
+}
+
 
+def _record_generation(**deltas) -> None:
+    with _generation_stats_lock:
+        for k, v in deltas.items():
+            _generation_stats[k] += v
+
+
+def generation_stats() -> Dict[str, float]:
+    """로컬 생성 통계 (시작/완료/실패/타임아웃/거절, 중단까지 걸린 누적 시간, prefix 캐시 적중)"""
+    with _generation_stats_lock:
+        return {**_generation_stats, "queue_size": LLM_QUEUE_SIZE}
+
+
+def _llm_call_with_timeout(pool, generate, timeout):
+    """
+    풀에서 컨텍스트를 대여해 generate(llm, stopping_criteria) -> str 을 타임아웃과 함께 실행.
+    타임아웃 시 중단 플래그를 세우고, 생성 스레드는 다음 토큰에서 stopping_criteria로 멈춥니다.
+    """
+    if not _generation_slots.acquire(blocking=False):
+        _record_generation(rejected=1)
+        raise LocalLLMBusy(f"로컬 LLM 대기열이 가득 찼습니다 (LLM_QUEUE_SIZE={LLM_QUEUE_SIZE})")
 
-def _llm_call_with_timeout(llm, messages, max_tokens, temperature, timeout):
-    """LLM 호출을 타임아웃과 함께 실행"""
     result = [None]
     exception = [None]
-    
+    abort = threading.Event()
+    aborted_at = [None]
+
+    def should_stop(input_ids, logits) -> bool:
+        return abort.is_set()
+
     def target():
         try:
-            out = llm.create_chat_completion(
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            content = out["choices"][0]["message"]["content"].strip()
-            if content and len(content) > 20:
+            from llama_cpp import StoppingCriteriaList
+
+            # 컨텍스트는 생성이 실제로 끝난 뒤 이 스레드가 반납
+            with pool.checkout(timeout=timeout) as llm:
+                if abort.is_set():
+                    # 컨텍스트를 기다리는 동안 타임아웃 → 생성하지 않음
+                    return
+                _record_generation(started=1, in_flight=1)
+                try:
+                    content = generate(llm, StoppingCriteriaList([should_stop]))
+                finally:
+                    _record_generation(in_flight=-1)
+            if abort.is_set():
+                return
+            if content:
                 result[0] = content
+            _record_generation(completed=1)
         except Exception as e:
             exception[0] = e
+            _record_generation(failed=1)
+        finally:
+            if aborted_at[0] is not None:
+                # 타임아웃 이후 실제로 CPU를 놓기까지 걸린 시간
+                _record_generation(cancel_seconds_total=time.monotonic() - aborted_at[0])
+            _generation_slots.release()
     
     thread = threading.Thread(target=target)
     thread.daemon = True
@@ -36,8 +111,11 @@ def _llm_call_with_timeout(llm, messages, max_tokens, temperature, timeout):
     thread.join(timeout=timeout)
     
     if thread.is_alive():
-        # 타임아웃 발생
-        print(f"[textgen_adapter] LLM 호출 타임아웃 ({timeout}초 초과)")
+        # 타임아웃 발생 → 생성 중단 요청
+        aborted_at[0] = time.monotonic()
+        abort.set()
+        _record_generation(timed_out=1)
+        print(f"[textgen_adapter] LLM 호출 타임아웃 ({timeout}초 초과), 생성 중단")
         return None
     
     if exception[0]:
@@ -46,56 +124,475 @@ def _llm_call_with_timeout(llm, messages, max_tokens, temperature, timeout):
     return result[0]
 
 
-def render_plant_analysis(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> str:
+def local_llm_available() -> bool:
+    """로컬 llama.cpp 모델을 사용할 수 있는지 여부 (LLM_PROVIDER=llama_cpp, 워커 URL 또는 모델 파일 존재)"""
+    return LLM_PROVIDER == "llama_cpp" and (bool(LLM_WORKER_URL) or os.path.exists(LLM_MODEL_PATH))
+
+
+def uses_worker() -> bool:
+    """생성을 별도 llm_worker 프로세스에 맡기는지 여부 (이 경우 프로세스 내 풀을 로드하지 않음)"""
+    return bool(LLM_WORKER_URL)
+
+
+def _worker_completion(prompt: str, max_tokens: int, temperature: float, timeout: float) -> Optional[str]:
+    """llm_worker의 /generate를 호출합니다. 워커가 배치 디코딩과 타임아웃 중단을 담당합니다."""
+    import httpx
+
+    _record_generation(started=1, in_flight=1)
+    try:
+        resp = httpx.post(
+            f"{LLM_WORKER_URL}/generate",
+            json={"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "timeout": timeout},
+            timeout=timeout + 5.0,
+            trust_env=False,
+        )
+    except Exception:
+        _record_generation(failed=1)
+        raise
+    finally:
+        _record_generation(in_flight=-1)
+    if resp.status_code == 503:
+        _record_generation(rejected=1)
+        raise LocalLLMBusy("llm_worker 대기열이 가득 찼습니다")
+    resp.raise_for_status()
+    data = resp.json()
+    if data["finish_reason"] == "timeout":
+        _record_generation(timed_out=1)
+        print(f"[textgen_adapter] llm_worker 생성 타임아웃 ({timeout}초 초과)")
+        return None
+    if data.get("error"):
+        _record_generation(failed=1)
+        raise RuntimeError(f"llm_worker 오류: {data['error']}")
+    _record_generation(completed=1)
+    return data["text"].strip() or None
+
+
+def _chatml(messages: List[Dict[str, str]]) -> str:
+    """messages를 ChatML 프롬프트 문자열로 변환합니다 (assistant 응답 시작 토큰 포함)."""
+    parts = [f"<|im_start|>{m['role']}\n{m['content']}<|im_end|>\n" for m in messages]
+    return "".join(parts) + "<|im_start|>assistant\n"
+
+
+def _growth_prefix() -> str:
+    """성장 분석 프롬프트의 고정 prefix (ChatML, system + 지시문)"""
+    return f"<|im_start|>system\n{GROWTH_SYSTEM_PROMPT}<|im_end|>\n<|im_start|>user\n{GROWTH_INSTRUCTION}"
+
+
+# KV 상태를 저장해 둘 고정 prefix 목록
+_CACHEABLE_PREFIXES = [_growth_prefix()]
+# (컨텍스트 id, prefix) → prefix까지 평가한 LlamaState (풀 컨텍스트는 프로세스 수명 동안 유지됨)
+_prefix_states: Dict[Tuple[int, str], object] = {}
+_prefix_states_lock = threading.Lock()
+
+
+def _restore_prefix(llm, prefix: str) -> None:
     """
-    식물 성장 분석 텍스트 생성. LLM 사용 시도 후 실패 시 템플릿 폴백으로 항상 텍스트 반환.
+    prefix까지 평가된 KV 상태를 컨텍스트에 복원합니다. 처음이면 prefix를 평가한 뒤 상태를 저장합니다.
+    이후 create_completion은 복원된 토큰과 공통 prefix를 건너뛰고 나머지만 평가합니다.
     """
-  # LLM_PROVIDER가 "none"이거나 모델 파일이 없으면 즉시 템플릿 폴백 사용
-    if LLM_PROVIDER == "none" or not os.path.exists(LLM_MODEL_PATH):
-        print(f"[textgen_adapter] LLM 비활성화됨 (LLM_PROVIDER={LLM_PROVIDER}, 모델파일존재={os.path.exists(LLM_MODEL_PATH)})")
-    elif LLM_PROVIDER == "llama_cpp":      
-        try:
-            from llama_cpp import Llama
-            print(f"[textgen_adapter] LLM 모델 로드 시도: {LLM_MODEL_PATH}")
-            llm = Llama(model_path=LLM_MODEL_PATH, n_ctx=4096, n_threads=LLM_THREADS, verbose=False)
-            print(f"[textgen_adapter] LLM 모델 로드 완료")
-            
-            messages = [
-                {"role":"system","content":"당신은 한국어로 간결하게 조언하는 원예 보조가이드입니다."},
-                {"role":"user","content": (
-                    "아래 데이터(식물명, 성장시나리오)로 8~12문장 내 "
-                    f"{plant_name}의 월별 성장 경향 요약, 관리 팁 4개, 주의사항 3개를 bullet로 제시하세요.\n"
-                    f"- 식물명: {plant_name}\n"
-                    f"- 단위: {unit}, 기간: {periods}\n"
-                    f"- 초기 높이: {start_cm} cm\n"
-                    f"- 상한(추정 K): {K} cm\n"
-                    f"- 좋은 성장(연속값): {good_series}\n"
-                    f"- 나쁜 성장(연속값): {bad_series}\n"
-                    "한국어로 짧고 실무적으로 쓰며, 불필요한 수식어는 피하고, 동일한 사실 반복 금지.\n"
-                    "섹션 제목은 '요약', '관리 팁', '주의할 점'을 사용하세요."
-                )}
-            ]
-            
-            print(f"[textgen_adapter] LLM 생성 호출 (타임아웃: {LLM_TIMEOUT}초)")
-            content = _llm_call_with_timeout(
-                llm, messages, LLM_MAX_TOKENS, LLM_TEMPERATURE, LLM_TIMEOUT
-            )
-            
+    key = (id(llm), prefix)
+    with _prefix_states_lock:
+        state = _prefix_states.get(key)
+    if state is not None:
+        llm.load_state(state)
+        _record_generation(prefix_hits=1)
+        return
+    llm.reset()
+    llm.eval(llm.tokenize(prefix.encode("utf-8"), special=True))
+    state = llm.save_state()
+    with _prefix_states_lock:
+        _prefix_states[key] = state
+    _record_generation(prefix_misses=1)
+
+
+def _cacheable_prefix(prompt: Optional[str], json_mode: bool) -> Optional[str]:
+    """prompt가 등록된 고정 prefix로 시작하면 그 prefix를 반환합니다."""
+    # speculative decoding 사용 시 컨텍스트가 전체 logits를 보관하므로 상태 저장이 매우 커져 prefix 캐시를 쓰지 않음
+    if not LLM_PREFIX_CACHE or LLM_SPECULATIVE != "none" or prompt is None or json_mode:
+        return None
+    return next((p for p in _CACHEABLE_PREFIXES if prompt.startswith(p)), None)
+
+
+def warmup_local_llm() -> int:
+    """
+    풀의 모든 컨텍스트를 대여해 고정 prefix의 KV 상태를 미리 계산합니다 (첫 성장 분석 요청의 prefix 평가 제거).
+    prefix 캐시를 쓰지 않는 설정이면 짧은 프롬프트만 평가합니다. 반환: 워밍한 컨텍스트 수
+    """
+    pool = get_pool()
+    prefixes = [p for p in _CACHEABLE_PREFIXES if _cacheable_prefix(p, json_mode=False)]
+    with ExitStack() as stack:
+        contexts = [stack.enter_context(pool.checkout()) for _ in range(pool.size)]
+        for llm in contexts:
+            for prefix in prefixes:
+                _restore_prefix(llm, prefix)
+            if not prefixes:
+                llm.reset()
+                llm.eval(llm.tokenize(_chatml([{"role": "user", "content": "안녕하세요"}]).encode("utf-8"), special=True))
+                llm.reset()
+    return len(contexts)
+
+
+# JSON 스키마 → GBNF 문법 문자열 (변환은 스키마당 한 번, LlamaGrammar는 상태를 가지므로 호출마다 생성)
+_gbnf_cache: Dict[str, str] = {}
+_gbnf_cache_lock = threading.Lock()
+
+
+def _grammar_for(json_schema: Dict[str, Any]):
+    """JSON 스키마를 강제하는 LlamaGrammar를 만듭니다."""
+    from llama_cpp import LlamaGrammar
+    from llama_cpp.llama_grammar import json_schema_to_gbnf
+
+    key = json.dumps(json_schema, sort_keys=True, ensure_ascii=False)
+    with _gbnf_cache_lock:
+        gbnf = _gbnf_cache.get(key)
+    if gbnf is None:
+        gbnf = json_schema_to_gbnf(key)
+        with _gbnf_cache_lock:
+            _gbnf_cache[key] = gbnf
+    return LlamaGrammar.from_string(gbnf, verbose=False)
+
+
+def _json_grammar(json_schema: Optional[Dict[str, Any]], json_mode: bool):
+    """json_schema면 스키마 문법, json_mode면 일반 JSON 문법, 둘 다 아니면 None"""
+    if json_schema is not None:
+        return _grammar_for(json_schema)
+    if json_mode:
+        from llama_cpp import LlamaGrammar
+        from llama_cpp.llama_grammar import JSON_GBNF
+        return LlamaGrammar.from_string(JSON_GBNF, verbose=False)
+    return None
+
+
+def _chat_deltas(chunks, stopping_criteria) -> Iterator[str]:
+    """
+    create_chat_completion 스트림의 텍스트 조각을 반환합니다. create_chat_completion은 stopping_criteria를 받지 않으므로
+    조각마다 직접 확인하고, 참이 되면 스트림을 닫아 생성을 멈춥니다 (문법 제약 중에도 EOS 강제 없이 중단됨).
+    """
+    import numpy as np
+
+    empty = np.empty(0)
+    try:
+        for chunk in chunks:
+            content = chunk["choices"][0]["delta"].get("content")
             if content:
-                print(f"[textgen_adapter] LLM 생성 성공 ({len(content)} 문자)")
-                return content
-            else:
-                print(f"[textgen_adapter] LLM 생성 실패 또는 타임아웃, 템플릿 폴백 사용")
+                yield content
+            if stopping_criteria(empty, empty):
+                return
+    finally:
+        chunks.close()
 
 
+def _run_local(llm, messages, prompt, prefix, max_tokens, temperature, stopping_criteria, json_mode=False, stream=False, json_schema=None):
+    """
+    대여한 컨텍스트로 생성합니다. stream=False면 전체 텍스트, True면 텍스트 조각 iterator를 반환합니다.
+    ChatML 형식이면 프롬프트를 직접 렌더링해 create_completion을 호출합니다 (stopping_criteria로 타임아웃 중단).
+    prefix가 있으면 저장된 KV 상태를 먼저 복원해 나머지 부분만 평가합니다.
+    json_schema가 있으면 GBNF 문법으로 샘플링을 제한해 항상 스키마에 맞는 JSON을 생성합니다.
+    다른 형식의 모델은 create_chat_completion을 스트림으로 호출하고, 중단 시 스트림을 닫습니다.
+    """
+    grammar = _json_grammar(json_schema, json_mode)
+    if prompt is not None:
+        if prefix is not None:
+            _restore_prefix(llm, prefix)
+        out = llm.create_completion(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=["<|im_end|>"],
+            stopping_criteria=stopping_criteria,
+            grammar=grammar,
+            stream=stream,
+        )
+        if stream:
+            return (chunk["choices"][0]["text"] for chunk in out)
+        return out["choices"][0]["text"].strip()
+    chunks = llm.create_chat_completion(
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        grammar=grammar,
+        stream=True,
+    )
+    deltas = _chat_deltas(chunks, stopping_criteria)
+    if stream:
+        return deltas
+    return "".join(deltas).strip()
+
+
+def local_chat_completion(
+    messages: List[Dict[str, str]],
+    max_tokens: int = LLM_MAX_TOKENS,
+    temperature: float = LLM_TEMPERATURE,
+    timeout: float = LLM_TIMEOUT,
+    json_mode: bool = False,
+    json_schema: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """
+    로컬 llama.cpp 모델로 chat completion을 실행합니다 (llm_router의 llama_cpp 프로바이더).
+    모델은 매번 로드하지 않고 llama_pool에서 미리 로드된 컨텍스트를 대여합니다.
+    프롬프트가 등록된 고정 prefix로 시작하면 저장된 KV 상태를 복원해 나머지 부분만 평가합니다.
+    json_schema를 주면 스키마에서 만든 문법으로 생성을 제한합니다 (출력이 항상 파싱 가능).
+    LLM_WORKER_URL이 설정되어 있으면 llm_worker 프로세스(continuous batching)에 위임합니다.
+    타임아웃 시 생성을 중단하고 None을 반환합니다. 대기열이 가득 차면 LocalLLMBusy.
+    """
+    prompt = _chatml(messages) if LLM_CHAT_FORMAT == "chatml" else None
+    if LLM_WORKER_URL and prompt is not None:
+        # 워커는 프롬프트 문자열만 받으므로 json_mode/json_schema는 응답 검증(라우터 validate)에 맡김
+        print(f"[textgen_adapter] llm_worker 생성 호출 (타임아웃: {timeout}초)")
+        return _worker_completion(prompt, max_tokens, temperature, timeout)
+
+    prefix = _cacheable_prefix(prompt, json_mode or json_schema is not None)
+
+    def generate(llm, stopping_criteria) -> str:
+        return _run_local(
+            llm, messages, prompt, prefix, max_tokens, temperature, stopping_criteria,
+            json_mode=json_mode, json_schema=json_schema
+        )
+
+    print(f"[textgen_adapter] LLM 생성 호출 (타임아웃: {timeout}초, prefix 캐시: {prefix is not None})")
+    return _llm_call_with_timeout(get_pool(LLM_MODEL_PATH), generate, timeout)
+
+
+def local_chat_stream(
+    messages: List[Dict[str, str]],
+    max_tokens: int = LLM_MAX_TOKENS,
+    temperature: float = LLM_TEMPERATURE,
+    timeout: float = LLM_TIMEOUT
+) -> Iterator[str]:
+    """
+    local_chat_completion의 스트리밍 버전입니다. 호출 스레드에서 토큰 조각을 생성하는 즉시 반환합니다.
+    timeout이 지나면 다음 토큰에서 멈추고, 소비자가 중간에 닫으면(GeneratorExit) 생성을 멈추고 컨텍스트를 반납합니다.
+    llm_worker 사용 시에는 완성된 텍스트를 한 조각으로 반환합니다.
+    """
+    prompt = _chatml(messages) if LLM_CHAT_FORMAT == "chatml" else None
+    if LLM_WORKER_URL and prompt is not None:
+        text = _worker_completion(prompt, max_tokens, temperature, timeout)
+        if text:
+            yield text
+        return
+
+    if not _generation_slots.acquire(blocking=False):
+        _record_generation(rejected=1)
+        raise LocalLLMBusy(f"로컬 LLM 대기열이 가득 찼습니다 (LLM_QUEUE_SIZE={LLM_QUEUE_SIZE})")
+    deadline = time.monotonic() + timeout
+
+    def should_stop(input_ids, logits) -> bool:
+        return time.monotonic() > deadline
+
+    try:
+        from llama_cpp import StoppingCriteriaList
+
+        prefix = _cacheable_prefix(prompt, False)
+        with get_pool(LLM_MODEL_PATH).checkout(timeout=timeout) as llm:
+            _record_generation(started=1, in_flight=1)
+            deltas = _run_local(
+                llm, messages, prompt, prefix, max_tokens, temperature,
+                StoppingCriteriaList([should_stop]), stream=True
+            )
+            try:
+                for delta in deltas:
+                    if delta:
+                        yield delta
+            finally:
+                deltas.close()
+                _record_generation(in_flight=-1)
+        if time.monotonic() > deadline:
+            _record_generation(timed_out=1)
+        else:
+            _record_generation(completed=1)
+    except GeneratorExit:
+        raise
+    except Exception:
+        _record_generation(failed=1)
+        raise
+    finally:
+        _generation_slots.release()
+
+
+def _growth_messages(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> List[Dict[str, str]]:
+    """성장 분석 프롬프트 (고정 지시문 뒤에 요청별 데이터만 붙임 → 로컬 모델은 지시문까지의 KV 상태를 재사용)"""
+    return [
+        {"role":"system","content": GROWTH_SYSTEM_PROMPT},
+        {"role":"user","content": (
+            GROWTH_INSTRUCTION
+            + f"- 식물명: {plant_name}\n"
+            f"- 단위: {unit}, 기간: {periods}\n"
+            f"- 초기 높이: {start_cm} cm\n"
+            f"- 상한(추정 K): {K} cm\n"
+            f"- 좋은 성장(연속값): {good_series}\n"
+            f"- 나쁜 성장(연속값): {bad_series}"
+        )}
+    ]
+
+
+def _generate_analysis(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> Optional[str]:
+    """LLM(라우터)으로 성장 분석 텍스트를 생성합니다. 실패 시 None."""
+    from app.services.llm_router import NoProviderAvailable, get_router
+
+    def validate(text: str) -> None:
+        if len(text) <= 20:
+            raise ValueError("성장 요약이 너무 짧습니다")
+
+    try:
+        # 로컬 llama.cpp 우선, 느리거나 실패하면 라우터가 OpenAI로 폴백
+        result = get_router().complete(
+            "growth_summary",
+            _growth_messages(plant_name, K, start_cm, unit, periods, good_series, bad_series),
+            max_tokens=LLM_MAX_TOKENS,
+            temperature=LLM_TEMPERATURE,
+            timeout=LLM_TIMEOUT,
+            validate=validate,
+        )
+        print(f"[textgen_adapter] LLM 생성 성공 ({result.provider}, {len(result.text)} 문자)")
+        return result.text
+    except NoProviderAvailable as e:
+        print(f"[textgen_adapter] LLM 사용 실패, 템플릿 폴백 사용: {e}")
+        return None
+
+
+# --- 성장 분석 텍스트 캐시 ---
+# 입력(식물명, K, 시작 크기, 단위, 기간, 시계열)은 _seed_from_name으로 결정되므로 같은 입력 = 같은 분석
+# 프롬프트를 바꾸면 버전을 올려 이전 캐시를 무효화
+ANALYSIS_PROMPT_VERSION = "growth-v2"
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+_analysis_flight = SingleFlight()
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_analysis_cache() -> PersistentCache:
+    """성장 분석 텍스트 영속 캐시 (sqlite, TTL + LRU)"""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = PersistentCache(
+                "growth_analysis",
+                max_entries=settings.analysis_cache_max_entries,
+                ttl=settings.analysis_cache_ttl,
+            )
+        return _analysis_cache
+
+
+def analysis_cache_key(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> str:
+    """입력값 + 모델/프롬프트 버전의 정규화 해시"""
+    return request_key(
+        version=ANALYSIS_PROMPT_VERSION,
+        model=os.path.basename(LLM_MODEL_PATH),
+        max_tokens=LLM_MAX_TOKENS,
+        plant_name=plant_name, K=K, start_cm=start_cm, unit=unit, periods=periods,
+        good_series=list(good_series), bad_series=list(bad_series),
+    )
+
+
+def _generate_and_store(key: str, args: tuple) -> Optional[str]:
+    """LLM 생성 결과만 캐시에 저장합니다 (템플릿 폴백은 저장하지 않음)."""
+    text = _analysis_flight.do(key, lambda: _generate_analysis(*args))
+    if text:
+        get_analysis_cache().set(key, text)
+    return text
+
+
+def _schedule_refresh(key: str, args: tuple) -> None:
+    """기한이 지난 항목을 백그라운드에서 재생성합니다 (키당 1건)."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _generate_and_store(key, args)
         except Exception as e:
-            # LLM 실패 시 템플릿 폴백으로 계속 진행
-            print(f"[textgen_adapter] LLM 사용 실패, 템플릿 폴백 사용: {e}")
-            import traceback
-            traceback.print_exc()
-            pass
+            print(f"[textgen_adapter] 성장 분석 백그라운드 갱신 실패: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(refresh)
+
+
+def render_plant_analysis(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> str:
+    """
+    식물 성장 분석 텍스트 생성. LLM 사용 시도 후 실패 시 템플릿 폴백으로 항상 텍스트 반환.
+    LLM 결과는 입력 해시로 영속 캐시하며, 기한이 지난 항목은 즉시 반환하고 백그라운드에서 갱신합니다.
+    """
+    # LLM_PROVIDER가 "none"이면 즉시 템플릿 폴백 사용
+    if LLM_PROVIDER == "none":
+        print(f"[textgen_adapter] LLM 비활성화됨 (LLM_PROVIDER={LLM_PROVIDER})")
+        return template_plant_analysis(plant_name, K, start_cm, unit, periods, good_series, bad_series)
+
+    args = (plant_name, K, start_cm, unit, periods, good_series, bad_series)
+    key = analysis_cache_key(*args)
+    try:
+        entry = get_analysis_cache().get(key)
+    except Exception as e:
+        print(f"[textgen_adapter] 성장 분석 캐시 조회 실패: {e}")
+        entry = None
+    if entry is not None:
+        if entry.stale:
+            _schedule_refresh(key, args)
+        print(f"[textgen_adapter] 성장 분석 캐시 적중 (stale={entry.stale})")
+        return entry.value
+
+    text = _generate_and_store(key, args)
+    if text:
+        return text
+    # LLM 실패 시 템플릿 폴백
+    return template_plant_analysis(*args)
+
+
+def analysis_llm_enabled() -> bool:
+    """성장 분석에 LLM을 사용하는지 여부 (LLM_PROVIDER=none이면 템플릿만 사용)"""
+    return LLM_PROVIDER != "none"
+
+
+def stream_plant_analysis(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> Iterator[str]:
+    """
+    render_plant_analysis의 스트리밍 버전 (템플릿 폴백은 호출자가 담당).
+    캐시된 분석이 있으면 한 조각으로 반환하고, 없으면 라우터가 고른 프로바이더의 토큰을 그대로 전달합니다.
+    끝까지 생성된 텍스트만 캐시에 저장합니다.
+
+    Raises:
+        NoProviderAvailable: LLM 비활성 또는 모든 프로바이더가 첫 조각 전에 실패
+    """
+    from app.services.llm_router import NoProviderAvailable, get_router
+
+    if not analysis_llm_enabled():
+        raise NoProviderAvailable(f"LLM 비활성화됨 (LLM_PROVIDER={LLM_PROVIDER})")
+
+    args = (plant_name, K, start_cm, unit, periods, good_series, bad_series)
+    key = analysis_cache_key(*args)
+    try:
+        entry = get_analysis_cache().get(key)
+    except Exception as e:
+        print(f"[textgen_adapter] 성장 분석 캐시 조회 실패: {e}")
+        entry = None
+    if entry is not None:
+        if entry.stale:
+            _schedule_refresh(key, args)
+        yield entry.value
+        return
+
+    chunks = []
+    for delta in get_router().stream(
+        "growth_summary",
+        _growth_messages(*args),
+        max_tokens=LLM_MAX_TOKENS,
+        temperature=LLM_TEMPERATURE,
+        timeout=LLM_TIMEOUT,
+    ):
+        chunks.append(delta)
+        yield delta
+    text = "".join(chunks).strip()
+    if len(text) > 20:
+        get_analysis_cache().set(key, text)
+
 
-    # fallback (no LLM or LLM failed) - 항상 텍스트 반환 보장
+def template_plant_analysis(plant_name: str, K: float, start_cm: float, unit: str, periods: int, good_series: List[float], bad_series: List[float]) -> str:
+    """템플릿 기반 성장 분석 텍스트 (LLM 없이 항상 반환)"""
     tips = [
         "밝은 간접광을 유지하고 흙이 60~70% 마르면 충분히 관수하세요.",
         "배수력 유지(펄라이트/마사 혼합)와 통풍 확보가 중요합니다.",
@@ -0,0 +1,235 @@
+"""
+관리 가이드/번역 캐시 워머
+- 분류 모델의 id2label과 감지 모델의 클래스명을 열거하여 영속 캐시를 미리 채움
+  1) 분류 레이블 번역 (classifier.translate_to_korean)
+  2) 분류 레이블별 관리 가이드 (guide.generate_care_guide, 번역된 한국어 이름 기준)
+  3) 감지 클래스의 식물 종/병충해 번역 (llm_service 번역 캐시)
+- 설정된 LLM 프로바이더(llm_router)를 그대로 사용하며, 동시 호출 수는 settings.warmup_concurrency로 제한
+- 이미 캐시된 항목은 건너뛰고, 카테고리별 커버리지 리포트를 반환
+
+실행 (backend 디렉터리에서):
+    python -m app.services.warmup
+    python -m app.services.warmup --concurrency 8 --skip-detector
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.llm_router import get_router
+
+# 식별 신뢰도가 낮을 때 plant.py가 사용하는 가이드 이름
+GENERIC_GUIDE_NAME = "일반 관엽식물"
+# 감지 모델이 병충해가 아닌 상태에 붙이는 이름 (번역 불필요)
+_UNTRANSLATED_DISEASES = {"정상", "알 수 없음"}
+
+
+@dataclass
+class WarmupTask:
+    """캐시 항목 하나를 채우는 작업"""
+    category: str
+    item: str
+    cached: Callable[[], bool]   # 이미 (기한 내로) 캐시되어 있는지
+    run: Callable[[], Any]       # 캐시를 채우는 호출
+
+
+_last_report: Optional[Dict[str, Any]] = None
+_running = threading.Lock()
+
+
+def _classifier_translation_cached(name_en: str) -> bool:
+    from app.services import classifier
+    if name_en in classifier._translation_cache:
+        return True
+    entry = classifier.get_translation_cache().get(name_en)
+    return entry is not None and not entry.stale
+
+
+def _care_guide_cached(plant_name: str) -> bool:
+    from app.services import guide
+    entry = guide.get_care_guide_cache().get(guide.care_guide_cache_key(plant_name))
+    return entry is not None and not entry.stale
+
+
+def _classifier_tasks() -> List[List[WarmupTask]]:
+    """분류 레이블 번역 → 관리 가이드 (가이드는 번역 결과 이름을 쓰므로 단계를 나눔)"""
+    from app.services import classifier, guide
+
+    names = list(dict.fromkeys(classifier.format_plant_name(label) for label in classifier.get_classifier_labels()))
+    translations = [
+        WarmupTask(
+            "classifier_translation", name,
+            cached=lambda name=name: _classifier_translation_cached(name),
+            run=lambda name=name: classifier.translate_to_korean(name),
+        )
+        for name in names
+    ]
+
+    def guide_task(name_en: Optional[str], plant_name: Callable[[], str]) -> WarmupTask:
+        return WarmupTask(
+            "care_guide", name_en or GENERIC_GUIDE_NAME,
+            cached=lambda: (name_en is None or _classifier_translation_cached(name_en)) and _care_guide_cached(plant_name()),
+            run=lambda: guide.generate_care_guide(plant_name()),
+        )
+
+    guides = [guide_task(name, lambda name=name: classifier.translate_to_korean(name)) for name in names]
+    guides.append(guide_task(None, lambda: GENERIC_GUIDE_NAME))
+    return [translations, guides]
+
+
+def _detector_tasks() -> List[List[WarmupTask]]:
+    """감지 클래스의 식물 종/병충해 이름 번역"""
+    from llm_service import get_advisor
+    from app.services import model_server
+
+    if model_server.enabled():
+        detector = model_server.get_remote_detector()
+    else:
+        from inference import get_detector
+        detector = get_detector()
+    advisor = get_advisor()
+    classes = detector.list_classes()
+    items = {}
+    for species, disease in classes:
+        items[(species, "plant")] = None
+        if disease not in _UNTRANSLATED_DISEASES:
+            items[(disease, "disease")] = None
+
+    return [[
+        WarmupTask(
+            "detection_translation", f"{context}:{text}",
+            cached=lambda text=text, context=context: advisor.get_cached_translation(text, context) is not None,
+            run=lambda text=text, context=context: advisor.translate_to_korean(text, context=context),
+        )
+        for text, context in items
+    ]]
+
+
+def _run_stage(tasks: List[WarmupTask], concurrency: int, report: Dict[str, Dict[str, Any]]) -> None:
+    """캐시되지 않은 작업만 제한된 동시성으로 실행하고 카테고리별 결과를 집계합니다."""
+    pending = []
+    for task in tasks:
+        stats = report.setdefault(task.category, {"total": 0, "already_cached": 0, "warmed": 0, "missing": []})
+        stats["total"] += 1
+        if task.cached():
+            stats["already_cached"] += 1
+        else:
+            pending.append(task)
+
+    def run(task: WarmupTask) -> None:
+        try:
+            task.run()
+        except Exception as e:
+            print(f"[warmup] {task.category} {task.item} 실패: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="warmup") as pool:
+        list(pool.map(run, pending))
+
+    for task in pending:
+        stats = report[task.category]
+        if task.cached():
+            stats["warmed"] += 1
+        else:
+            stats["missing"].append(task.item)
+
+
+def run_warmup(
+    concurrency: int = settings.warmup_concurrency,
+    classifier: bool = True,
+    detector: bool = True
+) -> Dict[str, Any]:
+    """
+    관리 가이드/번역 캐시를 채우고 커버리지 리포트를 반환합니다 (동시에 한 번만 실행).
+
+    Args:
+        concurrency: 동시 LLM 호출 수
+        classifier: 분류 레이블 번역 + 관리 가이드 워밍 여부
+        detector: 감지 클래스 번역 워밍 여부
+
+    Returns:
+        {"categories": {카테고리: {total, already_cached, warmed, missing, coverage}}, "skipped": {...}, "seconds": ...}
+    """
+    global _last_report
+    if not _running.acquire(blocking=False):
+        print("[warmup] 이미 실행 중입니다")
+        return {"running": True}
+
+    try:
+        start = time.perf_counter()
+        categories: Dict[str, Dict[str, Any]] = {}
+        skipped: Dict[str, str] = {}
+        router = get_router()
+
+        stages: List[List[WarmupTask]] = []
+        if not router.rank("translation"):
+            skipped["translation"] = "번역 요청을 처리할 LLM 프로바이더가 없음"
+        else:
+            if classifier:
+                try:
+                    stages.extend(_classifier_tasks())
+                except Exception as e:
+                    skipped["classifier"] = f"분류 레이블 조회 실패: {e}"
+            if detector:
+                try:
+                    stages.extend(_detector_tasks())
+                except Exception as e:
+                    skipped["detector"] = f"감지 클래스 조회 실패: {e}"
+        if not router.rank("care_guide"):
+            skipped["care_guide"] = "관리 가이드 요청을 처리할 LLM 프로바이더가 없음"
+            stages = [[t for t in stage if t.category != "care_guide"] for stage in stages]
+
+        for stage in stages:
+            _run_stage(stage, concurrency, categories)
+
+        for stats in categories.values():
+            covered = stats["already_cached"] + stats["warmed"]
+            stats["coverage"] = round(covered / stats["total"], 3) if stats["total"] else 1.0
+
+        report = {
+            "categories": categories,
+            "skipped": skipped,
+            "concurrency": concurrency,
+            "seconds": round(time.perf_counter() - start, 1),
+            "finished_at": time.time(),
+        }
+        _last_report = report
+        return report
+    finally:
+        _running.release()
+
+
+def last_report() -> Optional[Dict[str, Any]]:
+    """마지막 워밍 리포트 (실행 전이면 None)"""
+    return _last_report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'category':<24}{'total':>7}{'cached':>8}{'warmed':>8}{'missing':>9}{'coverage':>10}")
+    for category, stats in report.get("categories", {}).items():
+        print(
+            f"{category:<24}{stats['total']:>7}{stats['already_cached']:>8}{stats['warmed']:>8}"
+            f"{len(stats['missing']):>9}{stats['coverage'] * 100:>9.1f}%"
+        )
+        for item in stats["missing"]:
+            print(f"    - {item}")
+    for name, reason in report.get("skipped", {}).items():
+        print(f"[건너뜀] {name}: {reason}")
+    print(f"소요 시간: {report.get('seconds', 0)}초 (동시성 {report.get('concurrency')})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="관리 가이드/번역 캐시 워머")
+    parser.add_argument("--concurrency", type=int, default=settings.warmup_concurrency)
+    parser.add_argument("--skip-classifier", action="store_true", help="분류 레이블 번역/관리 가이드 생략")
+    parser.add_argument("--skip-detector", action="store_true", help="감지 클래스 번역 생략")
+    args = parser.parse_args()
+
+    report = run_warmup(args.concurrency, classifier=not args.skip_classifier, detector=not args.skip_detector)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+speculative decoding 벤치마크
+- 같은 성장 분석 프롬프트로 일반 디코딩과 speculative decoding(prompt_lookup/draft)을 비교
+- greedy(temperature=0)로 실행하여 tokens/s와 출력 일치 여부를 확인
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_speculative --mode prompt_lookup
+    python -m benchmarks.bench_speculative --mode draft --draft-model ./models/Qwen2.5-0.5B-Instruct-Q4_K_M.gguf
+"""
+import argparse
+import os
+import time
+from typing import Dict, List
+
+from app.services.speculative import LLM_DRAFT_MODEL_PATH, LLM_DRAFT_TOKENS, make_draft_model
+from app.services.textgen_adapter import GROWTH_INSTRUCTION, GROWTH_SYSTEM_PROMPT, LLM_MODEL_PATH, LLM_THREADS
+
+SAMPLE_PLANTS = [
+    ("몬스테라", 120.0, 20.0, [24.1, 29.3, 35.2, 41.8, 48.9, 56.2], [22.0, 24.3, 26.8, 29.4, 32.1, 34.9]),
+    ("스투키", 60.0, 15.0, [16.2, 17.6, 19.1, 20.7, 22.4, 24.2], [15.5, 16.1, 16.7, 17.3, 18.0, 18.6]),
+    ("로즈마리", 80.0, 10.0, [12.4, 15.3, 18.7, 22.6, 27.0, 31.8], [11.1, 12.3, 13.6, 15.0, 16.5, 18.1]),
+]
+
+
+def _messages(plant: str, K: float, start: float, good: List[float], bad: List[float]) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": GROWTH_SYSTEM_PROMPT},
+        {"role": "user", "content": (
+            GROWTH_INSTRUCTION
+            + f"- 식물명: {plant}\n"
+            f"- 단위: month, 기간: {len(good)}\n"
+            f"- 초기 높이: {start} cm\n"
+            f"- 상한(추정 K): {K} cm\n"
+            f"- 좋은 성장(연속값): {good}\n"
+            f"- 나쁜 성장(연속값): {bad}"
+        )},
+    ]
+
+
+def _run(llm, max_tokens: int, runs: int) -> Dict[str, object]:
+    texts = []
+    tokens = 0
+    seconds = 0.0
+    for _ in range(runs):
+        for plant, K, start, good, bad in SAMPLE_PLANTS:
+            t0 = time.perf_counter()
+            out = llm.create_chat_completion(
+                messages=_messages(plant, K, start, good, bad),
+                max_tokens=max_tokens,
+                temperature=0.0,
+            )
+            seconds += time.perf_counter() - t0
+            tokens += out["usage"]["completion_tokens"]
+            texts.append(out["choices"][0]["message"]["content"])
+    return {"texts": texts, "tokens": tokens, "seconds": seconds, "tps": tokens / seconds if seconds else 0.0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="speculative decoding 벤치마크")
+    parser.add_argument("--model", default=LLM_MODEL_PATH)
+    parser.add_argument("--mode", choices=["prompt_lookup", "draft"], default="prompt_lookup")
+    parser.add_argument("--draft-model", default=None, help="draft 모드 초안 모델 경로 (기본 LLM_DRAFT_MODEL_PATH)")
+    parser.add_argument("--draft-tokens", type=int, default=None)
+    parser.add_argument("--max-tokens", type=int, default=512)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=LLM_THREADS)
+    args = parser.parse_args()
+
+    from llama_cpp import Llama
+
+    draft = make_draft_model(
+        args.mode,
+        n_threads=args.threads,
+        draft_model_path=args.draft_model or LLM_DRAFT_MODEL_PATH,
+        num_pred_tokens=args.draft_tokens or LLM_DRAFT_TOKENS,
+    )
+    if draft is None:
+        raise SystemExit(f"초안 생성기를 만들 수 없습니다 (mode={args.mode})")
+
+    print(f"모델: {args.model}, 모드: {args.mode}, max_tokens={args.max_tokens}, runs={args.runs}")
+    plain_llm = Llama(model_path=args.model, n_ctx=4096, n_threads=args.threads, verbose=False)
+    plain = _run(plain_llm, args.max_tokens, args.runs)
+    del plain_llm
+
+    spec_llm = Llama(model_path=args.model, n_ctx=4096, n_threads=args.threads, draft_model=draft,
+                     logits_all=True, verbose=False)
+    spec = _run(spec_llm, args.max_tokens, args.runs)
+
+    same = sum(a == b for a, b in zip(plain["texts"], spec["texts"]))
+    print(f"{'':<14}{'tokens':>8}{'seconds':>10}{'tokens/s':>10}")
+    print(f"{'plain':<14}{plain['tokens']:>8}{plain['seconds']:>10.2f}{plain['tps']:>10.2f}")
+    print(f"{args.mode:<14}{spec['tokens']:>8}{spec['seconds']:>10.2f}{spec['tps']:>10.2f}")
+    print(f"속도 향상: x{spec['tps'] / plain['tps']:.2f}" if plain["tps"] else "속도 향상: -")
+    print(f"출력 일치: {same}/{len(plain['texts'])}")
+    for i, (a, b) in enumerate(zip(plain["texts"], spec["texts"])):
+        if a != b:
+            prefix = os.path.commonprefix([a, b])
+            print(f"  [{i}] {len(prefix)}번째 문자부터 다름: {a[len(prefix):len(prefix) + 40]!r} vs {b[len(prefix):len(prefix) + 40]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+워커 수별 처리량 벤치마크 (app.launcher)
+- 워커 수마다 런처를 새로 띄우고 /api/ready가 연속으로 200이 된 뒤(새 연결마다 다른 워커가 받을 수 있으므로
+  워커 수 × 4번 연속), 고정 시간 동안 동시 요청을 보내
+  req/s, p50/p95 지연, 오류 수, 프로세스 트리 전체 메모리(PSS: 공유 페이지는 나누어 계산)를 측정
+- 부하 생성기는 여러 프로세스로 나누어 GIL이 클라이언트 쪽 병목이 되지 않도록 함
+- 대상 (--endpoint, LLM_PROVIDER=none, 캐시 워밍 끔):
+  period-analysis  LLM 없이 NumPy만 쓰는 기간 분석 API (GET, 기본)
+  classify         이미지 업로드 → 분류 모델(ViT) + 관리 가이드 템플릿 + 성장 예측 (POST /api/plant/analyze)
+  detect           이미지 업로드 → 감지 모델(YOLO) + 방제 템플릿 (POST /api/detect)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_workers --workers 1 2 4
+    python -m benchmarks.bench_workers --workers 1 2 4 8 --duration 20 --concurrency 64 --json workers.json
+    python -m benchmarks.bench_workers --workers 1 2 4 --endpoint classify --image ./sample.jpg
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+DEFAULT_PATH = f"/api/plant/period-analysis?plant_name={quote('몬스테라')}&period=6"
+# 이미지 업로드 대상 (엔드포인트 이름 → 경로)
+UPLOAD_PATHS = {"classify": "/api/plant/analyze", "detect": "/api/detect"}
+DEFAULT_IMAGE = Path(__file__).resolve().parents[2] / "frontend" / "public" / "images" / "mimg.jpg"
+
+# (method, path, body, headers): 프로세스 사이로 넘길 수 있도록 튜플
+Request = Tuple[str, str, Optional[bytes], Dict[str, str]]
+
+
+def build_request(endpoint: str, path: str, image: Optional[str]) -> Request:
+    """벤치마크 요청을 만듭니다 (업로드 대상은 multipart 본문을 한 번만 만들어 재사용)."""
+    if endpoint == "period-analysis":
+        return ("GET", path, None, {})
+    image_path = Path(image) if image else DEFAULT_IMAGE
+    if not image_path.exists():
+        raise SystemExit(f"--endpoint {endpoint}에는 --image가 필요합니다 (없음: {image_path})")
+    boundary = uuid.uuid4().hex
+    content_type = "image/png" if image_path.suffix.lower() == ".png" else "image/jpeg"
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{image_path.name}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8") + image_path.read_bytes() + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return ("POST", UPLOAD_PATHS[endpoint], body, {"Content-Type": f"multipart/form-data; boundary={boundary}"})
+
+
+def _pss_mb(pid: int) -> float:
+    """pid와 모든 자손 프로세스의 PSS 합 (MB, copy-on-write 공유 페이지는 공유 프로세스 수로 나뉨)"""
+    total = 0.0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        total += int(line.split()[1]) / 1024
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return total
+
+
+def _wait_ready(port: int, timeout: float, streak: int) -> None:
+    """
+    /api/ready가 streak번 연속 200일 때까지 기다립니다.
+    요청마다 새 연결을 열어 공유 소켓을 accept하는 워커가 바뀌도록 하므로, 한 워커만 준비된 상태에서는 연속 성공이 끊김
+    """
+    deadline = time.monotonic() + timeout
+    ok = 0
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/api/ready")
+            status = conn.getresponse().status
+            conn.close()
+        except (OSError, http.client.HTTPException):
+            status = None
+        if status == 200:
+            ok += 1
+            if ok >= streak:
+                return
+            time.sleep(0.05)
+            continue
+        ok = 0
+        time.sleep(0.5)
+    raise TimeoutError(f"서버가 {timeout}초 안에 준비되지 않았습니다 (port={port}, 연속 200 {ok}/{streak})")
+
+
+def _client(port: int, request: Request, threads: int, duration: float) -> Dict[str, object]:
+    """부하 생성 프로세스: threads개 keep-alive 연결로 duration초 동안 요청하고 지연 목록을 반환"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    method, path, body, headers = request
+
+    def run() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    failed += 1
+                    continue
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return {"latencies": latencies, "errors": errors[0]}
+
+
+def run_one(workers: int, args: argparse.Namespace) -> Dict[str, object]:
+    """워커 수 하나로 런처를 띄워 측정합니다."""
+    env = {**os.environ, "LLM_PROVIDER": "none", "WARMUP_ON_STARTUP": "false", "IMAGE_JOBS_ENABLED": "false"}
+    cmd = [sys.executable, "-m", "app.launcher", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(args.port)]
+    if args.cores:
+        cmd += ["--cores", str(args.cores)]
+    backend = Path(__file__).resolve().parent.parent
+    server = subprocess.Popen(cmd, cwd=backend, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(args.port, args.ready_timeout, args.ready_streak or workers * 4)
+        # 워밍업 요청 (각 워커의 첫 요청 비용 제외)
+        _client(args.port, args.request, min(args.concurrency, workers * 2), args.warmup)
+
+        procs = max(1, min(args.client_procs, args.concurrency))
+        per_proc = [args.concurrency // procs + (1 if i < args.concurrency % procs else 0) for i in range(procs)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            futures = [pool.submit(_client, args.port, args.request, n, args.duration) for n in per_proc]
+            pss = _pss_mb(server.pid)  # 부하 중 메모리 (워커가 모두 요청을 처리하는 상태)
+            results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies = sorted(l for r in results for l in r["latencies"])
+    errors = sum(r["errors"] for r in results)
+    if not latencies:
+        return {"workers": workers, "requests": 0, "errors": errors}
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "pss_mb": pss,
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    print(f"{'workers':>8}{'req/s':>10}{'speedup':>9}{'p50':>9}{'p95':>9}{'errors':>8}{'PSS':>9}")
+    base: Optional[float] = None
+    for row in rows:
+        if not row["requests"]:
+            print(f"{row['workers']:>8}{'-':>10}{'-':>9}{'-':>9}{'-':>9}{row['errors']:>8}{'-':>9}")
+            continue
+        base = base or row["rps"]
+        print(
+            f"{row['workers']:>8}{row['rps']:>10.1f}{row['rps'] / base:>8.2f}x"
+            f"{row['p50_ms']:>7.1f}ms{row['p95_ms']:>7.1f}ms{row['errors']:>8}{row['pss_mb']:>8.0f}M"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워커 수별 처리량 벤치마크 (app.launcher)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--endpoint", choices=["period-analysis", *UPLOAD_PATHS], default="period-analysis", help="측정 대상")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="period-analysis 대상의 GET 경로")
+    parser.add_argument("--image", help=f"classify/detect 업로드 이미지 (기본: {DEFAULT_IMAGE.name})")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 연결 수")
+    parser.add_argument("--client-procs", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="부하 생성 프로세스 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 워밍업 시간 (초)")
+    parser.add_argument("--cores", type=int, help="런처에 넘길 코어 수 (기본: 런처가 감지)")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--ready-streak", type=int, default=0, help="준비 판정에 필요한 연속 200 횟수 (기본: 워커 수 × 4)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    args.request = build_request(args.endpoint, args.path, args.image)
+
+    rows = []
+    for workers in args.workers:
+        print(f"[bench_workers] workers={workers} {args.endpoint} 측정 중...")
+        rows.append(run_one(workers, args))
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
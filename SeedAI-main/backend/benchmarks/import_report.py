@@ -0,0 +1,152 @@
+"""
+import 시간/메모리 리포트
+- 모듈마다 새 프로세스에서 import하여 콜드 스타트 시간, RSS 증가량, 함께 로드된 무거운 ML 패키지를 측정
+- --ref로 다른 커밋(예: 지연 import 적용 전)을 임시 git worktree에 꺼내 같은 측정을 하고 전/후를 나란히 출력
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.import_report
+    python -m benchmarks.import_report --ref HEAD~1 --repeat 5
+    python -m benchmarks.import_report --json after.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_TARGETS = [
+    "app.main",
+    "app.api.plant",
+    "app.api.health",
+    "app.services.growth",
+    "app.services.guide",
+    "app.services.classifier",
+    "app.services.db_utils",
+]
+HEAVY_PACKAGES = ["torch", "transformers", "diffusers", "ultralytics", "cv2", "scipy", "PIL", "llama_cpp"]
+
+# 자식 프로세스: 인터프리터 기본 상태 측정 → import → 다시 측정
+_CHILD = r"""
+import json, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+target, heavy = sys.argv[1], sys.argv[2].split(",")
+sys.path.insert(0, ".")
+before = rss_mb()
+start = time.perf_counter()
+error = None
+try:
+    __import__(target)
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "rss_before_mb": before,
+    "rss_after_mb": rss_mb(),
+    "heavy": [name for name in heavy if name in sys.modules],
+    "modules": len(sys.modules),
+    "error": error,
+}))
+"""
+
+
+def measure(target: str, cwd: Path, repeat: int) -> Dict[str, object]:
+    """target을 repeat번 새 프로세스에서 import하여 중앙값을 반환합니다."""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD, target, ",".join(HEAVY_PACKAGES)],
+            cwd=cwd, capture_output=True, text=True,
+        )
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if not lines:
+            return {"error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+        runs.append(json.loads(lines[-1]))
+    last = runs[-1]
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "rss_mb": statistics.median(r["rss_after_mb"] for r in runs),
+        "rss_delta_mb": statistics.median(r["rss_after_mb"] - r["rss_before_mb"] for r in runs),
+        "heavy": last["heavy"],
+        "modules": last["modules"],
+        "error": last["error"],
+    }
+
+
+def report(cwd: Path, targets: List[str], repeat: int) -> Dict[str, Dict[str, object]]:
+    return {target: measure(target, cwd, repeat) for target in targets}
+
+
+def _checkout(ref: str, backend: Path) -> Path:
+    """ref를 임시 worktree로 꺼내고, 그 안의 backend 경로를 반환합니다."""
+    top = Path(subprocess.check_output(["git", "rev-parse", "--show-toplevel"], cwd=backend, text=True).strip())
+    tmp = Path(tempfile.mkdtemp(prefix="import_report_"))
+    subprocess.run(["git", "worktree", "add", "--detach", str(tmp), ref], cwd=top, check=True, capture_output=True)
+    return tmp / backend.resolve().relative_to(top)
+
+
+def _remove_checkout(path: Path, backend: Path) -> None:
+    top = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], cwd=path, text=True).strip()
+    subprocess.run(["git", "worktree", "remove", "--force", top], cwd=backend, capture_output=True)
+
+
+def _row(result: Dict[str, object]) -> str:
+    if result.get("seconds") is None:
+        return f"{'-':>8}{'-':>9}{'-':>9}  {result.get('error')}"
+    heavy = ",".join(result["heavy"]) or "-"
+    suffix = f"  ({result['error']})" if result.get("error") else ""
+    return f"{result['seconds'] * 1000:>7.0f}ms{result['rss_mb']:>8.0f}M{result['rss_delta_mb']:>8.0f}M  {heavy}{suffix}"
+
+
+def print_report(after: Dict[str, Dict[str, object]], before: Optional[Dict[str, Dict[str, object]]] = None) -> None:
+    print(f"{'import':<26}{'time':>9}{'rss':>9}{'Δrss':>9}  heavy")
+    for target, result in after.items():
+        if before is None:
+            print(f"{target:<26}{_row(result)}")
+            continue
+        print(target)
+        print(f"  {'before':<24}{_row(before.get(target, {'error': 'not measured'}))}")
+        print(f"  {'after':<24}{_row(result)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="import 시간/메모리 리포트")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="측정할 모듈")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈당 측정 횟수 (중앙값)")
+    parser.add_argument("--ref", help="비교할 git ref (예: HEAD~1), 임시 worktree에서 측정")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    backend = Path(__file__).resolve().parent.parent
+    before = None
+    if args.ref:
+        checkout = _checkout(args.ref, backend)
+        try:
+            before = report(checkout, args.targets, args.repeat)
+        finally:
+            _remove_checkout(checkout, backend)
+    after = report(backend, args.targets, args.repeat)
+    print_report(after, before)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"before": before, "after": after}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
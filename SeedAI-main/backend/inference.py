@@ -13,6 +13,7 @@ from ultralytics import YOLO
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 import logging
+import threading
 import torch
 from scipy.ndimage import gaussian_filter
 
@@ -117,6 +118,15 @@ class PlantDiseaseDetector:
         
         return species, disease
     
+    def list_classes(self) -> List[Tuple[str, str]]:
+        """
+        감지 모델의 전체 클래스를 (식물 종, 병충해) 목록으로 반환합니다 (캐시 워머용).
+        모델이 로드되지 않았으면 빈 목록.
+        """
+        if self.disease_model is None:
+            return []
+        return [self._parse_class_name(name) for name in self.disease_model.names.values()]
+    
     def detect(
         self, 
         image_path: str, 
@@ -130,6 +140,28 @@ class PlantDiseaseDetector:
             image_path: 분석할 이미지 경로
             conf_threshold: 신뢰도 임계값
             
+        Returns:
+            감지 결과를 담은 딕셔너리
+        """
+        img = cv2.imread(image_path)
+        if img is None:
+            logger.error(f"감지 중 오류 발생: 이미지를 로드할 수 없습니다: {image_path}")
+            raise ValueError(f"이미지를 로드할 수 없습니다: {image_path}")
+        return self.detect_image(img, conf_threshold=conf_threshold, filter_by_confidence=filter_by_confidence)
+    
+    def detect_image(
+        self,
+        img: np.ndarray,
+        conf_threshold: float = 0.01,
+        filter_by_confidence: bool = True
+    ) -> Dict:
+        """
+        디코딩된 이미지 배열에서 식물 종과 병충해를 감지합니다 (모델 서버는 공유 메모리 배열로 호출).
+        
+        Args:
+            img: BGR uint8 이미지 (H, W, 3), cv2.imread 결과와 같은 형식
+            conf_threshold: 신뢰도 임계값
+            
         Returns:
             감지 결과를 담은 딕셔너리
         """
@@ -145,11 +177,6 @@ class PlantDiseaseDetector:
         }
         
         try:
-            # 원본 이미지 로드
-            img = cv2.imread(image_path)
-            if img is None:
-                raise ValueError(f"이미지를 로드할 수 없습니다: {image_path}")
-            
             # 원본 이미지 base64 인코딩
             _, buffer = cv2.imencode('.jpg', img)
             results["original_image"] = base64.b64encode(buffer).decode('utf-8')
@@ -161,7 +188,7 @@ class PlantDiseaseDetector:
                 return results
             
             # Detection 수행
-            detection_results = self.disease_model(image_path, conf=conf_threshold)
+            detection_results = self.disease_model(img, conf=conf_threshold)
             
             # 🔍 디버깅: 모든 예측 결과 출력 (신뢰도 무관)
             logger.info(f"🔍 디버깅 모드 - 예측 결과 분석:")
@@ -407,6 +434,8 @@ class PlantDiseaseDetector:
 
 # 싱글톤 인스턴스 (애플리케이션 전역에서 사용)
 _detector_instance: Optional[PlantDiseaseDetector] = None
+# 시작 시 사전 로드 스레드와 캐시 워머/첫 요청이 동시에 모델을 로드하지 않도록
+_detector_lock = threading.Lock()
 
 
 def get_detector() -> PlantDiseaseDetector:
@@ -415,5 +444,7 @@ def get_detector() -> PlantDiseaseDetector:
     """
     global _detector_instance
     if _detector_instance is None:
-        _detector_instance = PlantDiseaseDetector()
+        with _detector_lock:
+            if _detector_instance is None:
+                _detector_instance = PlantDiseaseDetector()
     return _detector_instance
@@ -2,10 +2,17 @@
 LLM 서비스 - GPT-4o mini를 활용한 방제법 제시
 """
 import os
-from openai import OpenAI
-from typing import Optional
+import threading
+from collections import OrderedDict
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
+from app.config import settings
+from app.services import llm_gateway
+from app.services.cache_store import PersistentCache
+from app.services.llm_router import NoProviderAvailable, get_router
+
 # .env 파일 로드
 try:
     from dotenv import load_dotenv
@@ -15,6 +22,54 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# 번역 + 방제법 번들 캐시 최대 항목 수 (LRU)
+BUNDLE_CACHE_SIZE = 512
+
+
+class DetectionAdviceBundle(BaseModel):
+    """단일 JSON 모드 호출로 받는 번역 + 방제법 묶음"""
+    species_kr: str = Field(..., description="식물 종 한국어 명칭")
+    disease_kr: str = Field(..., description="병충해 한국어 명칭")
+    overview: Optional[str] = Field(None, description="병충해 개요 (2-3문장)")
+    immediate_actions: List[str] = Field(default_factory=list, description="즉시 조치 방법")
+    chemical_control: List[str] = Field(default_factory=list, description="화학적 방제")
+    organic_control: List[str] = Field(default_factory=list, description="친환경 방제")
+    physical_control: List[str] = Field(default_factory=list, description="물리적 방제")
+    prevention: List[str] = Field(default_factory=list, description="예방법")
+    cautions: List[str] = Field(default_factory=list, description="주의사항")
+
+    @property
+    def has_advice(self) -> bool:
+        """방제법 섹션이 포함된 번들인지 여부"""
+        return bool(self.overview)
+
+    def advice_sections(self) -> Dict[str, Any]:
+        """프론트엔드용 방제법 섹션 딕셔너리"""
+        return self.model_dump(exclude={"species_kr", "disease_kr"})
+
+    def format_advice(self) -> str:
+        """기존 treatment_advice 텍스트 형식(이모지 섹션)으로 변환합니다."""
+        def bullets(items: List[str]) -> str:
+            return "\n".join(f"- {item}" for item in items)
+
+        parts = [f"📌 병충해 개요\n{self.overview or ''}".strip()]
+        if self.immediate_actions:
+            parts.append(f"🚨 즉시 조치 방법\n{bullets(self.immediate_actions)}")
+        control = []
+        if self.chemical_control:
+            control.append(f"[화학적 방제]\n{bullets(self.chemical_control)}")
+        if self.organic_control:
+            control.append(f"[친환경 방제]\n{bullets(self.organic_control)}")
+        if self.physical_control:
+            control.append(f"[물리적 방제]\n{bullets(self.physical_control)}")
+        if control:
+            parts.append("💊 방제법\n" + "\n".join(control))
+        if self.prevention:
+            parts.append(f"🛡️ 예방법\n{bullets(self.prevention)}")
+        if self.cautions:
+            parts.append(f"⚠️ 주의사항\n{bullets(self.cautions)}")
+        return "\n\n".join(parts)
+
 
 class PlantDiseaseAdvisor:
     """식물 병충해 방제법 제시 서비스"""
@@ -32,36 +87,113 @@ class PlantDiseaseAdvisor:
             self.client = None
         else:
             try:
-                # httpx 클라이언트를 직접 생성하여 proxies 문제 해결
-                import httpx
-                
-                # 환경 변수에서 proxies 완전히 제거
-                proxy_env_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-                saved_proxies = {}
-                for var in proxy_env_vars:
-                    if var in os.environ:
-                        saved_proxies[var] = os.environ.pop(var)
-                
-                try:
-                    # httpx 클라이언트를 proxies 관련 설정 없이 생성
-                    http_client = httpx.Client(timeout=60.0)
-                    
-                    self.client = OpenAI(
-                        api_key=self.api_key,
-                        http_client=http_client
-                    )
-                    logger.info("✅ OpenAI 클라이언트 초기화 완료")
-                    logger.info(f"   API 키 길이: {len(self.api_key)} 문자")
-                finally:
-                    # 환경 변수 복원
-                    for var, value in saved_proxies.items():
-                        os.environ[var] = value
-                        
+                # LLM 게이트웨이의 공유 커넥션 풀 클라이언트 사용
+                self.client = llm_gateway.get_openai_client(self.api_key)
+                logger.info("✅ OpenAI 클라이언트 초기화 완료")
+                logger.info(f"   API 키 길이: {len(self.api_key)} 문자")
             except Exception as e:
                 logger.error(f"❌ OpenAI 클라이언트 초기화 실패: {str(e)}")
                 import traceback
                 traceback.print_exc()
                 self.client = None
+        
+        # (종, 병충해, 사용자 의견) → DetectionAdviceBundle
+        self._bundle_cache: "OrderedDict[Tuple[str, str, str], DetectionAdviceBundle]" = OrderedDict()
+        self._bundle_cache_lock = threading.Lock()
+        # (context, 영어 이름) → 한국어 이름 (영속, 번역 전용 번들도 여기서 조합)
+        self._translations = PersistentCache(
+            "detection_translation",
+            max_entries=settings.translation_cache_max_entries,
+            ttl=settings.translation_cache_ttl,
+        )
+    
+    def get_detection_bundle(
+        self,
+        plant_species: str,
+        disease: str,
+        confidence: float,
+        user_notes: Optional[str] = None,
+        include_advice: bool = True
+    ) -> Optional[DetectionAdviceBundle]:
+        """
+        한 번의 JSON 모드 호출로 식물/병충해 번역과 방제법 섹션을 함께 생성합니다.
+        결과는 스키마 검증 후 하나의 키로 묶어 캐시합니다.
+        
+        Args:
+            plant_species: 식물 종 (예: "Tomato")
+            disease: 병충해명 (예: "Early blight")
+            confidence: 신뢰도 (0.0 ~ 1.0, 프롬프트 어조에만 사용하며 캐시 키에는 포함하지 않음)
+            user_notes: 사용자 추가 의견 (선택사항)
+            include_advice: False면 번역만 요청 (방제법 섹션 생략)
+            
+        Returns:
+            DetectionAdviceBundle 또는 None (클라이언트 없음/호출 실패/검증 실패)
+        """
+        cached = self.get_cached_bundle(plant_species, disease, user_notes, include_advice)
+        if cached is not None:
+            return cached
+        
+        if not include_advice:
+            # 번역만 필요하면 영속 번역 캐시로 조합 (캐시 워머가 미리 채움)
+            species_kr = self.get_cached_translation(plant_species, "plant")
+            disease_kr = self.get_cached_translation(disease, "disease")
+            if species_kr is not None and disease_kr is not None:
+                return DetectionAdviceBundle(species_kr=species_kr, disease_kr=disease_kr)
+        
+        if not self._llm_available("treatment_advice"):
+            return None
+        
+        def parse(content: str) -> DetectionAdviceBundle:
+            bundle = DetectionAdviceBundle.model_validate_json(content)
+            if include_advice and not bundle.has_advice:
+                raise ValueError("방제법 섹션(overview)이 비어 있습니다.")
+            return bundle
+        
+        try:
+            # 번역만 요청하는 경우는 번역 SLO로 라우팅
+            result = get_router().complete(
+                "treatment_advice" if include_advice else "translation",
+                messages=self._bundle_messages(plant_species, disease, confidence, user_notes, include_advice),
+                json_mode=True,
+                temperature=0.5 if include_advice else 0.3,
+                max_tokens=1200 if include_advice else 100,
+                validate=parse
+            )
+            bundle = parse(result.text)
+        except NoProviderAvailable as e:
+            # 모든 프로바이더에서 호출 또는 스키마 검증 실패
+            logger.error(f"❌ LLM 번들 호출/검증 실패: {str(e)}")
+            return None
+        
+        with self._bundle_cache_lock:
+            key = self._bundle_key(plant_species, disease, user_notes)
+            existing = self._bundle_cache.get(key)
+            # 번역 전용 번들이 같은 키의 방제법 포함 번들을 덮어쓰지 않도록 (포함 번들은 번역 요청에도 쓰임)
+            if existing is None or bundle.has_advice or not existing.has_advice:
+                self._bundle_cache[key] = bundle
+            self._bundle_cache.move_to_end(key)
+            while len(self._bundle_cache) > BUNDLE_CACHE_SIZE:
+                self._bundle_cache.popitem(last=False)
+        self._store_translation(plant_species, "plant", bundle.species_kr)
+        self._store_translation(disease, "disease", bundle.disease_kr)
+        logger.info(f"✅ LLM 번들 생성 완료 (식물: {plant_species}, 병충해: {disease}, 방제법 포함: {include_advice})")
+        return bundle
+    
+    def get_cached_bundle(
+        self,
+        plant_species: str,
+        disease: str,
+        user_notes: Optional[str] = None,
+        include_advice: bool = True
+    ) -> Optional[DetectionAdviceBundle]:
+        """캐시된 번들을 반환합니다. 방제법이 필요한데 번역만 캐시된 경우 None."""
+        key = self._bundle_key(plant_species, disease, user_notes)
+        with self._bundle_cache_lock:
+            bundle = self._bundle_cache.get(key)
+            if bundle is None or (include_advice and not bundle.has_advice):
+                return None
+            self._bundle_cache.move_to_end(key)
+            return bundle
     
     def get_treatment_advice(
         self, 
@@ -82,38 +214,19 @@ class PlantDiseaseAdvisor:
         Returns:
             방제법 및 예방법 텍스트
         """
-        if not self.client:
+        if not self._llm_available("treatment_advice"):
             return "⚠️  AI 방제법 서비스를 사용할 수 없습니다. OPENAI_API_KEY를 설정해주세요."
         
         try:
-            # 프롬프트 구성
-            prompt = self._build_prompt(plant_species, disease, confidence, user_notes)
-            
-            # GPT-4o mini 호출
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "당신은 식물 병충해 전문가입니다. "
-                            "농부와 가정 원예가들에게 실용적이고 이해하기 쉬운 "
-                            "방제법과 예방법을 제공합니다. "
-                            "답변은 한국어로, 친절하고 전문적인 어조로 작성하며, "
-                            "구체적인 실행 단계를 포함해야 합니다."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            result = get_router().complete(
+                "treatment_advice",
+                messages=self._treatment_messages(plant_species, disease, confidence, user_notes),
                 temperature=0.7,
                 max_tokens=800
             )
             
-            advice = response.choices[0].message.content.strip()
-            logger.info(f"✅ LLM 방제법 생성 완료 (식물: {plant_species}, 병충해: {disease})")
+            advice = result.text
+            logger.info(f"✅ LLM 방제법 생성 완료 (식물: {plant_species}, 병충해: {disease}, 프로바이더: {result.provider})")
             
             return advice
             
@@ -121,6 +234,38 @@ class PlantDiseaseAdvisor:
             logger.error(f"❌ LLM 호출 오류: {str(e)}")
             return f"⚠️  방제법 생성 중 오류가 발생했습니다: {str(e)}"
     
+    def stream_treatment_advice(
+        self,
+        plant_species: str,
+        disease: str,
+        confidence: float,
+        user_notes: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        get_treatment_advice의 스트리밍 버전입니다.
+        LLM이 생성하는 토큰 조각을 도착하는 즉시 순서대로 반환합니다.
+        
+        Args:
+            plant_species: 식물 종 (예: "Tomato")
+            disease: 병충해명 (예: "Early blight")
+            confidence: 신뢰도 (0.0 ~ 1.0)
+            user_notes: 사용자 추가 의견 (선택사항)
+            
+        Yields:
+            방제법 텍스트 조각
+        """
+        if not self._llm_available("treatment_advice"):
+            yield "⚠️  AI 방제법 서비스를 사용할 수 없습니다. OPENAI_API_KEY를 설정해주세요."
+            return
+        
+        yield from get_router().stream(
+            "treatment_advice",
+            self._treatment_messages(plant_species, disease, confidence, user_notes),
+            max_tokens=800,
+            temperature=0.7
+        )
+        logger.info(f"✅ LLM 방제법 스트리밍 완료 (식물: {plant_species}, 병충해: {disease})")
+    
     def get_user_notes_advice(self, user_notes: str) -> str:
         """
         신뢰도가 낮을 때 사용자의 추가 설명만으로 조언을 제공합니다.
@@ -131,60 +276,21 @@ class PlantDiseaseAdvisor:
         Returns:
             조언 텍스트
         """
-        if not self.client:
+        if not self._llm_available("treatment_advice"):
             return "⚠️  AI 방제법 서비스를 사용할 수 없습니다. OPENAI_API_KEY를 설정해주세요."
         
         if not user_notes or not user_notes.strip():
             return None
         
         try:
-            prompt = f"""
-사용자가 식물 병충해 증상에 대해 다음과 같이 설명하고 있습니다:
-
-"{user_notes}"
-
-위 설명만을 바탕으로 다음 내용을 포함한 실용적인 조언을 제공해주세요:
-
-1. 증상 분석 (3-4문장)
-   - 사용자가 설명한 증상에 대한 일반적인 분석
-   - 가능한 원인들
-
-2. 즉시 조치 방법
-   - 지금 당장 할 수 있는 응급 조치
-   - 추가 피해 방지 방법
-
-3. 일반적인 관리 조언
-   - 물 주기, 통풍, 조명 등 환경 관리
-   - 예방을 위한 팁
-
-4. 전문가 상담 권장
-   - 정확한 진단을 위해 병원균 검사 등을 권장
-
-답변은 한국어로 작성하고, 실용적이고 구체적으로 작성해주세요.
-각 섹션은 이모지(🔍, 🚨, 🌱, 💡)를 활용하여 가독성을 높여주세요.
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "당신은 식물 병충해 전문가입니다. "
-                            "사용자의 설명만으로 가능한 범위에서 조언을 제공하되, "
-                            "정확한 진단을 위해서는 더 많은 정보나 전문가 상담이 필요함을 안내합니다."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            result = get_router().complete(
+                "treatment_advice",
+                messages=self._user_notes_messages(user_notes),
                 temperature=0.7,
                 max_tokens=600
             )
             
-            advice = response.choices[0].message.content.strip()
+            advice = result.text
             logger.info(f"✅ 사용자 설명 기반 조언 생성 완료")
             
             return advice
@@ -193,6 +299,31 @@ class PlantDiseaseAdvisor:
             logger.error(f"❌ LLM 호출 오류: {str(e)}")
             return None
     
+    def stream_user_notes_advice(self, user_notes: str) -> Iterator[str]:
+        """
+        get_user_notes_advice의 스트리밍 버전입니다.
+        
+        Args:
+            user_notes: 사용자 추가 의견
+            
+        Yields:
+            조언 텍스트 조각
+        """
+        if not self._llm_available("treatment_advice"):
+            yield "⚠️  AI 방제법 서비스를 사용할 수 없습니다. OPENAI_API_KEY를 설정해주세요."
+            return
+        
+        if not user_notes or not user_notes.strip():
+            return
+        
+        yield from get_router().stream(
+            "treatment_advice",
+            self._user_notes_messages(user_notes),
+            max_tokens=600,
+            temperature=0.7
+        )
+        logger.info(f"✅ 사용자 설명 기반 조언 스트리밍 완료")
+    
     def translate_to_korean(self, english_text: str, context: str = "plant") -> str:
         """
         영어 텍스트를 한국어로 번역합니다.
@@ -204,12 +335,16 @@ class PlantDiseaseAdvisor:
         Returns:
             한국어 번역 텍스트
         """
-        if not self.client:
-            return english_text  # API 키가 없으면 원문 반환
-        
         if not english_text or not english_text.strip():
             return english_text
         
+        cached = self.get_cached_translation(english_text, context)
+        if cached is not None:
+            return cached
+        
+        if not self._llm_available("translation"):
+            return english_text  # 사용 가능한 LLM이 없으면 원문 반환
+        
         try:
             if context == "plant":
                 system_prompt = "당신은 식물학 전문 번역가입니다. 식물 이름을 한국어로 번역할 때는 일반적으로 사용되는 한국어 명칭을 사용하세요."
@@ -218,8 +353,8 @@ class PlantDiseaseAdvisor:
                 system_prompt = "당신은 식물 병리학 전문 번역가입니다. 병충해 이름을 한국어로 번역할 때는 전문 용어를 사용하세요."
                 user_prompt = f"다음 식물 병충해 이름을 한국어로 번역해주세요. 번역된 이름만 답변하세요: {english_text}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            result = get_router().complete(
+                "translation",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -228,7 +363,8 @@ class PlantDiseaseAdvisor:
                 max_tokens=50
             )
             
-            translated = response.choices[0].message.content.strip()
+            translated = result.text
+            self._store_translation(english_text, context, translated)
             logger.info(f"✅ 번역 완료: {english_text} -> {translated}")
             
             return translated
@@ -237,6 +373,158 @@ class PlantDiseaseAdvisor:
             logger.error(f"❌ 번역 오류: {str(e)}")
             return english_text  # 오류 시 원문 반환
     
+    def get_cached_translation(self, english_text: str, context: str = "plant") -> Optional[str]:
+        """영속 캐시에 있는 번역을 반환합니다 (없거나 기한이 지났으면 None)."""
+        try:
+            entry = self._translations.get(self._translation_key(english_text, context))
+        except Exception as e:
+            logger.warning(f"번역 캐시 조회 실패: {str(e)}")
+            return None
+        if entry is None or entry.stale:
+            return None
+        return entry.value
+    
+    def _store_translation(self, english_text: str, context: str, translated: str) -> None:
+        if english_text and translated:
+            self._translations.set(self._translation_key(english_text, context), translated)
+    
+    @staticmethod
+    def _translation_key(english_text: str, context: str) -> str:
+        """번역 캐시 키 (context + 대소문자/공백 정규화한 이름)"""
+        return f"{context}:{' '.join(english_text.split()).lower()}"
+    
+    def _llm_available(self, request_class: str) -> bool:
+        """OpenAI 클라이언트가 있거나 라우터에 해당 요청 종류를 처리할 프로바이더가 있는지 여부"""
+        return self.client is not None or bool(get_router().rank(request_class))
+    
+    @staticmethod
+    def _bundle_key(plant_species: str, disease: str, user_notes: Optional[str]) -> Tuple[str, str, str]:
+        """번들 캐시 키 (대소문자/공백 정규화)"""
+        def norm(text: Optional[str]) -> str:
+            return " ".join((text or "").split()).lower()
+        return norm(plant_species), norm(disease), norm(user_notes)
+    
+    def _bundle_messages(
+        self,
+        plant_species: str,
+        disease: str,
+        confidence: float,
+        user_notes: Optional[str],
+        include_advice: bool
+    ) -> List[Dict[str, str]]:
+        """번역 + 방제법 JSON 모드 요청 메시지를 구성합니다."""
+        if include_advice:
+            schema = (
+                '{\n'
+                '  "species_kr": "식물 종 한국어 명칭",\n'
+                '  "disease_kr": "병충해 한국어 명칭 (전문 용어)",\n'
+                '  "overview": "병충해 개요와 주요 증상 (2-3문장)",\n'
+                '  "immediate_actions": ["지금 당장 할 수 있는 응급 조치/확산 방지"],\n'
+                '  "chemical_control": ["화학적 방제 (필요시 농약명 포함)"],\n'
+                '  "organic_control": ["친환경(유기농) 방제"],\n'
+                '  "physical_control": ["물리적 방제 (제거, 격리 등)"],\n'
+                '  "prevention": ["재발 방지 및 환경 관리 (통풍, 습도, 물 주기 등)"],\n'
+                '  "cautions": ["방제 시 주의할 점, 피해야 할 행동"]\n'
+                '}'
+            )
+            instruction = (
+                "위 진단 결과에 대해 식물 종과 병충해 이름을 한국어로 번역하고, "
+                "실용적이고 구체적인 방제법을 작성해주세요. 전문 용어는 쉽게 풀어서 설명하고, "
+                "각 목록은 2-5개 항목으로 작성하세요."
+            )
+        else:
+            schema = (
+                '{\n'
+                '  "species_kr": "식물 종 한국어 명칭",\n'
+                '  "disease_kr": "병충해 한국어 명칭 (전문 용어)"\n'
+                '}'
+            )
+            instruction = "위 식물 종과 병충해 이름을 일반적으로 사용되는 한국어 명칭으로 번역해주세요."
+        
+        if include_advice:
+            prompt = self._build_diagnosis_header(plant_species, disease, confidence, user_notes)
+        else:
+            # 번역만 요청할 때는 신뢰도/사용자 의견을 빼서 동일 종·병충해 요청이 같은 프롬프트가 되도록 함
+            prompt = f"\n- 식물 종: {plant_species}\n- 병충해/상태: {disease}\n"
+        prompt += f"\n{instruction}\n\n반드시 다음 JSON 형식으로만 답변하세요:\n{schema}\n"
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "당신은 식물 병충해 전문가이자 식물학 전문 번역가입니다. "
+                    "답변은 한국어로 작성하며, 반드시 유효한 JSON 객체만 반환합니다."
+                )
+            },
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _treatment_messages(
+        self,
+        plant_species: str,
+        disease: str,
+        confidence: float,
+        user_notes: Optional[str]
+    ) -> List[Dict[str, str]]:
+        """방제법 요청 메시지(system + user)를 구성합니다."""
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "당신은 식물 병충해 전문가입니다. "
+                    "농부와 가정 원예가들에게 실용적이고 이해하기 쉬운 "
+                    "방제법과 예방법을 제공합니다. "
+                    "답변은 한국어로, 친절하고 전문적인 어조로 작성하며, "
+                    "구체적인 실행 단계를 포함해야 합니다."
+                )
+            },
+            {
+                "role": "user",
+                "content": self._build_prompt(plant_species, disease, confidence, user_notes)
+            }
+        ]
+    
+    def _user_notes_messages(self, user_notes: str) -> List[Dict[str, str]]:
+        """사용자 설명 기반 조언 요청 메시지(system + user)를 구성합니다."""
+        prompt = f"""
+사용자가 식물 병충해 증상에 대해 다음과 같이 설명하고 있습니다:
+
+"{user_notes}"
+
+위 설명만을 바탕으로 다음 내용을 포함한 실용적인 조언을 제공해주세요:
+
+1. 증상 분석 (3-4문장)
+   - 사용자가 설명한 증상에 대한 일반적인 분석
+   - 가능한 원인들
+
+2. 즉시 조치 방법
+   - 지금 당장 할 수 있는 응급 조치
+   - 추가 피해 방지 방법
+
+3. 일반적인 관리 조언
+   - 물 주기, 통풍, 조명 등 환경 관리
+   - 예방을 위한 팁
+
+4. 전문가 상담 권장
+   - 정확한 진단을 위해 병원균 검사 등을 권장
+
+답변은 한국어로 작성하고, 실용적이고 구체적으로 작성해주세요.
+각 섹션은 이모지(🔍, 🚨, 🌱, 💡)를 활용하여 가독성을 높여주세요.
+"""
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "당신은 식물 병충해 전문가입니다. "
+                    "사용자의 설명만으로 가능한 범위에서 조언을 제공하되, "
+                    "정확한 진단을 위해서는 더 많은 정보나 전문가 상담이 필요함을 안내합니다."
+                )
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
     def _build_prompt(
         self, 
         plant_species: str, 
@@ -246,15 +534,7 @@ class PlantDiseaseAdvisor:
     ) -> str:
         """방제법 요청을 위한 프롬프트를 구성합니다."""
         
-        prompt = f"""
-식물 병충해 진단 결과:
-- 식물 종: {plant_species}
-- 병충해/상태: {disease}
-- AI 신뢰도: {confidence * 100:.1f}%
-"""
-        
-        if user_notes and user_notes.strip():
-            prompt += f"\n사용자 추가 정보:\n{user_notes}\n"
+        prompt = self._build_diagnosis_header(plant_species, disease, confidence, user_notes)
         
         prompt += """
 위 진단 결과를 바탕으로 다음 내용을 포함한 실용적인 조언을 제공해주세요:
@@ -285,6 +565,40 @@ class PlantDiseaseAdvisor:
 """
         
         return prompt
+    
+    @staticmethod
+    def _confidence_band(confidence: float) -> str:
+        """
+        신뢰도를 진단 상태 구간으로 바꿉니다 (inference의 55%/20% 기준).
+        정확한 수치를 프롬프트에 넣으면 같은 종·병충해의 동시 요청도 매번 다른 프롬프트가 되어
+        single-flight 병합과 캐시가 동작하지 않으므로, 어조를 정하는 데 필요한 구간만 넣습니다.
+        """
+        if confidence >= 0.55:
+            return "높음 (55% 이상)"
+        if confidence >= 0.20:
+            return "보통 (20~55%)"
+        return "낮음 (20% 미만)"
+    
+    def _build_diagnosis_header(
+        self,
+        plant_species: str,
+        disease: str,
+        confidence: float,
+        user_notes: Optional[str]
+    ) -> str:
+        """진단 결과(종, 병충해, 신뢰도, 사용자 의견) 프롬프트 머리말을 구성합니다."""
+        
+        header = f"""
+식물 병충해 진단 결과:
+- 식물 종: {plant_species}
+- 병충해/상태: {disease}
+- AI 신뢰도: {self._confidence_band(confidence)}
+"""
+        
+        if user_notes and user_notes.strip():
+            header += f"\n사용자 추가 정보:\n{user_notes}\n"
+        
+        return header
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,54 @@
+"""
+방제법 스트리밍 세션 테스트
+- 다른 워커 프로세스(fork)에서 만든 세션을 이 프로세스에서 스트리밍할 수 있는지
+- 스트리밍을 마친 세션은 제거되는지
+"""
+import multiprocessing
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+
+
+class StubAdvisor:
+    def get_cached_bundle(self, *args):
+        return None
+
+    def stream_user_notes_advice(self, user_notes):
+        return iter(["물을 ", "줄이세요"])
+
+
+@pytest.fixture
+def sessions_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_db_path", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(main, "_advice_sessions", None)
+    monkeypatch.setattr(main, "_HAS_ADVISOR", True)
+    monkeypatch.setattr(main, "get_advisor", lambda: StubAdvisor(), raising=False)
+
+
+def _create_in_worker(queue):
+    queue.put(main._create_advice_session("user_notes", {"user_notes": "잎이 노랗게 변해요"}))
+
+
+def test_session_created_by_another_worker_streams_once(sessions_db):
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    worker = ctx.Process(target=_create_in_worker, args=(queue,))
+    worker.start()
+    detection_id = queue.get(timeout=10)
+    worker.join(10)
+
+    client = TestClient(main.app)
+    response = client.get(f"/api/detect/{detection_id}/advice/stream")
+    assert response.status_code == 200
+    assert "event: done" in response.text and "물을 줄이세요" in response.text
+
+    assert client.get(f"/api/detect/{detection_id}/advice/stream").status_code == 404
+
+
+def test_expired_session_is_not_found(sessions_db, monkeypatch):
+    monkeypatch.setattr(main, "ADVICE_SESSION_TTL", -1)
+    detection_id = main._create_advice_session("user_notes", {"user_notes": "잎이 노랗게 변해요"})
+    assert main._get_advice_session(detection_id) is None
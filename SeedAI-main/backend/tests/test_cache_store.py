@@ -0,0 +1,57 @@
+"""
+영속 캐시 테스트
+- 적중 시 접근 시각은 touch_interval보다 오래된 경우에만 기록 (읽기 경로에서 쓰기/커밋 생략)
+- LRU 제거는 기록된 접근 시각 기준
+"""
+import pytest
+
+from app.services import cache_store
+from app.services.cache_store import PersistentCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_store.time, "time", lambda: now[0])
+    return now
+
+
+def _cache(tmp_path, **kwargs):
+    return PersistentCache("test", path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_hits_within_interval_do_not_write(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=10, ttl=None, touch_interval=60.0)
+    cache.set("a", {"text": "값"})
+    writes = cache._conn.total_changes
+    for _ in range(5):
+        clock[0] += 1
+        assert cache.get("a").value == {"text": "값"}
+    assert cache._conn.total_changes == writes
+    assert cache.stats()["hits"] == 5 and cache.stats()["touches"] == 0
+
+    clock[0] += 60
+    cache.get("a")
+    assert cache._conn.total_changes == writes + 1
+    assert cache.stats()["touches"] == 1
+
+
+def test_lru_eviction_uses_touched_access_time(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=2, ttl=None, touch_interval=60.0)
+    cache.set("old", 1)
+    clock[0] += 10
+    cache.set("new", 2)
+    # 간격이 지난 뒤 접근한 항목은 최근 사용으로 기록되어 남음
+    clock[0] += 100
+    cache.get("old")
+    cache.set("third", 3)
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
+
+
+def test_stale_flag_follows_ttl(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=10, ttl=30.0)
+    cache.set("a", "값")
+    assert cache.get("a").stale is False
+    clock[0] += 31
+    assert cache.get("a").stale is True
@@ -0,0 +1,48 @@
+"""
+관리 가이드 문법 생성 테스트 (실제 llama-cpp-python 필요)
+- CARE_GUIDE_SCHEMA에서 만든 GBNF가 llama.cpp에서 컴파일되는지
+- LLM_TEST_MODEL_PATH(ChatML GGUF)가 있으면 로컬 생성 결과가 스키마대로 파싱되는지 (speculative decoding 포함)
+
+실행 (backend 디렉터리에서):
+    LLM_TEST_MODEL_PATH=./models/Qwen2.5-1.5B-Instruct-Q4_K_M.gguf python -m pytest -q tests/test_care_guide_grammar.py
+"""
+import os
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+from app.services import guide, textgen_adapter  # noqa: E402
+
+MODEL_PATH = os.getenv("LLM_TEST_MODEL_PATH", "")
+
+
+def test_care_guide_schema_compiles_to_grammar():
+    assert textgen_adapter._grammar_for(guide.CARE_GUIDE_SCHEMA) is not None
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="LLM_TEST_MODEL_PATH 없음")
+@pytest.mark.parametrize("speculative", ["none", "prompt_lookup"])
+def test_local_care_guide_parses(monkeypatch, speculative):
+    from app.services import llama_pool, speculative as speculative_module
+
+    make_draft_model = speculative_module.make_draft_model
+    monkeypatch.setattr(speculative_module, "make_draft_model", lambda **kwargs: make_draft_model(speculative, **kwargs))
+    monkeypatch.setattr(textgen_adapter, "LLM_SPECULATIVE", speculative)
+    monkeypatch.setattr(textgen_adapter, "LLM_MODEL_PATH", MODEL_PATH)
+    monkeypatch.setattr(textgen_adapter, "LLM_WORKER_URL", "")
+    pool = llama_pool.LlamaPool(MODEL_PATH, size=1)
+    monkeypatch.setattr(textgen_adapter, "get_pool", lambda *args: pool)
+    # 실제 관리 가이드 요청처럼 프롬프트 + 출력이 n_batch(512) 토큰을 넘도록 함 (speculative 시 logits 버퍼 경계)
+    prompt = "몬스테라 관리 가이드를 JSON으로 알려주세요. 물주기, 햇빛, 온도, 습도, 비료, 토양, 팁을 포함하세요.\n" * 12
+    text = textgen_adapter.local_chat_completion(
+        [{"role": "user", "content": prompt}],
+        max_tokens=1000, temperature=0.7, timeout=120, json_schema=guide.CARE_GUIDE_SCHEMA,
+    )
+    with pool.checkout() as llm:
+        assert len(llm.tokenize(textgen_adapter._chatml([{"role": "user", "content": prompt}]).encode())) > 512
+        if llm.draft_model is not None:
+            assert llm.scores.shape[0] == llm.n_ctx()
+    care = guide._parse_care_json(text)
+    assert set(guide.CARE_GUIDE_SCHEMA["required"]) <= set(care)
+    assert 3 <= len(care["tips"]) <= 5
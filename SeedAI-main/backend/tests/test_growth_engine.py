@@ -0,0 +1,92 @@
+"""
+성장 곡선 엔진 회귀 테스트
+- 신뢰도가 CONFIDENCE_STEP에 맞춰진 값(또는 None)이면 project_growth가 기존 per-point 루프와 같은 값
+- 그 외 신뢰도는 구간화로 최대 ±0.3cm 차이 (CONFIDENCE_STEP 주석)
+"""
+import hashlib
+import math
+
+import numpy as np
+import pytest
+
+from app.services import growth_engine
+
+PLANTS = ["Tomato", "몬스테라", "스투키", "Ficus lyrata", "바질"]
+
+
+def _legacy_growth_graph(plant_name, period_unit, max_periods, confidence):
+    """growth_engine 도입 전 generate_growth_graph / get_plant_size_range 루프 (좋은/나쁜 생장)"""
+    seed = max(0.0, min(1.0, int(hashlib.sha256(plant_name.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF))
+    plant_type_seed = int(seed * 1000) % 3
+    confidence_factor = 1.0 if confidence is None else 0.8 + confidence * 0.2
+    if plant_type_seed == 0:
+        initial_size = (5.0 + seed * 5.0) * confidence_factor
+        max_size = (20.0 + seed * 10.0) * confidence_factor
+    elif plant_type_seed == 1:
+        initial_size = (8.0 + seed * 7.0) * confidence_factor
+        max_size = (40.0 + seed * 20.0) * confidence_factor
+    else:
+        initial_size = (15.0 + seed * 10.0) * confidence_factor
+        max_size = (80.0 + seed * 70.0) * confidence_factor
+    initial_size = max(3.0, initial_size)
+    max_size = max(initial_size * 2, max_size)
+    initial_size, max_size = round(initial_size, 1), round(max_size, 1)
+
+    if period_unit == "week":
+        periods = list(range(0, max_periods + 1, max(1, max_periods // 12)))
+        if periods[-1] != max_periods:
+            periods.append(max_periods)
+    else:
+        periods = list(range(0, max_periods + 1))
+
+    def curve(multiplier):
+        sizes = []
+        for period in periods:
+            if period_unit == "week":
+                k = (0.15 + 0.1 * seed) * multiplier
+                x0 = (8.0 - 4.0 * seed) * multiplier
+                normalized_period = period / max_periods * 24
+            else:
+                k = (0.35 + 0.2 * seed) * multiplier
+                x0 = (3.0 - 1.5 * seed) * multiplier
+                normalized_period = period
+            growth_index = 1.0 / (1.0 + math.exp(-k * (normalized_period - x0)))
+            current_size = initial_size + (max_size - initial_size) * growth_index
+            current_size += (seed * 0.1 - 0.05) * current_size
+            current_size = max(initial_size * 0.8, min(current_size, max_size * 1.1))
+            sizes.append(round(current_size, 1))
+        return sizes
+
+    return periods, curve(1.3), curve(0.7)
+
+
+@pytest.mark.parametrize("plant_name", PLANTS)
+@pytest.mark.parametrize("period_unit,max_periods", [("month", 12), ("month", 6), ("week", 12), ("week", 26), ("week", 52)])
+@pytest.mark.parametrize("confidence", [None, 0.0, 0.5, 0.87, 0.93, 1.0])
+def test_matches_legacy_loop_at_bucket_aligned_confidence(plant_name, period_unit, max_periods, confidence):
+    periods, good, bad = _legacy_growth_graph(plant_name, period_unit, max_periods, confidence)
+    curves = growth_engine.project_growth(plant_name, period_unit, max_periods, confidence)
+    assert curves.periods.tolist() == periods
+    assert curves.curves["good"].tolist() == good
+    assert curves.curves["bad"].tolist() == bad
+
+
+def test_unaligned_confidence_shifts_values_by_at_most_three_tenths():
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    for i in range(200):
+        plant_name = f"plant-{i}"
+        for period_unit, max_periods in [("month", 12), ("week", 52)]:
+            confidence = float(rng.random())
+            _, good, bad = _legacy_growth_graph(plant_name, period_unit, max_periods, confidence)
+            curves = growth_engine.project_growth(plant_name, period_unit, max_periods, confidence)
+            worst = max(worst, np.max(np.abs(curves.curves["good"] - good)), np.max(np.abs(curves.curves["bad"] - bad)))
+    assert worst <= 0.3 + 1e-9
+
+
+def test_tomato_month_example_differs_from_legacy():
+    # 0.873 → 0.87 구간: 기존 [..., 67.6, 80.8] / 엔진 [..., 67.5, 80.7]
+    _, good, _ = _legacy_growth_graph("Tomato", "month", 12, 0.873)
+    curves = growth_engine.project_growth("Tomato", "month", 12, 0.873)
+    assert curves.curves["good"].tolist() != good
+    assert curves.curves["good"].tolist() == growth_engine.project_growth("Tomato", "month", 12, 0.87).curves["good"].tolist()
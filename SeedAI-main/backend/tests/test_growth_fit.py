@@ -0,0 +1,113 @@
+"""
+식물별 성장 곡선 온라인 적합 테스트
+- 기록마다 갱신한 충분통계량이 기록 전체로 다시 계산한 값과 같은지
+- 같은 날짜 수정(previous_height 차감), K 확장 재계산, 기록 부족 시 종 사전값
+- 상태가 워커(프로세스 메모리)가 아닌 캐시 DB에 저장되는지
+"""
+import pytest
+
+from app.config import settings
+from app.services import growth_fit
+
+PLANT_ID = "plant-1"
+PLANT_NAME = "몬스테라"
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """save_growth_log를 흉내 낸 메모리 기록 + 임시 캐시 DB"""
+    monkeypatch.setattr(settings, "cache_db_path", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(growth_fit, "_fits", None)
+    records = {}
+    monkeypatch.setattr(growth_fit, "load_growth_history", lambda plant_id: list(records.get(plant_id, [])))
+    return records
+
+
+def _log(records, date, height, plant_id=PLANT_ID):
+    """기록을 저장하고(같은 날짜면 덮어씀) 적합 상태에 반영합니다."""
+    rows = records.setdefault(plant_id, [])
+    previous_height = None
+    for row in rows:
+        if row["date"] == date:
+            previous_height, row["height"] = row["height"], height
+            break
+    else:
+        rows.append({"date": date, "height": height})
+    growth_fit.observe(plant_id, date, height, previous_height, plant_name=PLANT_NAME)
+
+
+def _stored(plant_id=PLANT_ID):
+    return growth_fit._load_state(plant_id)
+
+
+def _assert_matches_rebuild(records, plant_id=PLANT_ID):
+    stored = _stored(plant_id)
+    rebuilt = growth_fit._rebuild(plant_id, PLANT_NAME, records[plant_id])
+    assert stored["K"] == rebuilt["K"]
+    for key in growth_fit._STAT_KEYS:
+        assert stored[key] == pytest.approx(rebuilt[key], rel=1e-9, abs=1e-9), key
+    assert (stored["last_day"], stored["last_height"]) == (rebuilt["last_day"], rebuilt["last_height"])
+
+
+def test_incremental_statistics_match_rebuild(history):
+    for i, height in enumerate([10.0, 11.5, 12.2, 14.0, 15.1, 17.3]):
+        _log(history, f"2026-03-{i * 5 + 1:02d}", height)
+    _log(history, "날짜 아님", 18.0)
+    _assert_matches_rebuild(history)
+    assert _stored()["skipped"] == 1
+    assert growth_fit.get_model(PLANT_ID, history[PLANT_ID])["source"] == "fit"
+
+
+def test_same_date_edit_replaces_previous_height(history):
+    for i, height in enumerate([10.0, 11.5, 12.2]):
+        _log(history, f"2026-03-{i * 5 + 1:02d}", height)
+    _log(history, "2026-03-06", 13.0)
+    assert _stored()["n"] == 3
+    _assert_matches_rebuild(history)
+
+
+def test_height_near_K_expands_K_and_rebuilds(history):
+    K = growth_fit.species_prior(PLANT_NAME)["K"]
+    _log(history, "2026-03-01", 10.0)
+    _log(history, "2026-03-10", 12.0)
+    _log(history, "2026-03-20", K)
+    assert _stored()["K"] == round(K * growth_fit.K_EXPAND, 1)
+    _assert_matches_rebuild(history)
+
+    # 확장 근거였던 최대 기록을 낮추면 종 사전값 K로 되돌림
+    _log(history, "2026-03-20", 14.0)
+    assert _stored()["K"] == K
+    _assert_matches_rebuild(history)
+
+
+def test_prior_fallback_below_min_fit_points(history):
+    _log(history, "2026-03-01", 10.0)
+    _log(history, "2026-03-08", 11.0)
+    assert growth_fit.MIN_FIT_POINTS > 2
+    model = growth_fit.get_model(PLANT_ID, history[PLANT_ID], plant_name=PLANT_NAME)
+    assert model["source"] == "prior"
+    assert model["r"] == growth_fit.species_prior(PLANT_NAME)["r"]
+    # 사전 곡선은 마지막 기록을 지나므로 다음 날 예측은 마지막 높이보다 약간 큼
+    predicted = growth_fit.predict(model, days_ahead=3)
+    assert len(predicted) == 3 and 11.0 < predicted[0] < predicted[-1] < 12.0
+
+
+def test_missing_or_stale_state_is_rebuilt_from_history(history):
+    for i, height in enumerate([10.0, 11.5, 12.2, 14.0]):
+        _log(history, f"2026-03-{i * 5 + 1:02d}", height)
+    growth_fit._get_fits().delete(PLANT_ID)
+    # 다른 워커가 저장한 기록(상태 미반영)도 기록 수 불일치로 감지해 다시 계산
+    history[PLANT_ID].append({"date": "2026-03-30", "height": 16.0})
+    model = growth_fit.get_model(PLANT_ID, history[PLANT_ID], plant_name=PLANT_NAME)
+    assert model["n"] == 5
+    _assert_matches_rebuild(history)
+
+
+def test_state_is_shared_through_the_cache_db(history, monkeypatch):
+    for i, height in enumerate([10.0, 11.5, 12.2]):
+        _log(history, f"2026-03-{i * 5 + 1:02d}", height)
+    # 새 워커: 프로세스 메모리의 저장소 없이 같은 DB에서 상태를 읽음
+    monkeypatch.setattr(growth_fit, "_fits", None)
+    assert _stored()["n"] == 3
+    _log(history, "2026-03-16", 14.0, plant_id="plant-2")
+    assert _stored()["n"] == 3 and _stored("plant-2")["n"] == 1
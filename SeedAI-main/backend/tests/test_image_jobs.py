@@ -0,0 +1,63 @@
+"""
+이미지 작업 큐 테스트 (파이프라인 로드 실패 캐시, 캐시 크기 상한)
+"""
+import os
+import time
+
+import pytest
+
+from app.services import growth, image_jobs
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_jobs, "IMAGE_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_load_failure_is_cached_and_fails_jobs_without_reloading(cache_dir, monkeypatch):
+    loads = []
+    monkeypatch.setattr(growth, "create_image_pipeline", lambda: loads.append(1))
+    queue = image_jobs.ImageJobQueue(workers=1)
+    monkeypatch.setattr(image_jobs, "get_image_queue", lambda: queue)
+
+    first = _wait(queue.submit("a potted monstera"))
+    assert first.status == "failed"
+    assert queue.pool.unavailable() is not None
+
+    second = queue.submit("a potted stuckyi")
+    assert second.status == "failed" and second.error == queue.pool.unavailable()
+    assert len(loads) == 1
+    assert not image_jobs.images_available()
+    assert all(stage.image_url is None for stage in growth.get_default_growth_prediction("몬스테라").stages)
+
+
+def test_load_failure_expires(cache_dir, monkeypatch):
+    monkeypatch.setattr(growth, "create_image_pipeline", lambda: None)
+    pool = image_jobs.PipelinePool(workers=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.unavailable() is not None
+    monkeypatch.setattr(image_jobs, "IMAGE_LOAD_RETRY_SECONDS", 0.0)
+    assert pool.unavailable() is None
+
+
+def test_evict_images_removes_least_recently_used(cache_dir):
+    keys = [f"{i:064x}" for i in range(4)]
+    for age, key in enumerate(reversed(keys)):
+        path = image_jobs.image_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 400 * 1024)
+        os.utime(path, (time.time() - 100 * age, time.time() - 100 * age))
+    image_jobs.touch(keys[0])  # 가장 오래된 이미지를 방금 조회
+
+    assert image_jobs.evict_images(max_mb=1.0) == 2
+    assert [image_jobs.is_cached(key) for key in keys] == [True, False, False, True]
+    assert image_jobs.evict_images(max_mb=0) == 0
@@ -0,0 +1,150 @@
+"""
+LLM 프로바이더 라우터 테스트 (로컬 스텁 프로바이더)
+
+실행 (backend 디렉터리에서):
+    python -m pytest -q tests
+"""
+import pytest
+
+import llm_service
+from app.services import llm_router
+from app.services.llm_router import LLMRouter
+
+
+class StubProvider(llm_router.LLMProvider):
+    """응답/예외를 고정한 프로바이더 (stream은 기본 구현: complete 결과 한 조각)"""
+
+    def __init__(self, name, text="응답", error=None, available=True):
+        self.name = name
+        self.text = text
+        self.error = error
+        self._available = available
+        self.calls = 0
+
+    def available(self):
+        return self._available
+
+    def complete(self, request):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+
+@pytest.fixture
+def advisor(monkeypatch, tmp_path):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_service.settings, "cache_db_path", str(tmp_path / "cache.sqlite3"))
+    return llm_service.PlantDiseaseAdvisor()
+
+
+def test_advice_streams_use_router_without_openai(advisor, monkeypatch):
+    local = StubProvider("llama_cpp", text="잎을 제거하세요")
+    router = LLMRouter([StubProvider("openai", available=False), local])
+    monkeypatch.setattr(llm_service, "get_router", lambda: router)
+
+    assert advisor.client is None
+    assert "".join(advisor.stream_treatment_advice("Tomato", "Early blight", 0.9)) == "잎을 제거하세요"
+    assert "".join(advisor.stream_user_notes_advice("잎에 반점이 생겼어요")) == "잎을 제거하세요"
+    assert local.calls == 2
+    assert set(router.stats()["providers"]) == {"treatment_advice"}
+
+
+def test_advice_streams_report_unavailable_without_providers(advisor, monkeypatch):
+    router = LLMRouter([StubProvider("openai", available=False), StubProvider("llama_cpp", available=False)])
+    monkeypatch.setattr(llm_service, "get_router", lambda: router)
+
+    assert "OPENAI_API_KEY" in "".join(advisor.stream_treatment_advice("Tomato", "Early blight", 0.9))
+
+
+POLICIES = {"advice": llm_router.RequestClassPolicy(slo=1.0, timeout=5.0, providers=("openai", "llama_cpp"))}
+
+
+def _observe(router, name, latency, times=llm_router.MIN_SAMPLES, ok=True):
+    for _ in range(times):
+        router.record(name, "advice", latency, ok=ok)
+
+
+def test_unmeasured_providers_follow_policy_preference():
+    router = LLMRouter([StubProvider("llama_cpp"), StubProvider("openai")], POLICIES)
+    assert router.rank("advice") == ["openai", "llama_cpp"]
+
+
+def test_fastest_provider_within_slo_ranks_first():
+    router = LLMRouter([StubProvider("openai"), StubProvider("llama_cpp")], POLICIES)
+    _observe(router, "openai", 0.8)
+    _observe(router, "llama_cpp", 0.3)
+    assert router.rank("advice") == ["llama_cpp", "openai"]
+    assert router.complete("advice", [], max_tokens=10).provider == "llama_cpp"
+
+
+def test_provider_over_slo_ranks_after_unmeasured():
+    router = LLMRouter([StubProvider("openai"), StubProvider("llama_cpp")], POLICIES)
+    _observe(router, "openai", 2.5)
+    assert router.rank("advice") == ["llama_cpp", "openai"]
+
+
+def test_unavailable_provider_is_skipped():
+    router = LLMRouter([StubProvider("openai", available=False), StubProvider("llama_cpp")], POLICIES)
+    assert router.rank("advice") == ["llama_cpp"]
+
+
+def test_falls_back_on_provider_exception():
+    failing = StubProvider("openai", error=RuntimeError("timeout"))
+    router = LLMRouter([failing, StubProvider("llama_cpp", text="로컬 응답")], POLICIES)
+    result = router.complete("advice", [], max_tokens=10)
+    assert (result.provider, result.text) == ("llama_cpp", "로컬 응답")
+    assert router.stats()["providers"]["advice"]["openai"]["error_rate"] == 1.0
+
+
+def test_falls_back_on_validation_failure_and_records_parse_failure():
+    def validate(text):
+        if not text.startswith("{"):
+            raise ValueError("JSON 아님")
+
+    router = LLMRouter([StubProvider("openai", text="설명"), StubProvider("llama_cpp", text="{}")], POLICIES)
+    result = router.complete("advice", [], max_tokens=10, validate=validate)
+    assert result.provider == "llama_cpp"
+    stats = router.stats()["providers"]["advice"]
+    assert stats["openai"]["parse_failure_rate"] == 1.0
+    assert stats["llama_cpp"]["parse_failure_rate"] == 0.0
+
+
+def test_stream_falls_back_before_first_chunk():
+    router = LLMRouter([StubProvider("openai", error=RuntimeError("down")), StubProvider("llama_cpp", text="조각")],
+                       POLICIES)
+    assert list(router.stream("advice", [], max_tokens=10)) == ["조각"]
+
+
+def test_high_error_rate_demotes_until_cooldown(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(llm_router.time, "monotonic", lambda: clock[0])
+    router = LLMRouter([StubProvider("openai"), StubProvider("llama_cpp")], POLICIES)
+    _observe(router, "openai", 0.1)
+    _observe(router, "openai", 0.1, times=llm_router.MIN_SAMPLES + 1, ok=False)
+    _observe(router, "llama_cpp", 0.9)
+    assert router.rank("advice") == ["llama_cpp", "openai"]
+    assert router.stats()["providers"]["advice"]["openai"]["healthy"] is False
+
+    # 쿨다운이 지나면 다시 시도 대상이 되고, 성공이 쌓이면 오류율이 내려가 정상으로 복귀
+    clock[0] += llm_router.UNHEALTHY_COOLDOWN + 1
+    assert router.rank("advice") == ["openai", "llama_cpp"]
+    _observe(router, "openai", 0.1, times=llm_router.MIN_SAMPLES * 2)
+    clock[0] = 1000.0
+    assert router.stats()["providers"]["advice"]["openai"]["error_rate"] <= llm_router.MAX_ERROR_RATE
+    assert router.rank("advice")[0] == "openai"
+
+
+def test_no_provider_available():
+    router = LLMRouter([StubProvider("openai", available=False)], POLICIES)
+    with pytest.raises(llm_router.NoProviderAvailable):
+        router.complete("advice", [], max_tokens=10)
+    with pytest.raises(llm_router.NoProviderAvailable):
+        list(router.stream("advice", [], max_tokens=10))
+
+
+def test_all_providers_failing_raises_no_provider_available():
+    router = LLMRouter([StubProvider("openai", error=RuntimeError("a")), StubProvider("llama_cpp", text="")],
+                       POLICIES)
+    with pytest.raises(llm_router.NoProviderAvailable, match="openai: a"):
+        router.complete("advice", [], max_tokens=10)
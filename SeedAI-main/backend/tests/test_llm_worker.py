@@ -0,0 +1,71 @@
+"""
+llm_worker 슬롯 정리 테스트 (llama-cpp-python 버전별 KV 제거 API, 정리 실패 시 엔진 유지)
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_worker
+
+
+def test_seq_rm_prefers_kv_cache_api():
+    calls = []
+    lib = SimpleNamespace(llama_kv_cache_seq_rm=lambda *args: calls.append(args))
+    llm_worker._kv_seq_rm(lib)("ctx", 1, -1, -1)
+    assert calls == [("ctx", 1, -1, -1)]
+
+
+def test_seq_rm_uses_memory_api_on_0_3():
+    calls = []
+    lib = SimpleNamespace(
+        llama_get_memory=lambda ctx: f"mem({ctx})",
+        llama_memory_seq_rm=lambda *args: calls.append(args),
+    )
+    llm_worker._kv_seq_rm(lib)("ctx", 2, -1, -1)
+    assert calls == [("mem(ctx)", 2, -1, -1)]
+
+
+def test_seq_rm_unknown_version_fails_at_startup():
+    with pytest.raises(RuntimeError):
+        llm_worker._kv_seq_rm(SimpleNamespace())
+
+
+def _engine(seq_rm, step):
+    """모델 로드 없이 엔진 루프만 구성합니다."""
+    engine = llm_worker.BatchEngine.__new__(llm_worker.BatchEngine)
+    engine.ctx = "ctx"
+    engine._seq_rm = seq_rm
+    engine._step = step
+    engine._pending = llm_worker.queue.Queue()
+    engine._free_slots = [0, 1]
+    engine._active = []
+    engine._lock = threading.Lock()
+    engine._stats = dict.fromkeys(["requests", "completed", "timed_out", "rejected", "errors", "prompt_tokens"], 0)
+    return engine
+
+
+def test_failed_cleanup_does_not_kill_engine_thread():
+    def broken_seq_rm(*args):
+        raise AttributeError("llama_kv_cache_seq_rm")
+
+    def failing_step():
+        raise RuntimeError("decode 실패")
+
+    engine = _engine(broken_seq_rm, failing_step)
+    thread = threading.Thread(target=engine._run, daemon=True)
+    thread.start()
+
+    requests = [llm_worker.GenerationRequest([1, 2], 8, 0.0, time.monotonic() + 5) for _ in range(3)]
+    for req in requests:
+        engine._pending.put(req)
+    for req in requests:
+        # 슬롯 2개가 정리에 실패해 퇴역하면 세 번째 요청은 배정되지 않고 남음
+        req.done.wait(1.0)
+
+    assert thread.is_alive()
+    finished = [req for req in requests if req.done.is_set()]
+    assert len(finished) == 2
+    assert all(req.finish_reason == "error" for req in finished)
+    assert engine._free_slots == [] and engine._active == []
@@ -0,0 +1,157 @@
+"""
+textgen_adapter 로컬 생성 경로 테스트
+- llama_cpp 대신 실제 시그니처를 흉내 낸 stub Llama를 사용 (create_chat_completion은 stopping_criteria를 받지 않음)
+
+실행 (backend 디렉터리에서):
+    python -m pytest -q tests
+"""
+import re
+import sys
+import types
+from contextlib import contextmanager
+
+import pytest
+
+from app.services import textgen_adapter
+
+SCHEMA = {"type": "object", "properties": {"summary": {"type": "string"}}, "required": ["summary"]}
+
+
+class StubGrammar:
+    def __init__(self, gbnf):
+        self.gbnf = gbnf
+
+    @classmethod
+    def from_string(cls, gbnf, verbose=True):
+        return cls(gbnf)
+
+
+class StubStoppingCriteriaList(list):
+    def __call__(self, input_ids, logits):
+        return any(criterion(input_ids, logits) for criterion in self)
+
+
+@pytest.fixture(autouse=True)
+def stub_llama_cpp(monkeypatch):
+    """llama_cpp / llama_cpp.llama_grammar 모듈을 stub으로 대체"""
+    module = types.ModuleType("llama_cpp")
+    module.StoppingCriteriaList = StubStoppingCriteriaList
+    module.LlamaGrammar = StubGrammar
+    grammar_module = types.ModuleType("llama_cpp.llama_grammar")
+    grammar_module.JSON_GBNF = "root ::= object"
+    grammar_module.json_schema_to_gbnf = lambda schema: f"schema-gbnf {schema}"
+    module.llama_grammar = grammar_module
+    monkeypatch.setitem(sys.modules, "llama_cpp", module)
+    monkeypatch.setitem(sys.modules, "llama_cpp.llama_grammar", grammar_module)
+
+
+class StubLlama:
+    """llama_cpp.Llama의 생성 메서드 시그니처만 흉내 냄 (알 수 없는 키워드 인자는 TypeError)"""
+
+    def __init__(self, text="좋은 응답"):
+        self.text = text
+        self.calls = []
+        self.generated = 0
+        self.closed = False
+
+    def create_completion(self, prompt, suffix=None, max_tokens=16, temperature=0.8, top_p=0.95, stop=None,
+                          stream=False, stopping_criteria=None, logits_processor=None, grammar=None):
+        self.calls.append(("completion", {"prompt": prompt, "stop": stop, "grammar": grammar,
+                                          "stopping_criteria": stopping_criteria}))
+        if stream:
+            return iter([{"choices": [{"text": self.text}]}])
+        return {"choices": [{"text": f" {self.text} "}]}
+
+    def create_chat_completion(self, messages, functions=None, tools=None, temperature=0.2, top_p=0.95, stream=False,
+                               stop=None, response_format=None, max_tokens=None, logits_processor=None, grammar=None):
+        self.calls.append(("chat", {"messages": messages, "grammar": grammar, "response_format": response_format}))
+        if stream:
+            return self._chat_stream()
+        return {"choices": [{"message": {"content": f" {self.text} "}}]}
+
+    def _chat_stream(self):
+        try:
+            yield {"choices": [{"delta": {"role": "assistant"}}]}
+            for piece in re.findall(r"\S+\s*", self.text):
+                self.generated += 1
+                yield {"choices": [{"delta": {"content": piece}}]}
+        finally:
+            self.closed = True
+
+
+class Criteria:
+    """StoppingCriteriaList처럼 (input_ids, logits)로 호출되는 중단 조건"""
+
+    def __init__(self, after=None):
+        self.after = after
+        self.calls = 0
+
+    def __call__(self, input_ids, logits):
+        self.calls += 1
+        return self.after is not None and self.calls > self.after
+
+
+class StubPool:
+    def __init__(self, llm):
+        self.llm = llm
+        self.size = 1
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        yield self.llm
+
+
+def _run(llm, prompt, criteria=None, **kwargs):
+    messages = [{"role": "user", "content": "몬스테라 관리법"}]
+    return textgen_adapter._run_local(llm, messages, prompt, None, 64, 0.2, criteria or Criteria(), **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"json_mode": True}, {"json_schema": SCHEMA}])
+def test_chatml_uses_completion_with_stopping_criteria(kwargs):
+    llm = StubLlama()
+    criteria = Criteria()
+    prompt = textgen_adapter._chatml([{"role": "user", "content": "몬스테라 관리법"}])
+    assert _run(llm, prompt, criteria, **kwargs) == "좋은 응답"
+    kind, call = llm.calls[0]
+    assert kind == "completion"
+    assert call["stopping_criteria"] is criteria
+    assert call["stop"] == ["<|im_end|>"]
+    assert (call["grammar"] is None) == (not kwargs)
+
+
+def test_schema_grammar_is_built_from_schema():
+    llm = StubLlama()
+    _run(llm, "prompt", json_schema=SCHEMA)
+    assert llm.calls[0][1]["grammar"].gbnf.startswith("schema-gbnf")
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"json_mode": True}, {"json_schema": SCHEMA}])
+def test_other_chat_formats_use_chat_completion(kwargs):
+    llm = StubLlama()
+    assert _run(llm, None, **kwargs) == "좋은 응답"
+    kind, call = llm.calls[0]
+    assert kind == "chat"
+    assert (call["grammar"] is None) == (not kwargs)
+
+
+def test_other_chat_formats_stop_by_closing_the_stream():
+    llm = StubLlama("하나 둘 셋 넷 다섯")
+    assert _run(llm, None, Criteria(after=2)) == "하나 둘"
+    assert llm.generated == 2 and llm.closed
+
+
+def test_stream_yields_text_for_both_paths():
+    llm = StubLlama()
+    assert list(_run(llm, "prompt", stream=True)) == ["좋은 응답"]
+    assert "".join(_run(llm, None, stream=True)) == "좋은 응답"
+
+
+@pytest.mark.parametrize("chat_format", ["chatml", "llama-2"])
+def test_local_chat_completion_end_to_end(monkeypatch, chat_format):
+    llm = StubLlama('{"summary": "ok"}')
+    monkeypatch.setattr(textgen_adapter, "get_pool", lambda *args: StubPool(llm))
+    monkeypatch.setattr(textgen_adapter, "LLM_CHAT_FORMAT", chat_format)
+    monkeypatch.setattr(textgen_adapter, "LLM_WORKER_URL", "")
+    messages = [{"role": "user", "content": "몬스테라 관리 가이드"}]
+    assert textgen_adapter.local_chat_completion(messages, timeout=5, json_schema=SCHEMA) == '{"summary": "ok"}'
+    assert textgen_adapter.local_chat_completion(messages, timeout=5) == '{"summary": "ok"}'